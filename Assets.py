@@ -0,0 +1,181 @@
+import os
+import struct
+import pygame
+from Consts import AssetParameters
+from Pieces import Pieces
+from typing import Dict, List, Tuple
+
+
+class Assets:
+    """
+    This class loads the graphics of the game once, and shares them between
+    all the views.
+
+    The images of the pieces are packed side by side into one texture atlas,
+    and each piece is a subsurface of the atlas. Once the display is set, the
+    atlas is converted to the pixel format of the display (convert_alpha), so
+    blitting a piece does not convert its pixels on every draw.
+
+    The packed atlas can be cached on disk, as raw pixels (see
+    AssetParameters['ATLAS_CACHE']), so the game reads one file at startup
+    instead of decoding 12 PNG files. The cache is built again when one of
+    the images is newer than it.
+    """
+
+    MAGIC = b'CHESSAT1'
+    HEADER = struct.Struct('>8sHH')  # Magic, width and height of the atlas.
+    RECT = struct.Struct('>HHHH')  # x, y, width and height of a piece.
+
+    __pieces = None  # type: Dict[str, pygame.Surface]
+    __converted = False
+
+    @staticmethod
+    def get_pieces() -> Dict[str, pygame.Surface]:
+        """
+        :return: dictionary from each piece to its graphics, a subsurface of
+        the atlas. The atlas is loaded on the first call only.
+        """
+        if Assets.__pieces is None:
+            Assets.__pieces = Assets.__load_atlas(
+                AssetParameters['ATLAS_CACHE'])
+            Assets.__converted = False
+        # The atlas can be converted only after the display mode is set.
+        if not Assets.__converted and \
+                pygame.display.get_surface() is not None:
+            Assets.__pieces = Assets.__convert(Assets.__pieces)
+            Assets.__converted = True
+        return Assets.__pieces
+
+    @staticmethod
+    def __pieces_list() -> List[str]:
+        """
+        :return: List[str], the pieces in the order of the atlas.
+        """
+        return [piece for piece in Pieces.get_list_of_pieces()
+                if piece != Pieces.NONE]
+
+    @staticmethod
+    def __load_atlas(cache_path: str) -> Dict[str, pygame.Surface]:
+        """
+        This function loads the atlas from the cache file, or packs it from
+        the images and writes the cache file.
+        :param cache_path: str, the path of the cache file, or None for no
+        cache.
+        :return: dictionary from each piece to its subsurface of the atlas.
+        """
+        atlas, rects = None, None
+        if cache_path is not None and Assets.__is_cache_fresh(cache_path):
+            atlas, rects = Assets.__read_cache(cache_path)
+        if atlas is None:
+            atlas, rects = Assets.__pack(Assets.__load_images())
+            if cache_path is not None:
+                Assets.__write_cache(cache_path, atlas, rects)
+        return {piece: atlas.subsurface(rect)
+                for piece, rect in zip(Assets.__pieces_list(), rects)}
+
+    @staticmethod
+    def __load_images() -> Dict[str, pygame.Surface]:
+        """
+        :return: dictionary from each piece to its image, as it is loaded from
+        its file.
+        """
+        return {piece: pygame.image.load('./chess_pieces/' + piece)
+                for piece in Assets.__pieces_list()}
+
+    @staticmethod
+    def __pack(images: Dict[str, pygame.Surface]) \
+            -> Tuple[pygame.Surface, List[pygame.Rect]]:
+        """
+        This function packs the images of the pieces side by side into one
+        surface.
+        :param images: dictionary from each piece to its image.
+        :return: tuple of the atlas and the rectangle of each piece in it.
+        """
+        pieces = Assets.__pieces_list()
+        width = sum(images[piece].get_width() for piece in pieces)
+        height = max(images[piece].get_height() for piece in pieces)
+        atlas = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+        rects = []
+        x = 0
+        for piece in pieces:
+            # Copy the pixels as they are, without blending them with the
+            # transparent atlas.
+            rects.append(atlas.blit(images[piece], (x, 0),
+                                    special_flags=pygame.BLEND_RGBA_MAX))
+            x += images[piece].get_width()
+        return atlas, rects
+
+    @staticmethod
+    def __convert(pieces: Dict[str, pygame.Surface]) \
+            -> Dict[str, pygame.Surface]:
+        """
+        This function converts the atlas to the pixel format of the display.
+        :param pieces: dictionary from each piece to its subsurface of the
+        atlas.
+        :return: dictionary from each piece to its subsurface of the converted
+        atlas.
+        """
+        atlas = next(iter(pieces.values())).get_parent().convert_alpha()
+        return {piece: atlas.subsurface(surface.get_offset(),
+                                        surface.get_size())
+                for piece, surface in pieces.items()}
+
+    @staticmethod
+    def __is_cache_fresh(cache_path: str) -> bool:
+        """
+        :param cache_path: str, the path of the cache file.
+        :return: bool, whether the cache file exists and is newer than all the
+        images of the pieces.
+        """
+        if not os.path.isfile(cache_path):
+            return False
+        cache_time = os.path.getmtime(cache_path)
+        return all(os.path.getmtime('./chess_pieces/' + piece) <= cache_time
+                   for piece in Assets.__pieces_list())
+
+    @staticmethod
+    def __read_cache(cache_path: str) \
+            -> Tuple[pygame.Surface, List[pygame.Rect]]:
+        """
+        :param cache_path: str, the path of the cache file.
+        :return: tuple of the atlas and the rectangle of each piece in it, or
+        (None, None) if the file is not a valid cache.
+        """
+        with open(cache_path, 'rb') as cache_file:
+            data = cache_file.read()
+        pieces = len(Assets.__pieces_list())
+        pixels_offset = Assets.HEADER.size + pieces * Assets.RECT.size
+        if len(data) < pixels_offset:
+            return None, None
+        magic, width, height = Assets.HEADER.unpack_from(data, 0)
+        if magic != Assets.MAGIC or \
+                len(data) != pixels_offset + 4 * width * height:
+            return None, None
+        rects = [pygame.Rect(Assets.RECT.unpack_from(
+            data, Assets.HEADER.size + index * Assets.RECT.size))
+            for index in range(0, pieces)]
+        atlas = pygame.image.frombytes(data[pixels_offset:], (width, height),
+                                       'RGBA')
+        return atlas, rects
+
+    @staticmethod
+    def __write_cache(cache_path: str, atlas: pygame.Surface,
+                      rects: List[pygame.Rect]) -> None:
+        """
+        This function writes the atlas to the cache file. A failure to write
+        it is ignored, since the cache only saves time.
+        :param cache_path: str, the path of the cache file.
+        :param atlas: pygame.Surface, the atlas.
+        :param rects: List[pygame.Rect], the rectangle of each piece.
+        :return: None
+        """
+        try:
+            with open(cache_path, 'wb') as cache_file:
+                cache_file.write(Assets.HEADER.pack(Assets.MAGIC,
+                                                    atlas.get_width(),
+                                                    atlas.get_height()))
+                for rect in rects:
+                    cache_file.write(Assets.RECT.pack(*rect))
+                cache_file.write(pygame.image.tobytes(atlas, 'RGBA'))
+        except OSError:
+            pass
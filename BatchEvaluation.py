@@ -0,0 +1,279 @@
+import numpy
+from typing import List
+from Board import Board
+from Evaluation import Evaluation
+from Move import Move
+from Pieces import Pieces
+
+# The batched evaluation scores many positions with a few NumPy calls. Each
+# position is encoded as 64 int8 piece codes (see Pieces.get_piece_codes), one
+# per cell, row by row, so a batch of N positions is an (N, 64) array, and
+# every term of the evaluation is a table lookup and a sum over the cells.
+
+# The number of piece codes, the empty cell included.
+CODES = len(Pieces.get_piece_codes())
+
+# The cell numbers, to look up the tables by piece code and cell.
+SQUARES = numpy.arange(64)
+
+# The directions of the sliding pieces: the rook directions first, then the
+# bishop directions.
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1),
+              (1, 1), (-1, -1), (-1, 1), (1, -1))
+ROOK_DIRECTIONS = (0, 1, 2, 3)
+BISHOP_DIRECTIONS = (4, 5, 6, 7)
+
+KNIGHT_STEPS = ((-2, -1), (-2, 1), (2, -1), (2, 1),
+                (-1, -2), (-1, 2), (1, -2), (1, 2))
+
+
+def _piece_table(values) -> numpy.ndarray:
+    """
+    :param values: dictionary from each piece to its list of 64 values.
+    :return: numpy.ndarray, flat table of CODES * 64 values, where the value
+    of the piece with code c on cell s is at 64 * c + s.
+    """
+    table = numpy.zeros(CODES * 64, dtype=numpy.int64)
+    for piece, code in Board.PIECE_CODES.items():
+        table[64 * code: 64 * code + 64] = values[piece]
+    return table
+
+
+def _rays() -> numpy.ndarray:
+    """
+    :return: numpy.ndarray of shape (64, 8, 8), the cells of the ray of each
+    cell in each one of DIRECTIONS, nearest first. Each ray ends with the cell
+    number 64, an extra cell that is always occupied, so every ray has a
+    piece that stops it.
+    """
+    rays = numpy.full((64, len(DIRECTIONS), 8), 64, dtype=numpy.intp)
+    for square in range(0, 64):
+        row, col = divmod(square, 8)
+        for direction, (row_step, col_step) in enumerate(DIRECTIONS):
+            for distance in range(1, 8):
+                to_row = row + row_step * distance
+                to_col = col + col_step * distance
+                if not (0 <= to_row < 8 and 0 <= to_col < 8):
+                    break
+                rays[square, direction, distance - 1] = 8 * to_row + to_col
+    return rays
+
+
+def _knight_targets() -> numpy.ndarray:
+    """
+    :return: numpy.ndarray of shape (64, 64), 1 where a knight on the first
+    cell attacks the second cell.
+    """
+    targets = numpy.zeros((64, 64), dtype=numpy.int64)
+    for square in range(0, 64):
+        row, col = divmod(square, 8)
+        for row_step, col_step in KNIGHT_STEPS:
+            if 0 <= row + row_step < 8 and 0 <= col + col_step < 8:
+                targets[square, 8 * (row + row_step) + col + col_step] = 1
+    return targets
+
+
+def _code_table(values, dtype) -> numpy.ndarray:
+    """
+    :param values: dictionary from each piece to its value. The empty cell
+    and the missing pieces get 0.
+    :param dtype: the type of the values.
+    :return: numpy.ndarray, the value of each piece code.
+    """
+    table = numpy.zeros(CODES, dtype=dtype)
+    for piece, code in Board.PIECE_CODES.items():
+        table[code] = values.get(piece, 0)
+    return table
+
+
+def _slide_table() -> numpy.ndarray:
+    """
+    :return: numpy.ndarray of shape (CODES, 8), 1 where the piece with the
+    code slides in the direction of DIRECTIONS.
+    """
+    slides = numpy.zeros((CODES, len(DIRECTIONS)), dtype=numpy.int64)
+    for piece, piece_type in Evaluation.PIECE_TYPES.items():
+        if piece_type in ('R', 'Q'):
+            slides[Board.PIECE_CODES[piece], list(ROOK_DIRECTIONS)] = 1
+        if piece_type in ('B', 'Q'):
+            slides[Board.PIECE_CODES[piece], list(BISHOP_DIRECTIONS)] = 1
+    return slides
+
+
+# The centipawns of each cell that a piece can move to.
+MOBILITY_WEIGHTS = {'N': 4, 'B': 4, 'R': 2, 'Q': 1}
+
+RAYS = _rays()
+KNIGHT_TARGETS = _knight_targets()
+
+# The tables of the piece codes: the piece-square scores, the phase, the color
+# (1 for white, -1 for black and 0 for the empty cell), the mobility weight
+# (negative for black), whether the piece is a knight, the directions it
+# slides in, and whether it slides at all.
+MIDDLE_GAME = _piece_table(Evaluation.MIDDLE_GAME)
+END_GAME = _piece_table(Evaluation.END_GAME)
+PHASE = _code_table(Evaluation.PHASE, numpy.int64)
+COLORS = _code_table({piece: 1 if Pieces.get_piece_color(piece) ==
+                      Pieces.get_piece_color(Pieces.WHITE_PAWN) else -1
+                      for piece in Evaluation.PIECE_TYPES}, numpy.int64)
+MOBILITY = _code_table({piece: COLORS[Board.PIECE_CODES[piece]] *
+                        MOBILITY_WEIGHTS.get(piece_type, 0)
+                        for piece, piece_type
+                        in Evaluation.PIECE_TYPES.items()}, numpy.int64)
+KNIGHTS = _code_table({Pieces.WHITE_HORSE: 1, Pieces.BLACK_HORSE: 1},
+                      numpy.int64)
+SLIDES = _slide_table()
+SLIDERS = SLIDES.any(axis=1)
+
+
+class BatchEvaluation:
+    """
+    This class scores batches of positions with vectorised NumPy calls. The
+    score has the same terms as the evaluation function of the board, the
+    tapered piece-square tables (which include the material), and it can add
+    the mobility of the pieces: the number of cells that each knight, bishop,
+    rook and queen can move to, weighted by MOBILITY_WEIGHTS.
+
+    Without mobility, the score of a position is the score of
+    Board.evaluation_function. The board keeps that score incrementally, so
+    for it alone batching saves only the moves of the leaves. Mobility costs a
+    move generation per leaf, which batching replaces by array operations.
+    """
+
+    def __init__(self, mobility: bool = True):
+        """
+        Default c'tor.
+        :param mobility: bool, whether the score includes the mobility of the
+        pieces.
+        """
+        self.mobility = mobility
+
+    @staticmethod
+    def encode_board(board: Board) -> numpy.ndarray:
+        """
+        :param board: Board, the position.
+        :return: numpy.ndarray of shape (64,), the int8 piece codes of the
+        cells of the position.
+        """
+        return numpy.frombuffer(board.get_snapshot(), dtype=numpy.int8,
+                                count=64)
+
+    @staticmethod
+    def encode_boards(boards: List[Board]) -> numpy.ndarray:
+        """
+        :param boards: List[Board], the positions.
+        :return: numpy.ndarray of shape (N, 64), the int8 piece codes of the
+        cells of each position.
+        """
+        snapshots = b''.join(board.get_snapshot() for board in boards)
+        return numpy.frombuffer(snapshots, dtype=numpy.int8) \
+            .reshape(-1, 65)[:, :64]
+
+    @staticmethod
+    def encode_moves(board: Board, moves: List[Move]) -> numpy.ndarray:
+        """
+        This function encodes the positions after each one of the moves of
+        the board, without playing them: each position is the position of the
+        board with the moved piece taken off its cell and put on its target.
+        :param board: Board, the position before the moves.
+        :param moves: List[Move], moves of the board.
+        :return: numpy.ndarray of shape (N, 64), the int8 piece codes of the
+        cells of the position after each move.
+        """
+        codes = Board.PIECE_CODES
+        positions = numpy.repeat(
+            BatchEvaluation.encode_board(board)[numpy.newaxis],
+            len(moves), axis=0)
+        rows = numpy.arange(len(moves))
+        positions[rows, [8 * move.from_row + move.from_col
+                         for move in moves]] = 0
+        positions[rows, [8 * move.to_row + move.to_col for move in moves]] = \
+            [codes[move.from_piece] for move in moves]
+        return positions
+
+    def evaluate(self, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        This function scores a batch of positions.
+        :param positions: numpy.ndarray of shape (N, 64), the piece codes of
+        the cells of each position, see encode_boards.
+        :return: numpy.ndarray of shape (N,), the int64 score of each
+        position, positive when white is better.
+        """
+        positions = numpy.asarray(positions).astype(numpy.intp)
+        cells = positions * 64 + SQUARES
+        middle_game = MIDDLE_GAME[cells].sum(axis=1)
+        end_game = END_GAME[cells].sum(axis=1)
+        phase = numpy.minimum(PHASE[positions].sum(axis=1),
+                              Evaluation.MAX_PHASE)
+        scores = (middle_game * phase + end_game *
+                  (Evaluation.MAX_PHASE - phase)) // Evaluation.MAX_PHASE
+        if self.mobility:
+            scores += (BatchEvaluation.mobility(positions) *
+                       MOBILITY[positions]).sum(axis=1)
+        return scores
+
+    @staticmethod
+    def mobility(positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        This function counts the cells that the knight, bishop, rook or queen
+        on each cell can move to: the empty cells, and the cells of the pieces
+        of the opponent. The other cells count 0.
+        :param positions: numpy.ndarray of shape (N, 64), the piece codes of
+        the cells of each position.
+        :return: numpy.ndarray of shape (N, 64), the count of each cell.
+        """
+        positions = numpy.asarray(positions).astype(numpy.intp)
+        colors = COLORS[positions]
+        counts = numpy.zeros(positions.shape, dtype=numpy.int64)
+
+        # The knights: the cells they attack, without the cells of their own
+        # pieces. Only the cells of the pieces are looked at, since most of
+        # the cells of a position are empty.
+        rows, cells = numpy.nonzero(KNIGHTS[positions])
+        own = colors[rows] == colors[rows, cells][:, numpy.newaxis]
+        counts[rows, cells] = (KNIGHT_TARGETS[cells] * ~own).sum(axis=1)
+
+        # The sliding pieces: the empty cells of each ray up to its first
+        # piece, and that piece if it belongs to the opponent. The extra cell
+        # 64 stops the rays at the edge of the board.
+        rows, cells = numpy.nonzero(SLIDERS[positions])
+        padded_colors = numpy.concatenate(
+            (colors, numpy.full((len(positions), 1), 2)), axis=1)
+        ray_colors = numpy.take(padded_colors, RAYS[cells] + 65 *
+                                rows[:, numpy.newaxis, numpy.newaxis])
+        distances = (ray_colors != 0).argmax(axis=2)
+        blocker_colors = numpy.take_along_axis(
+            ray_colors, distances[:, :, numpy.newaxis], axis=2)[:, :, 0]
+        captures = blocker_colors * colors[rows, cells][:, numpy.newaxis] == -1
+        counts[rows, cells] = ((distances + captures) *
+                               SLIDES[positions[rows, cells]]).sum(axis=1)
+        return counts
+
+    def evaluate_moves(self, board: Board, moves: List[Move]) -> List[int]:
+        """
+        This function scores the positions after each one of the moves of the
+        board, in one batch, without playing the moves.
+        :param board: Board, the position before the moves.
+        :param moves: List[Move], moves of the board.
+        :return: List[int], the score of the position after each move.
+        """
+        return self.evaluate(
+            BatchEvaluation.encode_moves(board, moves)).tolist()
+
+    def evaluate_board(self, board: Board) -> int:
+        """
+        This function scores one position the way the search scores a leaf
+        one at a time: the evaluation function of the board, and the mobility
+        counted by the move generation of the board. It gives the same score
+        as evaluate, and it is the per-leaf reference of the benchmark.
+        :param board: Board, the position.
+        :return: int, the score of the position.
+        """
+        score = board.evaluation_function()
+        if self.mobility:
+            for color in (Pieces.get_piece_color(Pieces.WHITE_PAWN),
+                          Pieces.get_piece_color(Pieces.BLACK_PAWN)):
+                for move in board.get_all_moves(color):
+                    score += MOBILITY[
+                        Board.PIECE_CODES[move.from_piece]]
+        return int(score)
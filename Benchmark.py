@@ -0,0 +1,291 @@
+import argparse
+import random
+from time import perf_counter
+from BitBoard import BitBoard
+from ComputerAI import ComputerAI
+from Board import Board
+from Consts import Colors, Difficulties
+from PGN import move_to_coordinates
+from Perft import perft
+
+BACKENDS = {
+    'board': Board,
+    'bitboard': BitBoard
+}
+
+
+def benchmark_parallel_search(tree_depth: int, workers_list) -> None:
+    """
+    This function measures how the parallel search scales with the number of
+    worker processes. Each configuration searches the same position, after the
+    pool is warmed up by a shallow search, and the speedup is relative to the
+    sequential search.
+    :param tree_depth: int, the tree depth of the searches.
+    :param workers_list: the numbers of workers to measure.
+    :return: None
+    """
+    board = BitBoard.default_ctor()
+    board.move_piece(board.get_all_possible_moves(6, 4)[0])
+
+    base_time = None
+    for workers in workers_list:
+        computer_ai = ComputerAI(tree_depth, workers=workers)
+        computer_ai.iterative_deepening(board, Colors['BLACK'],
+                                        Colors['WHITE'], 0, True)
+        start = perf_counter()
+        best_moves = computer_ai.iterative_deepening(board, Colors['BLACK'],
+                                                     Colors['WHITE'],
+                                                     tree_depth, True)
+        elapsed = perf_counter() - start
+        computer_ai.close()
+        if base_time is None:
+            base_time = elapsed
+        print('workers: {:3d}  time: {:8.3f}s  speedup: {:5.2f}  nodes: {:9d}'
+              '  best moves: {}'.format(workers, elapsed, base_time / elapsed,
+                                        computer_ai.nodes, len(best_moves)))
+
+
+def benchmark_minmax(tree_depth: int, backend: str, repeat: int) -> None:
+    """
+    This function measures the cost of one node of the minmax algorithm. The
+    minmax algorithm visits every node of the tree, so the number of its nodes
+    (moves played) is the sum of the perft numbers of the root position. The
+    quiescence search is turned off, so the tree has no other nodes.
+    :param tree_depth: int, the tree depth of the minmax algorithm.
+    :param backend: str, the name of the board class, see BACKENDS.
+    :param repeat: int, the number of runs. The fastest run is reported.
+    :return: None
+    """
+    board = BACKENDS[backend].default_ctor()
+    board.move_piece(board.get_all_possible_moves(6, 4)[0])
+    nodes = sum(perft(board, depth) for depth in range(1, tree_depth + 2))
+
+    computer_ai = ComputerAI(tree_depth, use_quiescence=False)
+    elapsed = None
+    for _ in range(0, repeat):
+        start = perf_counter()
+        computer_ai.minmax_algorithm(board, Colors['BLACK'], Colors['WHITE'],
+                                     tree_depth, True)
+        run_time = perf_counter() - start
+        if elapsed is None or run_time < elapsed:
+            elapsed = run_time
+    print('minmax depth {}  {} nodes in {:.3f}s  {:.2f} us/node  {:.0f} nps'
+          .format(tree_depth, nodes, elapsed, 1e6 * elapsed / nodes,
+                  nodes / elapsed))
+
+
+def benchmark_search(tree_depth: int, plies: int) -> None:
+    """
+    This function measures the alpha-beta search on the positions of a short
+    game of the computer against itself: the nodes, the time and the quality
+    of the move ordering.
+    :param tree_depth: int, the tree depth of the searches.
+    :param plies: int, the number of moves of the game.
+    :return: None
+    """
+    board = BitBoard.default_ctor()
+    computer_ai = ComputerAI(tree_depth)
+    total_nodes, total_time = 0, 0.0
+    for ply in range(0, plies):
+        if board.side_to_move == Colors['WHITE']:
+            colors, is_min = (Colors['WHITE'], Colors['BLACK']), False
+        else:
+            colors, is_min = (Colors['BLACK'], Colors['WHITE']), True
+        computer_ai.nodes = 0
+        start = perf_counter()
+        best_moves = computer_ai.iterative_deepening(board, colors[0],
+                                                     colors[1], tree_depth,
+                                                     is_min)
+        elapsed = perf_counter() - start
+        if not best_moves:
+            break
+        statistics = computer_ai.move_ordering.get_statistics()
+        print('ply {:3d}  nodes {:8d}  time {:7.3f}s  cutoffs {:7d}  '
+              'first move {:6.1%}'.format(
+                  ply, computer_ai.nodes, elapsed, statistics['cutoffs'],
+                  statistics['first_move_cutoff_rate']))
+        total_nodes += computer_ai.nodes
+        total_time += elapsed
+        if board.move_piece(best_moves[0][0]):
+            break
+    print('total {} nodes in {:.2f}s, {:.0f} nps'.format(
+        total_nodes, total_time, total_nodes / total_time))
+
+
+def benchmark_batch(sizes, tree_depth: int, repeat: int) -> None:
+    """
+    This function compares the batched evaluation (see BatchEvaluation) with
+    the evaluation of one leaf at a time. First, batches of N positions of
+    random games are scored both ways, for each N of sizes, with and without
+    the mobility term. Then, the search of a few positions is run with the
+    leaves scored one by one and in batches, and the best moves are checked to
+    be the same when the batches score the same terms.
+    :param sizes: the numbers of positions of the batches.
+    :param tree_depth: int, the tree depth of the searches.
+    :param repeat: int, the number of runs. The fastest run is reported.
+    :return: None
+    """
+    # Imported here, so the other benchmarks run without NumPy.
+    from BatchEvaluation import BatchEvaluation
+
+    def fastest(function):
+        best = None
+        for _ in range(0, repeat):
+            start = perf_counter()
+            function()
+            elapsed = perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        return best
+
+    # The positions of random games.
+    rng = random.Random(0)
+    boards = []
+    while len(boards) < max(sizes):
+        board = BitBoard.default_ctor()
+        for _ in range(0, 60):
+            moves = board.get_all_moves(board.side_to_move)
+            if not moves or board.move_piece(rng.choice(moves)):
+                break
+            boards.append(board.copy())
+
+    for mobility in (False, True):
+        evaluation = BatchEvaluation(mobility)
+        print('mobility: {}'.format('on' if mobility else 'off'))
+        for size in sizes:
+            batch = boards[:size]
+            per_leaf = fastest(lambda: [evaluation.evaluate_board(board)
+                                        for board in batch])
+            encoded = fastest(lambda: evaluation.evaluate(
+                BatchEvaluation.encode_boards(batch)))
+            positions = BatchEvaluation.encode_boards(batch)
+            batched = fastest(lambda: evaluation.evaluate(positions))
+            print('N {:5d}  per leaf {:7.2f} us  batched {:7.2f} us  '
+                  '(with encoding {:7.2f} us)  speedup {:5.2f}'.format(
+                      size, 1e6 * per_leaf / size, 1e6 * batched / size,
+                      1e6 * encoded / size, per_leaf / encoded))
+
+    board = BitBoard.default_ctor()
+    for move in ('e2e4', 'e7e5', 'g1f3', 'b8c6'):
+        board.move_piece(next(
+            candidate for candidate in board.get_all_moves(board.side_to_move)
+            if move_to_coordinates(candidate) == move))
+    for name, batch_leaves, mobility in (('per leaf', False, False),
+                                         ('batched', True, False),
+                                         ('batched + mobility', True, True)):
+        computer_ai = ComputerAI(tree_depth, use_quiescence=False,
+                                 opening_book=None, tablebases=None,
+                                 batch_leaves=batch_leaves)
+        if batch_leaves:
+            # With mobility the batched leaves have another scale than the
+            # other leaves of the tree, so that run is for its time alone.
+            computer_ai.batch_evaluation = BatchEvaluation(mobility)
+        best_moves = []
+
+        def search():
+            computer_ai.transposition_table.clear()
+            computer_ai.nodes = 0
+            best_moves[:] = computer_ai.iterative_deepening(
+                board, Colors['WHITE'], Colors['BLACK'], tree_depth, False)
+
+        elapsed = fastest(search)
+        print('{:20s} depth {}  nodes {:7d}  time {:7.3f}s  best moves {}'
+              .format(name, tree_depth, computer_ai.nodes, elapsed,
+                      sorted((move.pack(), score)
+                             for move, score in best_moves)))
+        computer_ai.close()
+
+
+def benchmark_latency(difficulties, games: int, plies: int) -> None:
+    """
+    This function measures the time of the moves of each difficulty. The
+    computer plays against itself, from the initial position, and the times of
+    all its moves are reported as percentiles.
+    :param difficulties: the names of the difficulties, see Difficulties.
+    :param games: int, the number of games per difficulty.
+    :param plies: int, the number of moves of each game.
+    :return: None
+    """
+    for name in difficulties:
+        times = []
+        for game in range(0, games):
+            board = BitBoard.default_ctor()
+            players = {
+                Colors['BLACK']: ComputerAI(Difficulties[name],
+                                            Colors['BLACK'], Colors['WHITE']),
+                Colors['WHITE']: ComputerAI(Difficulties[name],
+                                            Colors['WHITE'], Colors['BLACK'])
+            }
+            for ply in range(0, plies):
+                start = perf_counter()
+                move = players[board.side_to_move].computers_play(board)
+                times.append(perf_counter() - start)
+                if move is None or board.move_piece(move):
+                    break
+        times.sort()
+
+        def percentile(fraction):
+            return times[min(len(times) - 1, int(fraction * len(times)))]
+
+        print('{:6s}  moves {:5d}  p50 {:7.3f}s  p99 {:7.3f}s  max {:7.3f}s  '
+              'limit {}s'.format(name, len(times), percentile(0.5),
+                                 percentile(0.99), times[-1],
+                                 Difficulties[name]['TIME_LIMIT']))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the engine.')
+    subparsers = parser.add_subparsers(dest='benchmark')
+
+    parallel = subparsers.add_parser('parallel',
+                                     help='scaling of the parallel search')
+    parallel.add_argument('--depth', type=int, default=3)
+    parallel.add_argument('--workers', type=int, nargs='+',
+                          default=[1, 4, 8, 16])
+
+    minmax = subparsers.add_parser('minmax',
+                                   help='cost of one node of the minmax')
+    minmax.add_argument('--depth', type=int, default=2)
+    minmax.add_argument('--backend', choices=sorted(BACKENDS),
+                        default='bitboard')
+    minmax.add_argument('--repeat', type=int, default=3)
+
+    search = subparsers.add_parser('search',
+                                   help='nodes and move ordering of the '
+                                        'alpha-beta search')
+    search.add_argument('--depth', type=int, default=3)
+    search.add_argument('--plies', type=int, default=10)
+
+    latency = subparsers.add_parser('latency',
+                                    help='time of the moves of each '
+                                         'difficulty')
+    latency.add_argument('--difficulties', nargs='+',
+                         choices=sorted(Difficulties),
+                         default=['EASY', 'MEDIUM', 'HARD'])
+    latency.add_argument('--games', type=int, default=2)
+    latency.add_argument('--plies', type=int, default=40)
+
+    batch = subparsers.add_parser('batch',
+                                  help='batched and per-leaf evaluation')
+    batch.add_argument('--sizes', type=int, nargs='+',
+                       default=[1, 8, 32, 128, 512, 2048])
+    batch.add_argument('--depth', type=int, default=2)
+    batch.add_argument('--repeat', type=int, default=3)
+
+    args = parser.parse_args()
+    if args.benchmark == 'parallel':
+        benchmark_parallel_search(args.depth, args.workers)
+    elif args.benchmark == 'minmax':
+        benchmark_minmax(args.depth, args.backend, args.repeat)
+    elif args.benchmark == 'search':
+        benchmark_search(args.depth, args.plies)
+    elif args.benchmark == 'batch':
+        benchmark_batch(args.sizes, args.depth, args.repeat)
+    elif args.benchmark == 'latency':
+        benchmark_latency(args.difficulties, args.games, args.plies)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
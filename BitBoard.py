@@ -0,0 +1,489 @@
+from Pieces import Pieces
+from Consts import Colors
+from Move import Move
+from Board import Board
+from Zobrist import Zobrist
+from Evaluation import Evaluation
+from typing import List, Dict
+
+# The cells of the board are numbered 0..63, row by row, such that the cell
+# (row, col) is the bit number (8 * row + col) of a bitboard. Thus the top left
+# cell of the board (a8) is bit 0 and the bottom right cell (h1) is bit 63.
+
+FULL_BOARD = (1 << 64) - 1
+
+
+def _bit(row: int, col: int) -> int:
+    """
+    :return: the bitboard with the only bit of cell (row, col) set, or 0 if
+    the cell is outside of the board.
+    """
+    if 0 <= row <= 7 and 0 <= col <= 7:
+        return 1 << (8 * row + col)
+    return 0
+
+
+def _step_table(steps) -> List[int]:
+    """
+    Builds the table of cells that can be reached from each cell with one of
+    the given (row, col) steps.
+    """
+    table = []
+    for square in range(0, 64):
+        row, col = divmod(square, 8)
+        targets = 0
+        for d_row, d_col in steps:
+            targets |= _bit(row + d_row, col + d_col)
+        table.append(targets)
+    return table
+
+
+def _ray_attacks(square: int, occupancy: int, directions) -> int:
+    """
+    Walks the rays that start at the given cell in the given directions. Each
+    ray stops at the first occupied cell, which is included in the attacks.
+    """
+    row, col = divmod(square, 8)
+    attacks = 0
+    for d_row, d_col in directions:
+        temp_row, temp_col = row + d_row, col + d_col
+        while 0 <= temp_row <= 7 and 0 <= temp_col <= 7:
+            bit = 1 << (8 * temp_row + temp_col)
+            attacks |= bit
+            if occupancy & bit:
+                break
+            temp_row += d_row
+            temp_col += d_col
+    return attacks
+
+
+def _relevant_mask(square: int, directions) -> int:
+    """
+    The cells whose occupancy may change the attacks of a slider on the given
+    cell. The last cell of every ray is not relevant, since the ray stops there
+    anyway.
+    """
+    row, col = divmod(square, 8)
+    mask = 0
+    for d_row, d_col in directions:
+        temp_row, temp_col = row + d_row, col + d_col
+        while 0 <= temp_row + d_row <= 7 and 0 <= temp_col + d_col <= 7:
+            mask |= 1 << (8 * temp_row + temp_col)
+            temp_row += d_row
+            temp_col += d_col
+    return mask
+
+
+def _slider_table(square: int, directions) -> Dict[int, int]:
+    """
+    Builds the attack table of a slider on the given cell: every subset of the
+    relevant mask is mapped to the attacks of the slider on that occupancy.
+    This is the same idea as the magic bitboards, except that the python dict
+    does the hashing that the magic multiplication does in C engines.
+
+    The subsets of each ray are enumerated separately (carry-rippler trick), and
+    the table of the cell is the product of the tables of its rays.
+    """
+    combinations = [(0, 0)]
+    for direction in directions:
+        ray_mask = _relevant_mask(square, (direction,))
+        ray_table = []
+        subset = 0
+        while True:
+            ray_table.append((subset,
+                              _ray_attacks(square, subset, (direction,))))
+            subset = (subset - ray_mask) & ray_mask
+            if subset == 0:
+                break
+        combinations = [(occupancy | ray_occupancy, attacks | ray_attacks)
+                        for occupancy, attacks in combinations
+                        for ray_occupancy, ray_attacks in ray_table]
+    return dict(combinations)
+
+
+class _LazySliderTable(dict):
+    """
+    The placeholder of the attack table of a slider on one cell, until the
+    table is used. The rook tables have about 100,000 entries, and building
+    them took most of the time of importing this module, so the table of each
+    cell is built on its first lookup. The placeholder is empty, so the first
+    lookup misses: it builds the table and puts it in place of the placeholder,
+    such that all the later lookups are plain list and dict lookups.
+    """
+
+    def __init__(self, tables: list, square: int, directions):
+        super(_LazySliderTable, self).__init__()
+        self.tables = tables
+        self.square = square
+        self.directions = directions
+
+    def __missing__(self, occupancy: int) -> int:
+        table = _slider_table(self.square, self.directions)
+        self.tables[self.square] = table
+        return table[occupancy]
+
+
+def _slider_tables(directions) -> list:
+    """
+    :return: list of the attack tables of a slider, one per cell, each one
+    built on its first lookup (see _LazySliderTable).
+    """
+    tables = []
+    tables.extend(_LazySliderTable(tables, square, directions)
+                  for square in range(0, 64))
+    return tables
+
+
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (-1, -1), (-1, 1), (1, -1))
+
+KNIGHT_ATTACKS = _step_table(((-2, -1), (-2, 1), (2, -1), (2, 1),
+                              (-1, -2), (1, -2), (-1, 2), (1, 2)))
+KING_ATTACKS = _step_table(((-1, -1), (-1, 0), (-1, 1), (0, -1),
+                            (0, 1), (1, -1), (1, 0), (1, 1)))
+WHITE_PAWN_ATTACKS = _step_table(((-1, -1), (-1, 1)))
+BLACK_PAWN_ATTACKS = _step_table(((1, -1), (1, 1)))
+
+ROOK_MASKS = [_relevant_mask(square, ROOK_DIRECTIONS)
+              for square in range(0, 64)]
+BISHOP_MASKS = [_relevant_mask(square, BISHOP_DIRECTIONS)
+                for square in range(0, 64)]
+ROOK_ATTACKS = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_ATTACKS = _slider_tables(BISHOP_DIRECTIONS)
+
+# The color of each piece, and the color of its opponent.
+PIECE_COLORS = {}
+OPPONENT_COLORS = {}
+for _piece in Pieces.get_list_of_pieces():
+    if _piece != Pieces.NONE:
+        PIECE_COLORS[_piece] = Pieces.get_piece_color(_piece)
+        OPPONENT_COLORS[_piece] = Colors['WHITE'] \
+            if PIECE_COLORS[_piece] == Colors['BLACK'] else Colors['BLACK']
+
+# The way each piece moves.
+WHITE_PAWN_KIND, BLACK_PAWN_KIND, KNIGHT_KIND, BISHOP_KIND, ROOK_KIND, \
+    QUEEN_KIND, KING_KIND = range(0, 7)
+PIECE_KINDS = {
+    Pieces.WHITE_PAWN: WHITE_PAWN_KIND,
+    Pieces.BLACK_PAWN: BLACK_PAWN_KIND,
+    Pieces.WHITE_HORSE: KNIGHT_KIND,
+    Pieces.BLACK_HORSE: KNIGHT_KIND,
+    Pieces.WHITE_BISHOP: BISHOP_KIND,
+    Pieces.BLACK_BISHOP: BISHOP_KIND,
+    Pieces.WHITE_ROOK: ROOK_KIND,
+    Pieces.BLACK_ROOK: ROOK_KIND,
+    Pieces.WHITE_QUEEN: QUEEN_KIND,
+    Pieces.BLACK_QUEEN: QUEEN_KIND,
+    Pieces.WHITE_KING: KING_KIND,
+    Pieces.BLACK_KING: KING_KIND
+}
+
+# Rows 6 and 1 are the initial rows of the white and black pawns.
+WHITE_PAWN_ROW = 0xFF << 48
+BLACK_PAWN_ROW = 0xFF << 8
+
+
+class BitBoard(Board):
+    """
+    This class is a logical board that is built on bitboards. A bitboard is a
+    64 bit integer with one bit per cell of the board. The board keeps one
+    bitboard for each piece type and color, and one for all the pieces of each
+    color, so the moves of a piece are computed with a few integer operations
+    and table lookups instead of walking the cells one by one.
+
+    It keeps the public interface of Board, so it can be used everywhere a
+    Board is used. Next to the bitboards it keeps a list of the 64 pieces, so a
+    query of the piece on a single cell is one list lookup.
+    """
+
+    def __init__(self):
+        """ This function init the board """
+        super(BitBoard, self).__init__()
+
+        # The piece on each one of the 64 cells.
+        self.squares = [Pieces.NONE] * 64
+
+        # Bitboard of each piece type and color.
+        self.bitboards = {}
+        for piece in Pieces.get_list_of_pieces():
+            if piece != Pieces.NONE:
+                self.bitboards[piece] = 0
+
+        # Bitboards of all pieces of each color.
+        self.occupancy = {Colors['WHITE']: 0, Colors['BLACK']: 0}
+
+    @staticmethod
+    def default_ctor(user_color=Colors['WHITE'],
+                     computer_color=Colors['BLACK']):
+        """ This function is default constructor of the board. """
+
+        board = BitBoard()
+        board.user_color = user_color
+        board.computer_color = computer_color
+        board.set_start_position()
+        return board
+
+    def get_snapshot(self) -> bytes:
+        """
+        This function packs the position into 65 bytes, like
+        Board.get_snapshot, from the list of the pieces of the cells.
+        :return: bytes, the snapshot of the position.
+        """
+        codes = Board.PIECE_CODES
+        return bytes([codes[piece] for piece in self.squares] +
+                     [0 if self.side_to_move == Colors['WHITE'] else 1])
+
+    def set_piece_at(self, row, col, piece):
+        """ This function sets piece on (row, col) cell on board.
+        :param: row, the row coordinate of the piece.
+        :param: col, the col coordinate of the piece.
+        :return: None """
+        square = 8 * row + col
+        bit = 1 << square
+        old_piece = self.squares[square]
+        self.zobrist_key ^= Zobrist.PIECE_KEYS[old_piece][square]
+        self.zobrist_key ^= Zobrist.PIECE_KEYS[piece][square]
+        self.middle_game_score += Evaluation.MIDDLE_GAME[piece][square] - \
+            Evaluation.MIDDLE_GAME[old_piece][square]
+        self.end_game_score += Evaluation.END_GAME[piece][square] - \
+            Evaluation.END_GAME[old_piece][square]
+        self.phase += Evaluation.PHASE[piece] - Evaluation.PHASE[old_piece]
+        if old_piece != Pieces.NONE:
+            self.bitboards[old_piece] ^= bit
+            self.occupancy[PIECE_COLORS[old_piece]] ^= bit
+        if piece != Pieces.NONE:
+            self.bitboards[piece] |= bit
+            self.occupancy[PIECE_COLORS[piece]] |= bit
+        self.squares[square] = piece
+
+    def get_piece_at(self, row, col):
+        """ This function returns the piece at cell with coordinates of
+        (row, col).
+        :param: row, the row coordinate of the piece.
+        :param: col, the col coordinate of the piece.
+        :return: the piece. """
+        return self.squares[8 * row + col]
+
+    def get_cell_color_at(self, row, col):
+        """ This function returns the color of cell on row x col.
+        :param: row, is the row of the cell.
+        :param: col, is the col of the cell.
+        :return: The color of the cell."""
+        if (row + col) % 2 == 0:
+            return Colors['CORNSILK']
+        return Colors['SADDLEBROWN']
+
+    def __targets(self, square: int, piece) -> int:
+        """
+        This function computes the bitboard of all cells that the piece on the
+        given cell can move to.
+        :param square: int, the number of the cell of the piece.
+        :param piece: the piece on that cell.
+        :return: int, the bitboard of the target cells.
+        """
+        own = self.occupancy[PIECE_COLORS[piece]]
+        opponent = self.occupancy[OPPONENT_COLORS[piece]]
+        kind = PIECE_KINDS[piece]
+
+        if kind == WHITE_PAWN_KIND:
+            bit = 1 << square
+            empty = ~(own | opponent) & FULL_BOARD
+            targets = (bit >> 8) & empty
+            if targets and bit & WHITE_PAWN_ROW:
+                targets |= (bit >> 16) & empty
+            return targets | (WHITE_PAWN_ATTACKS[square] & opponent)
+        if kind == BLACK_PAWN_KIND:
+            bit = 1 << square
+            empty = ~(own | opponent) & FULL_BOARD
+            targets = (bit << 8) & empty
+            if targets and bit & BLACK_PAWN_ROW:
+                targets |= (bit << 16) & empty
+            return targets | (BLACK_PAWN_ATTACKS[square] & opponent)
+        if kind == KNIGHT_KIND:
+            return KNIGHT_ATTACKS[square] & ~own
+        if kind == KING_KIND:
+            return KING_ATTACKS[square] & ~own
+
+        occupied = own | opponent
+        if kind == ROOK_KIND:
+            targets = ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]]
+        elif kind == BISHOP_KIND:
+            targets = BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+        else:
+            targets = ROOK_ATTACKS[square][occupied & ROOK_MASKS[square]] | \
+                BISHOP_ATTACKS[square][occupied & BISHOP_MASKS[square]]
+        return targets & ~own
+
+    def __moves_from(self, square: int, moves: List[Move],
+                     target_mask: int = FULL_BOARD) -> None:
+        """
+        This function appends all possible moves of the piece on the given cell
+        to the list of moves.
+        :param square: int, the number of the cell of the piece.
+        :param moves: List[Move], the list to append the moves to.
+        :param target_mask: int, the bitboard of the cells that the moves may
+        go to.
+        :return: None
+        """
+        piece = self.squares[square]
+        from_row, from_col = divmod(square, 8)
+        squares = self.squares
+        targets = self.__targets(square, piece) & target_mask
+        while targets:
+            bit = targets & -targets
+            target = bit.bit_length() - 1
+            targets ^= bit
+            moves.append(Move(from_row, from_col, target >> 3, target & 7,
+                              piece, squares[target]))
+
+    def get_all_possible_moves(self, row: int, col: int) -> List[Move]:
+        """
+        This function computes and returns all possible and legal moves
+        for selected cell on (row, col)
+        :param row: int, row on the board.
+        :param col: int, col on the board.
+        :return: List[Move] all possible moves that can be done from cell on
+        (row, col).
+        """
+        moves = []
+        if self.squares[8 * row + col] != Pieces.NONE:
+            self.__moves_from(8 * row + col, moves)
+        return moves
+
+    def get_all_moves(self, color) -> List[Move]:
+        """
+        This function computes and returns all possible and legal moves of the
+        player with the given color. The cells are scanned row by row, from the
+        top left corner of the board.
+        :param color: the color of the player.
+        :return: List[Move], all possible moves of the player.
+        """
+        moves = []
+        pieces = self.occupancy[color]
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            self.__moves_from(bit.bit_length() - 1, moves)
+        return moves
+
+    def get_all_captures(self, color) -> List[Move]:
+        """
+        This function computes and returns all possible and legal moves of the
+        player with the given color that eat a piece of the opponent.
+        :param color: the color of the player.
+        :return: List[Move], all possible captures of the player.
+        """
+        moves = []
+        opponent = self.occupancy[Colors['BLACK'] if color == Colors['WHITE']
+                                  else Colors['WHITE']]
+        pieces = self.occupancy[color]
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            self.__moves_from(bit.bit_length() - 1, moves, opponent)
+        return moves
+
+    def get_moves_to(self, row: int, col: int, piece) -> List[Move]:
+        """
+        This function computes and returns all possible moves of the pieces of
+        the given kind and color to the cell on (row, col). It is used to read
+        and write moves in SAN, which name the piece and the cell only.
+        :param row: int, row of the target cell.
+        :param col: int, col of the target cell.
+        :param piece: the piece, like Pieces.WHITE_HORSE.
+        :return: List[Move], the moves.
+        """
+        moves = []
+        target = 1 << (8 * row + col)
+        pieces = self.bitboards[piece]
+        while pieces:
+            bit = pieces & -pieces
+            pieces ^= bit
+            self.__moves_from(bit.bit_length() - 1, moves, target)
+        return moves
+
+    def move_piece(self, move: Move) -> bool:
+        """
+        This function responsible for performaing logical piece movement. The
+        piece is moved by flipping its bits in the bitboards.
+
+        Note: The main assumption is the move variable holds Move that is
+        constructed by means of this class and thus is is legal move to be
+        performed. If you supply this function a move that is not legal move
+        then we it may have undefined behaviour.
+
+        :param move: Move object, holds the move that should be performed.
+        :return: True, if and only if the King was killed as a result of move.
+        """
+        from_square = 8 * move.from_row + move.from_col
+        to_square = 8 * move.to_row + move.to_col
+        from_piece = move.from_piece
+        to_piece = move.to_piece
+        to_bit = 1 << to_square
+        move_bits = (1 << from_square) | to_bit
+
+        self.bitboards[from_piece] ^= move_bits
+        self.occupancy[PIECE_COLORS[from_piece]] ^= move_bits
+        self.squares[from_square] = Pieces.NONE
+        self.squares[to_square] = from_piece
+        self.move_stack.append(move)
+        self.switch_side_to_move()
+        piece_keys = Zobrist.PIECE_KEYS[from_piece]
+        self.zobrist_key ^= piece_keys[from_square] ^ piece_keys[to_square]
+        middle_game = Evaluation.MIDDLE_GAME[from_piece]
+        end_game = Evaluation.END_GAME[from_piece]
+        self.middle_game_score += middle_game[to_square] - \
+            middle_game[from_square]
+        self.end_game_score += end_game[to_square] - end_game[from_square]
+        if to_piece != Pieces.NONE:
+            self.bitboards[to_piece] ^= to_bit
+            self.occupancy[PIECE_COLORS[to_piece]] ^= to_bit
+            self.total_material[to_piece] -= 1
+            self.zobrist_key ^= Zobrist.PIECE_KEYS[to_piece][to_square]
+            self.middle_game_score -= \
+                Evaluation.MIDDLE_GAME[to_piece][to_square]
+            self.end_game_score -= Evaluation.END_GAME[to_piece][to_square]
+            self.phase -= Evaluation.PHASE[to_piece]
+        if self.debug_hashing:
+            self.check_zobrist_key()
+        return to_piece == Pieces.WHITE_KING or to_piece == Pieces.BLACK_KING
+
+    def undo_move(self) -> Move:
+        """
+        This function undos' the last move that was performed. The operation
+        here is very similar to stack operation of pop. It pops the last move
+        from the board.
+        :return: Move object that strores the last move that was made on board.
+        """
+        last_move = self.move_stack.pop()
+        from_square = 8 * last_move.from_row + last_move.from_col
+        to_square = 8 * last_move.to_row + last_move.to_col
+        from_piece = last_move.from_piece
+        to_piece = last_move.to_piece
+        to_bit = 1 << to_square
+        move_bits = (1 << from_square) | to_bit
+
+        self.bitboards[from_piece] ^= move_bits
+        self.occupancy[PIECE_COLORS[from_piece]] ^= move_bits
+        self.squares[from_square] = from_piece
+        self.squares[to_square] = to_piece
+        self.switch_side_to_move()
+        piece_keys = Zobrist.PIECE_KEYS[from_piece]
+        self.zobrist_key ^= piece_keys[from_square] ^ piece_keys[to_square]
+        middle_game = Evaluation.MIDDLE_GAME[from_piece]
+        end_game = Evaluation.END_GAME[from_piece]
+        self.middle_game_score += middle_game[from_square] - \
+            middle_game[to_square]
+        self.end_game_score += end_game[from_square] - end_game[to_square]
+        if to_piece != Pieces.NONE:
+            self.bitboards[to_piece] ^= to_bit
+            self.occupancy[PIECE_COLORS[to_piece]] ^= to_bit
+            self.total_material[to_piece] += 1
+            self.zobrist_key ^= Zobrist.PIECE_KEYS[to_piece][to_square]
+            self.middle_game_score += \
+                Evaluation.MIDDLE_GAME[to_piece][to_square]
+            self.end_game_score += Evaluation.END_GAME[to_piece][to_square]
+            self.phase += Evaluation.PHASE[to_piece]
+        if self.debug_hashing:
+            self.check_zobrist_key()
+        return last_move
@@ -1,10 +1,98 @@
-import pygame
+from copy import deepcopy
 from Pieces import Pieces
-from Consts import Colors, MoveType, BoardParameters
+from Consts import Colors, BoardParameters
 from Move import Move
+from Zobrist import Zobrist
+from Evaluation import Evaluation
 from typing import List, Tuple
 
 
+def _step_targets(row: int, col: int,
+                  steps: Tuple[Tuple[int, int], ...]) -> Tuple:
+    """
+    :param row: int, the row of the piece.
+    :param col: int, the col of the piece.
+    :param steps: the (row, col) steps of the piece.
+    :return: tuple of the (row, col) cells that are one step away from the
+    cell and inside the board, in the order of the steps.
+    """
+    return tuple((row + row_step, col + col_step)
+                 for row_step, col_step in steps
+                 if 0 <= row + row_step < 8 and 0 <= col + col_step < 8)
+
+
+def _rays(row: int, col: int, directions: Tuple[Tuple[int, int], ...]) -> Tuple:
+    """
+    :param row: int, the row of the piece.
+    :param col: int, the col of the piece.
+    :param directions: the (row, col) directions of the piece.
+    :return: tuple with a ray per direction. A ray is the tuple of the (row,
+    col) cells in that direction, from the nearest to the edge of the board.
+    Empty rays are left out.
+    """
+    rays = []
+    for row_step, col_step in directions:
+        ray = []
+        temp_row, temp_col = row + row_step, col + col_step
+        while 0 <= temp_row < 8 and 0 <= temp_col < 8:
+            ray.append((temp_row, temp_col))
+            temp_row += row_step
+            temp_col += col_step
+        if ray:
+            rays.append(tuple(ray))
+    return tuple(rays)
+
+
+# The targets and rays of the pieces on each cell, indexed by 8 * row + col.
+# They are computed once, so the move generation does not check the bounds of
+# the board.
+KNIGHT_STEPS = ((-2, -1), (-2, 1), (2, -1), (2, 1),
+                (-1, -2), (1, -2), (-1, 2), (1, 2))
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (1, -1), (1, 0), (1, 1),
+              (0, -1), (0, 1))
+ROOK_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+BISHOP_DIRECTIONS = ((1, 1), (-1, -1), (-1, 1), (1, -1))
+
+KNIGHT_TARGETS = [_step_targets(_row, _col, KNIGHT_STEPS)
+                  for _row in range(0, 8) for _col in range(0, 8)]
+KING_TARGETS = [_step_targets(_row, _col, KING_STEPS)
+                for _row in range(0, 8) for _col in range(0, 8)]
+ROOK_RAYS = [_rays(_row, _col, ROOK_DIRECTIONS)
+             for _row in range(0, 8) for _col in range(0, 8)]
+BISHOP_RAYS = [_rays(_row, _col, BISHOP_DIRECTIONS)
+               for _row in range(0, 8) for _col in range(0, 8)]
+QUEEN_RAYS = [ROOK_RAYS[_square] + BISHOP_RAYS[_square]
+              for _square in range(0, 64)]
+
+# The color of each piece.
+PIECE_COLORS = {piece: Pieces.get_piece_color(piece)
+                for piece in Pieces.get_list_of_pieces()
+                if piece != Pieces.NONE}
+PIECE_COLORS[Pieces.NONE] = None
+
+# FEN (Forsyth-Edwards Notation) describes a position in one line: the pieces
+# rank by rank from the 8th (row 0), the side to move, the castling rights,
+# the en passant cell, the halfmove clock and the fullmove number.
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+
+# The letters of the pieces in the FEN notation.
+FEN_PIECES = {
+    'P': Pieces.WHITE_PAWN,
+    'N': Pieces.WHITE_HORSE,
+    'B': Pieces.WHITE_BISHOP,
+    'R': Pieces.WHITE_ROOK,
+    'Q': Pieces.WHITE_QUEEN,
+    'K': Pieces.WHITE_KING,
+    'p': Pieces.BLACK_PAWN,
+    'n': Pieces.BLACK_HORSE,
+    'b': Pieces.BLACK_BISHOP,
+    'r': Pieces.BLACK_ROOK,
+    'q': Pieces.BLACK_QUEEN,
+    'k': Pieces.BLACK_KING
+}
+FEN_LETTERS = {piece: letter for letter, piece in FEN_PIECES.items()}
+
+
 class BoardNode:
     """
     This class describes each and every cell inside the logical board. Each such
@@ -52,6 +140,14 @@ class Board:
     all logical (not visual, but logical!) operations that we can perform 
     on the board. """
 
+    # The code of each piece, see Pieces.get_piece_codes.
+    PIECE_CODES = {piece: code for code, piece
+                   in enumerate(Pieces.get_piece_codes())}
+
+    # When True, the Zobrist key is checked against a key computed from scratch
+    # after every move and undo. It is slow, so it is meant for debugging only.
+    debug_hashing = False
+
     def __init__(self):
         """ This function init the board """
 
@@ -65,6 +161,26 @@ class Board:
         # Move stack can be used to undo some move or to log the game. 
         self.move_stack = []
 
+        # The number of plies that were played before the first move of the
+        # move stack, and the halfmove clock at that point, as a FEN gives
+        # them. They keep the counters of get_fen right.
+        self.start_ply = 0
+        self.start_halfmove_clock = 0
+
+        # The color of the player that should make the next move.
+        self.side_to_move = Colors['WHITE']
+
+        # The Zobrist key of the position. It identifies the pieces on the board
+        # and the side to move, and it is updated on every change of the board.
+        self.zobrist_key = 0
+
+        # The running scores of the evaluation function (see Evaluation): the
+        # middle game and end game scores of all pieces on the board, and the
+        # phase of the game. They are updated on every change of the board.
+        self.middle_game_score = 0
+        self.end_game_score = 0
+        self.phase = 0
+
         # Total material. This will be used for evaluation functions. 
         self.total_material = {
             Pieces.WHITE_KING: 1,
@@ -109,36 +225,202 @@ class Board:
                                              Colors['CORNSILK']))
             board.board_mat.append(row)
 
-        board.set_piece_at(0, 0, Pieces.BLACK_ROOK)
-        board.set_piece_at(0, 1, Pieces.BLACK_HORSE)
-        board.set_piece_at(0, 2, Pieces.BLACK_BISHOP)
-        board.set_piece_at(0, 3, Pieces.BLACK_QUEEN)
-        board.set_piece_at(0, 4, Pieces.BLACK_KING)
-        board.set_piece_at(0, 5, Pieces.BLACK_BISHOP)
-        board.set_piece_at(0, 6, Pieces.BLACK_HORSE)
-        board.set_piece_at(0, 7, Pieces.BLACK_ROOK)
-
-        board.set_piece_at(7, 0, Pieces.WHITE_ROOK)
-        board.set_piece_at(7, 1, Pieces.WHITE_HORSE)
-        board.set_piece_at(7, 2, Pieces.WHITE_BISHOP)
-        board.set_piece_at(7, 3, Pieces.WHITE_QUEEN)
-        board.set_piece_at(7, 4, Pieces.WHITE_KING)
-        board.set_piece_at(7, 5, Pieces.WHITE_BISHOP)
-        board.set_piece_at(7, 6, Pieces.WHITE_HORSE)
-        board.set_piece_at(7, 7, Pieces.WHITE_ROOK)
-
-        for col in range(0, BoardParameters['COLS']):
-            board.set_piece_at(6, col, Pieces.WHITE_PAWN)
-            board.set_piece_at(1, col, Pieces.BLACK_PAWN)
+        board.set_start_position()
 
         return board
 
+    def copy(self):
+        """
+        This function creates an independent copy of the board, with the same
+        pieces and move stack. The copy can be searched by the computer while
+        the original board is used by the game.
+        :return: the copy of the board.
+        """
+        return deepcopy(self)
+
+    def get_snapshot(self) -> bytes:
+        """
+        This function packs the position into 65 bytes: the code of the piece
+        on each cell (see Pieces.get_piece_codes), row by row, and the side to
+        move (0 for white, 1 for black). The snapshot is cheap to send to other
+        processes, unlike the board object itself.
+        :return: bytes, the snapshot of the position.
+        """
+        codes = Board.PIECE_CODES
+        snapshot = bytearray(65)
+        for row in range(0, BoardParameters['ROWS']):
+            for col in range(0, BoardParameters['COLS']):
+                snapshot[8 * row + col] = codes[self.get_piece_at(row, col)]
+        snapshot[64] = 0 if self.side_to_move == Colors['WHITE'] else 1
+        return bytes(snapshot)
+
+    def load_snapshot(self, snapshot: bytes) -> None:
+        """
+        This function sets the position of the board from a snapshot that was
+        made by get_snapshot. The move stack of the board is cleared.
+        :param snapshot: bytes, the snapshot of the position.
+        :return: None
+        """
+        pieces = Pieces.get_piece_codes()
+        for piece in self.total_material:
+            self.total_material[piece] = 0
+        for row in range(0, BoardParameters['ROWS']):
+            for col in range(0, BoardParameters['COLS']):
+                piece = pieces[snapshot[8 * row + col]]
+                self.set_piece_at(row, col, piece)
+                if piece != Pieces.NONE:
+                    self.total_material[piece] += 1
+        side_to_move = Colors['WHITE'] if snapshot[64] == 0 else Colors['BLACK']
+        if self.side_to_move != side_to_move:
+            self.switch_side_to_move()
+        self.move_stack = []
+        self.start_ply = 0
+        self.start_halfmove_clock = 0
+
+    def load_fen(self, fen: str) -> None:
+        """
+        This function sets the position of the board from a FEN string. The
+        move stack of the board is cleared.
+
+        Only the pieces, the side to move and the move counters matter to this
+        game. The castling rights and the en passant cell are checked but
+        ignored, since the game has no castling and no en passant. The fields
+        after the pieces may be missing, like in 'rnbqkbnr/.../RNBQKBNR w'.
+        :param fen: str, the FEN string.
+        :return: None
+        :raises ValueError: if the string is not a valid FEN.
+        """
+        fields = fen.split()
+        if not 1 <= len(fields) <= 6:
+            raise ValueError('Invalid FEN {!r}: expected 1 to 6 fields.'
+                             .format(fen))
+        fields += ['w', '-', '-', '0', '1'][len(fields) - 1:]
+        placement, side, castling, en_passant, halfmove, fullmove = fields
+
+        codes = Board.PIECE_CODES
+        snapshot = bytearray(65)
+        ranks = placement.split('/')
+        if len(ranks) != BoardParameters['ROWS']:
+            raise ValueError('Invalid FEN {!r}: expected {} ranks.'.format(
+                fen, BoardParameters['ROWS']))
+        for row, rank in enumerate(ranks):
+            col = 0
+            for letter in rank:
+                if letter in '12345678':
+                    col += int(letter)
+                elif letter in FEN_PIECES and col < BoardParameters['COLS']:
+                    snapshot[8 * row + col] = codes[FEN_PIECES[letter]]
+                    col += 1
+                else:
+                    col = -1
+                    break
+            if col != BoardParameters['COLS']:
+                raise ValueError('Invalid FEN {!r}: bad rank {!r}.'.format(
+                    fen, rank))
+        if side not in ('w', 'b'):
+            raise ValueError('Invalid FEN {!r}: bad side to move {!r}.'
+                             .format(fen, side))
+        if castling != '-' and \
+                (not castling or castling.strip('KQkq') != ''):
+            raise ValueError('Invalid FEN {!r}: bad castling rights {!r}.'
+                             .format(fen, castling))
+        if en_passant != '-' and \
+                (len(en_passant) != 2 or en_passant[0] not in 'abcdefgh' or
+                 en_passant[1] not in '36'):
+            raise ValueError('Invalid FEN {!r}: bad en passant cell {!r}.'
+                             .format(fen, en_passant))
+        if not halfmove.isdigit() or not fullmove.isdigit():
+            raise ValueError('Invalid FEN {!r}: bad move counters.'
+                             .format(fen))
+
+        snapshot[64] = 0 if side == 'w' else 1
+        self.load_snapshot(bytes(snapshot))
+        self.start_ply = 2 * max(int(fullmove) - 1, 0) + snapshot[64]
+        self.start_halfmove_clock = int(halfmove)
+
+    def get_fen(self) -> str:
+        """
+        This function describes the position of the board in FEN. There are
+        no castling rights and no en passant cell in this game, so those
+        fields are always '-'.
+        :return: str, the FEN string.
+        """
+        ranks = []
+        for row in range(0, BoardParameters['ROWS']):
+            rank = ''
+            empty = 0
+            for col in range(0, BoardParameters['COLS']):
+                piece = self.get_piece_at(row, col)
+                if piece == Pieces.NONE:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += FEN_LETTERS[piece]
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+
+        # The halfmove clock counts the moves since the last capture or pawn
+        # move.
+        halfmove_clock = 0
+        for move in reversed(self.move_stack):
+            if move.to_piece != Pieces.NONE or \
+                    move.from_piece in (Pieces.WHITE_PAWN, Pieces.BLACK_PAWN):
+                break
+            halfmove_clock += 1
+        else:
+            halfmove_clock += self.start_halfmove_clock
+
+        return '{} {} - - {} {}'.format(
+            '/'.join(ranks),
+            'w' if self.side_to_move == Colors['WHITE'] else 'b',
+            halfmove_clock, (self.start_ply + len(self.move_stack)) // 2 + 1)
+
+    def set_start_position(self) -> None:
+        """
+        This function places the pieces of both players on their initial cells.
+        :return: None
+        """
+        self.set_piece_at(0, 0, Pieces.BLACK_ROOK)
+        self.set_piece_at(0, 1, Pieces.BLACK_HORSE)
+        self.set_piece_at(0, 2, Pieces.BLACK_BISHOP)
+        self.set_piece_at(0, 3, Pieces.BLACK_QUEEN)
+        self.set_piece_at(0, 4, Pieces.BLACK_KING)
+        self.set_piece_at(0, 5, Pieces.BLACK_BISHOP)
+        self.set_piece_at(0, 6, Pieces.BLACK_HORSE)
+        self.set_piece_at(0, 7, Pieces.BLACK_ROOK)
+
+        self.set_piece_at(7, 0, Pieces.WHITE_ROOK)
+        self.set_piece_at(7, 1, Pieces.WHITE_HORSE)
+        self.set_piece_at(7, 2, Pieces.WHITE_BISHOP)
+        self.set_piece_at(7, 3, Pieces.WHITE_QUEEN)
+        self.set_piece_at(7, 4, Pieces.WHITE_KING)
+        self.set_piece_at(7, 5, Pieces.WHITE_BISHOP)
+        self.set_piece_at(7, 6, Pieces.WHITE_HORSE)
+        self.set_piece_at(7, 7, Pieces.WHITE_ROOK)
+
+        for col in range(0, BoardParameters['COLS']):
+            self.set_piece_at(6, col, Pieces.WHITE_PAWN)
+            self.set_piece_at(1, col, Pieces.BLACK_PAWN)
+
     def set_piece_at(self, row, col, piece):
         """ This function sets piece on (row, col) cell on board. 
         :param: row, the row coordinate of the piece. 
         :param: col, the col coordinate of the piece. 
         :return: None """
-        self.board_mat[row][col].set_piece(piece)
+        cell = self.board_mat[row][col]
+        square = 8 * row + col
+        old_piece = cell.get_piece()
+        self.zobrist_key ^= Zobrist.PIECE_KEYS[old_piece][square]
+        self.zobrist_key ^= Zobrist.PIECE_KEYS[piece][square]
+        self.middle_game_score += Evaluation.MIDDLE_GAME[piece][square] - \
+            Evaluation.MIDDLE_GAME[old_piece][square]
+        self.end_game_score += Evaluation.END_GAME[piece][square] - \
+            Evaluation.END_GAME[old_piece][square]
+        self.phase += Evaluation.PHASE[piece] - Evaluation.PHASE[old_piece]
+        cell.set_piece(piece)
 
     def get_piece_at(self, row, col):
         """ This function returns the piece at cell with coordinates of
@@ -241,21 +523,58 @@ class Board:
 
         return self.__get_list_of_moves_helper(row, col, moves)
 
-    def __is_legal_move(self, row: int, col: int, opposite_color) -> List[bool]:
+    def __step_moves(self, row: int, col: int, targets: Tuple,
+                     opposite_color) -> List[Move]:
+        """
+        This function computes all possible and legal moves of a piece that
+        moves one step, like a horse or a king.
+        :param row: int, the current row of the piece.
+        :param col: int, the current col of the piece.
+        :param targets: the (row, col) cells the piece can step to, see
+        KNIGHT_TARGETS and KING_TARGETS.
+        :param opposite_color: color, the opponents color.
+        :return: List[Move], list of all possible and legal moves of the piece.
         """
-        This helper function responsible to decide whether the move to cell
-        (row, col) on board is legal move.
-        :param row: int, the destination row.
-        :param col: int, the destination col.
+        board_mat = self.board_mat
+        from_piece = board_mat[row][col].piece
+        moves = []
+        for to_row, to_col in targets:
+            to_piece = board_mat[to_row][to_col].piece
+            if to_piece == Pieces.NONE or \
+                    PIECE_COLORS[to_piece] == opposite_color:
+                moves.append(Move(row, col, to_row, to_col,
+                                  from_piece, to_piece))
+        return moves
+
+    def __ray_moves(self, row: int, col: int, rays: Tuple,
+                    opposite_color) -> List[Move]:
+        """
+        This function computes all possible and legal moves of a piece that
+        slides along rays, like a bishop, a rook or a queen. The piece slides
+        over empty cells, until it is blocked by a piece, that it can eat if it
+        is of the opponent.
+        :param row: int, the current row of the piece.
+        :param col: int, the current col of the piece.
+        :param rays: the rays of the piece, see ROOK_RAYS, BISHOP_RAYS and
+        QUEEN_RAYS.
         :param opposite_color: color, the opponents color.
-        :return: List[bool, bool].
+        :return: List[Move], list of all possible and legal moves of the piece.
         """
-        if 0 <= row <= 7 and 0 <= col <= 7:
-            if self.get_piece_at(row, col) == Pieces.NONE:
-                return [True, False]
-            if self.get_piece_color_at(row, col) == opposite_color:
-                return [True, True]
-        return [False, True]
+        board_mat = self.board_mat
+        from_piece = board_mat[row][col].piece
+        moves = []
+        for ray in rays:
+            for to_row, to_col in ray:
+                to_piece = board_mat[to_row][to_col].piece
+                if to_piece == Pieces.NONE:
+                    moves.append(Move(row, col, to_row, to_col,
+                                      from_piece, to_piece))
+                    continue
+                if PIECE_COLORS[to_piece] == opposite_color:
+                    moves.append(Move(row, col, to_row, to_col,
+                                      from_piece, to_piece))
+                break
+        return moves
 
     def __all_possible_moves_bishop(self, row: int,
                                     col: int, opposite_color) -> List[Move]:
@@ -267,44 +586,8 @@ class Board:
         :param opposite_color: color, the opponents color.
         :return: List[Move], list of all possible and legal moves of bishop.
         """
-        moves = []
-        temp_row, temp_col, stop = row + 1, col + 1, False
-        while temp_row < 8 and temp_col < 8 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_row += 1
-            temp_col += 1
-
-        temp_row, temp_col, stop = row - 1, col - 1, False
-        while temp_row >= 0 and temp_col >= 0 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_row -= 1
-            temp_col -= 1
-
-        temp_row, temp_col, stop = row - 1, col + 1, False
-        while temp_row >= 0 and temp_col < 8 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_row -= 1
-            temp_col += 1
-
-        temp_row, temp_col, stop = row + 1, col - 1, False
-        while temp_row < 8 and temp_col >= 0 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_row += 1
-            temp_col -= 1
-
-        return self.__get_list_of_moves_helper(row, col, moves)
+        return self.__ray_moves(row, col, BISHOP_RAYS[8 * row + col],
+                                opposite_color)
 
     def __all_possible_moves_rook(self, row: int,
                                   col: int, opposite_color) -> List[Move]:
@@ -316,40 +599,8 @@ class Board:
         :param opposite_color: color, the opponents color.
         :return: List[Move], list of all possible and legal moves for rook.
         """
-        moves = []
-        temp_row, temp_col, stop = row + 1, col, False
-        while temp_row < 8 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_row += 1
-
-        temp_row, temp_col, stop = row - 1, col, False
-        while temp_row >= 0 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_row -= 1
-
-        temp_row, temp_col, stop = row, col + 1, False
-        while temp_col < 8 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_col += 1
-
-        temp_row, temp_col, stop = row, col - 1, False
-        while temp_col >= 0 and not stop:
-            is_legal_move, stop = self.__is_legal_move(temp_row, temp_col,
-                                                       opposite_color)
-            if is_legal_move:
-                moves.append((temp_row, temp_col))
-            temp_col -= 1
-
-        return self.__get_list_of_moves_helper(row, col, moves)
+        return self.__ray_moves(row, col, ROOK_RAYS[8 * row + col],
+                                opposite_color)
 
     def __all_possible_moves_horse(self, row: int,
                                    col: int, opposite_color) -> List[Move]:
@@ -361,57 +612,8 @@ class Board:
         :param opposite_color: color, the opponents color.
         :return: List[Move], list of all possible and legal moves for knight.
         """
-        moves = []
-
-        if row - 2 >= 0:
-            if col - 1 >= 0:
-                is_legal_move = self.__is_legal_move(row - 2, col - 1,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row - 2, col - 1))
-            if col + 1 < 8:
-                is_legal_move = self.__is_legal_move(row - 2, col + 1,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row - 2, col + 1))
-
-        if row + 2 < 8:
-            if col - 1 >= 0:
-                is_legal_move = self.__is_legal_move(row + 2, col - 1,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row + 2, col - 1))
-            if col + 1 < 8:
-                is_legal_move = self.__is_legal_move(row + 2, col + 1,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row + 2, col + 1))
-
-        if col - 2 >= 0:
-            if row - 1 >= 0:
-                is_legal_move = self.__is_legal_move(row - 1, col - 2,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row - 1, col - 2))
-            if row + 1 < 8:
-                is_legal_move = self.__is_legal_move(row + 1, col - 2,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row + 1, col - 2))
-
-        if col + 2 < 8:
-            if row - 1 >= 0:
-                is_legal_move = self.__is_legal_move(row - 1, col + 2,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row - 1, col + 2))
-            if row + 1 < 8:
-                is_legal_move = self.__is_legal_move(row + 1, col + 2,
-                                                     opposite_color)[0]
-                if is_legal_move:
-                    moves.append((row + 1, col + 2))
-
-        return self.__get_list_of_moves_helper(row, col, moves)
+        return self.__step_moves(row, col, KNIGHT_TARGETS[8 * row + col],
+                                 opposite_color)
 
     def __all_possible_moves_queen(self, row: int,
                                    col: int, opposite_color) -> List[Move]:
@@ -423,9 +625,8 @@ class Board:
         :param opposite_color: color, the opponents color.
         :return: List[Move], list of all possible and legal moves for queen.
         """
-        moves = self.__all_possible_moves_rook(row, col, opposite_color)
-        moves += self.__all_possible_moves_bishop(row, col, opposite_color)
-        return moves
+        return self.__ray_moves(row, col, QUEEN_RAYS[8 * row + col],
+                                opposite_color)
 
     def __all_possible_moves_king(self, row: int,
                                   col: int, opposite_color) -> List[Move]:
@@ -437,32 +638,8 @@ class Board:
         :param opposite_color: color, the opponents color.
         :return: List[Move], list of all possible and legal moves for king.
         """
-
-        def add_moves(_row, _col, _opposite_color):
-            _moves = []
-            for i in range(_col - 1, _col + 2):
-                try:
-                    if self.__is_legal_move(_row, i, _opposite_color)[0]:
-                        _moves.append((_row, i))
-                except Exception as e:
-                    print(e)
-            return _moves
-
-        moves = []
-        if row - 1 >= 0:
-            moves += add_moves(row - 1, col, opposite_color)
-        if row + 1 < 8:
-            moves += add_moves(row + 1, col, opposite_color)
-
-        if col - 1 >= 0:
-            if self.__is_legal_move(row, col - 1, opposite_color)[0]:
-                moves.append((row, col - 1))
-
-        if col + 1 >= 0:
-            if self.__is_legal_move(row, col + 1, opposite_color)[0]:
-                moves.append((row, col + 1))
-
-        return self.__get_list_of_moves_helper(row, col, moves)
+        return self.__step_moves(row, col, KING_TARGETS[8 * row + col],
+                                 opposite_color)
 
     def get_all_possible_moves(self, row: int, col: int) -> List[Move]:
         """
@@ -507,6 +684,50 @@ class Board:
 
         return []
 
+    def get_all_moves(self, color) -> List[Move]:
+        """
+        This function computes and returns all possible and legal moves of the
+        player with the given color. The cells are scanned row by row, from the
+        top left corner of the board.
+        :param color: the color of the player.
+        :return: List[Move], all possible moves of the player.
+        """
+        moves = []
+        for row in range(0, BoardParameters['ROWS']):
+            for col in range(0, BoardParameters['COLS']):
+                if self.get_piece_color_at(row, col) == color:
+                    moves += self.get_all_possible_moves(row, col)
+        return moves
+
+    def get_all_captures(self, color) -> List[Move]:
+        """
+        This function computes and returns all possible and legal moves of the
+        player with the given color that eat a piece of the opponent.
+        :param color: the color of the player.
+        :return: List[Move], all possible captures of the player.
+        """
+        return [move for move in self.get_all_moves(color)
+                if move.to_piece != Pieces.NONE]
+
+    def get_moves_to(self, row: int, col: int, piece) -> List[Move]:
+        """
+        This function computes and returns all possible moves of the pieces of
+        the given kind and color to the cell on (row, col). It is used to read
+        and write moves in SAN, which name the piece and the cell only.
+        :param row: int, row of the target cell.
+        :param col: int, col of the target cell.
+        :param piece: the piece, like Pieces.WHITE_HORSE.
+        :return: List[Move], the moves.
+        """
+        moves = []
+        for from_row in range(0, BoardParameters['ROWS']):
+            for from_col in range(0, BoardParameters['COLS']):
+                if self.get_piece_at(from_row, from_col) == piece:
+                    moves += [move for move in
+                              self.get_all_possible_moves(from_row, from_col)
+                              if move.to_row == row and move.to_col == col]
+        return moves
+
     def move_piece(self, move: Move) -> bool:
         """
         This function responsible for performaing logical piece movement
@@ -519,17 +740,20 @@ class Board:
         :param move: Move object, holds the move that should be performed.
         :return: True, if and only if the King was killed as a result of move.
         """
-        from_row = move['from_row']
-        from_col = move['from_col']
-        to_row = move['to_row']
-        to_col = move['to_col']
-        from_piece = move['from_piece']
-        to_piece = move['to_piece']
+        from_row = move.from_row
+        from_col = move.from_col
+        to_row = move.to_row
+        to_col = move.to_col
+        from_piece = move.from_piece
+        to_piece = move.to_piece
         self.set_piece_at(to_row, to_col, from_piece)
         self.set_piece_at(from_row, from_col, Pieces.NONE)
         self.move_stack.append(move)
+        self.switch_side_to_move()
         if to_piece != Pieces.NONE:
             self.total_material[to_piece] -= 1
+        if self.debug_hashing:
+            self.check_zobrist_key()
         if to_piece == Pieces.WHITE_KING or to_piece == Pieces.BLACK_KING:
             return True
         return False
@@ -542,174 +766,86 @@ class Board:
         :return: Move object that strores the last move that was made on board.
         """
         last_move = self.move_stack.pop()
-        self.set_piece_at(last_move['from_row'],
-                          last_move['from_col'],
-                          last_move['from_piece'])
-        self.set_piece_at(last_move['to_row'],
-                          last_move['to_col'],
-                          last_move['to_piece'])
-        if last_move['to_piece'] != Pieces.NONE:
-            self.total_material[last_move['to_piece']] += 1
+        self.set_piece_at(last_move.from_row,
+                          last_move.from_col,
+                          last_move.from_piece)
+        self.set_piece_at(last_move.to_row,
+                          last_move.to_col,
+                          last_move.to_piece)
+        self.switch_side_to_move()
+        if last_move.to_piece != Pieces.NONE:
+            self.total_material[last_move.to_piece] += 1
+        if self.debug_hashing:
+            self.check_zobrist_key()
         return last_move
 
-    def evaluation_function(self) -> int:
-        """
-        This function is responsible to compute the current score of the board.
-        It is used for AI purposes.
-        :return: int, the score of the board.
+    def switch_side_to_move(self) -> None:
         """
-
-        king_difference = self.total_material[Pieces.WHITE_KING] - \
-                          self.total_material[Pieces.BLACK_KING]
-
-        queen_difference = self.total_material[Pieces.WHITE_KING] - \
-                           self.total_material[Pieces.BLACK_KING]
-
-        rook_difference = self.total_material[Pieces.WHITE_ROOK] - \
-                          self.total_material[Pieces.BLACK_ROOK]
-
-        bishop_difference = self.total_material[Pieces.WHITE_BISHOP] - \
-                            self.total_material[Pieces.BLACK_BISHOP]
-
-        knight_difference = self.total_material[Pieces.WHITE_HORSE] - \
-                            self.total_material[Pieces.BLACK_HORSE]
-
-        pawn_difference = self.total_material[Pieces.WHITE_PAWN] - \
-                          self.total_material[Pieces.BLACK_PAWN]
-
-        total_balance = (200 * king_difference + 50 * queen_difference +
-                         5 * rook_difference + 3 + bishop_difference +
-                         3 * knight_difference + 1 * pawn_difference)
-
-        return total_balance
-
-
-class DisplayBoard:
-    """ This class is the 'view' of the board. It handles all of the visual
-    logic of the board. It translates the logical board (of type Board) into the
-    visual board. """
-
-    def __init__(self, destination: pygame.Surface, board: Board):
-        """
-        This function is default c'tor and it loads the pieces and other
-        graphics relevant to the board.
-        """
-        self.pieces_graphics = Pieces.load_pieces()
-        self.destination = destination
-        self.board = board
-
-    def draw_cell(self, row: int, col: int) -> None:
-        """
-        This cell performs visual draws specific cell given by coordinates of
-        (row, col).
-        :param row: int, the row of specific cell.
-        :param col: int, the col of specific cell.
-        :return: None.
+        This function passes the turn to the other player.
+        :return: None
         """
-        pygame.draw.rect(self.destination,
-                         self.board.get_cell_color_at(row, col),
-                         [col * BoardNode.CELL_HEIGHT,
-                          row * BoardNode.CELL_WIDTH,
-                          BoardNode.CELL_WIDTH,
-                          BoardNode.CELL_HEIGHT])
-        piece = self.board.get_piece_at(row, col)
-        if piece != Pieces.NONE:
-            self.destination.blit(self.pieces_graphics[piece],
-                                  (col * BoardNode.CELL_HEIGHT,
-                                   row * BoardNode.CELL_WIDTH))
+        if self.side_to_move == Colors['WHITE']:
+            self.side_to_move = Colors['BLACK']
+        else:
+            self.side_to_move = Colors['WHITE']
+        self.zobrist_key ^= Zobrist.SIDE_KEY
 
-    def show_board(self):
+    def compute_zobrist_key(self) -> int:
         """
-        This function responsible to show the entire row on the screen.
-
-        Important note: Currently this function works well when user is white
-        and computer is black. It should be extended to all cases.
-
-        :return: None.
+        This function computes the Zobrist key of the position from scratch.
+        The board keeps its key up to date incrementally, so this function is
+        needed only to check that key.
+        :return: int, the Zobrist key of the position.
         """
+        key = 0
         for row in range(0, BoardParameters['ROWS']):
             for col in range(0, BoardParameters['COLS']):
-                pygame.draw.rect(self.destination,
-                                 self.board.get_cell_color_at(row, col),
-                                 [col * BoardParameters['CELL_WIDTH'],
-                                  row * BoardParameters['CELL_HEIGHT'],
-                                  BoardParameters['CELL_WIDTH'],
-                                  BoardParameters['CELL_HEIGHT']])
-                piece = self.board.get_piece_at(row, col)
-                if piece != Pieces.NONE:
-                    self.destination.blit(self.pieces_graphics[piece],
-                                          (col * BoardParameters['CELL_HEIGHT'],
-                                           row * BoardParameters['CELL_WIDTH']))
-        pygame.display.update()
-
-    def display_selected(self, row: int, col: int, move_type) -> None:
-        """
-        This function is responsible to display selected square.
-        :param row: int, the row of specific cell.
-        :param col: int, the col of specific cell.
-        :param move_type:
-        :return: None
-        """
-        color = Colors['BLUE']
-        if move_type == MoveType['POSSIBLE_MOVE']:
-            color = Colors['GREEN']
-        pygame.draw.rect(self.destination,
-                         color,
-                         [col * BoardNode.CELL_WIDTH + 5,
-                          row * BoardNode.CELL_HEIGHT + 5,
-                          BoardNode.CELL_WIDTH - 10,
-                          BoardNode.CELL_HEIGHT - 10], 5)
-        pygame.display.update()
-
-    def display_all_possible_moves(self, moves: List[Move]) -> None:
-        """
-        This function responsible to visualise all possible moves to the user.
-        :param moves: List[Moves], list of all possible and legal moves.
-        :return: None
-        """
-        for move in moves:
-            self.display_selected(move['to_row'],
-                                  move['to_col'],
-                                  MoveType['POSSIBLE_MOVE'])
-        pygame.display.update()
+                key ^= Zobrist.piece_key(self.get_piece_at(row, col), row, col)
+        if self.side_to_move == Colors['BLACK']:
+            key ^= Zobrist.SIDE_KEY
+        return key
 
-    def unselect(self, row: int, col: int, moves: List[Move]) -> None:
+    def check_zobrist_key(self) -> None:
         """
-        This function responsible for the visual logic of unselecting cell.
-        :param row: int, is the row of cell to be unselected.
-        :param col: int, is the col of cell to be unselected.
-        :param moves: List[Moves], represents the possible moves.
+        This function checks that the incremental Zobrist key of the board is
+        equal to the key computed from scratch.
         :return: None
+        :raises RuntimeError: if the keys are different.
         """
-        self.draw_cell(row, col)
-        for move in moves:
-            row = move['to_row']
-            col = move['to_col']
-            self.draw_cell(row, col)
-        pygame.display.update()
+        expected_key = self.compute_zobrist_key()
+        if self.zobrist_key != expected_key:
+            raise RuntimeError('Zobrist key {:016x} is different from the key '
+                               '{:016x} of the position after {} moves.'
+                               .format(self.zobrist_key, expected_key,
+                                       len(self.move_stack)))
 
-    def move_piece(self, move: Move, moves: List[Move]) -> None:
+    def evaluation_function(self) -> int:
         """
-        This function responsible for handling the visual logic of piece
-        movement.
-        :param move: Move, is the move that should be displayed.
-        :param moves: List[Moves] is the list of all moves that should be
-        unselected visually as result of move.
-        :return: None
+        This function is responsible to compute the current score of the board.
+        It is used for AI purposes. The score is positive when white is better
+        and negative when black is better, see Evaluation. The scores of the
+        pieces are kept up to date on every move, so this function only mixes
+        them by the phase of the game.
+        :return: int, the score of the board.
         """
-        from_row = move['from_row']
-        from_col = move['from_col']
-        to_row = move['to_row']
-        to_col = move['to_col']
-        self.unselect(from_row, from_col, moves)
-        self.draw_cell(from_row, from_col)
-        self.draw_cell(to_row, to_col)
-        pygame.display.update()
+        phase = self.phase
+        if phase > Evaluation.MAX_PHASE:
+            phase = Evaluation.MAX_PHASE
+        return (self.middle_game_score * phase + self.end_game_score *
+                (Evaluation.MAX_PHASE - phase)) // Evaluation.MAX_PHASE
 
-    def undo_move(self, last_move: Move):
+    def compute_evaluation(self) -> int:
         """
-        This function responsible for visual logic of undo move.
-        :param last_move: Move, is the move that should be displayed.
-        :return None
+        This function computes the score of the board from scratch. The board
+        keeps its score up to date incrementally, so this function is needed
+        only to check that score.
+        :return: int, the score of the board.
         """
-        self.move_piece(last_move, [])
+        middle_game, end_game, phase = 0, 0, 0
+        for row in range(0, BoardParameters['ROWS']):
+            for col in range(0, BoardParameters['COLS']):
+                piece = self.get_piece_at(row, col)
+                middle_game += Evaluation.MIDDLE_GAME[piece][8 * row + col]
+                end_game += Evaluation.END_GAME[piece][8 * row + col]
+                phase += Evaluation.PHASE[piece]
+        return Evaluation.taper(middle_game, end_game, phase)
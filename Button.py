@@ -1,4 +1,5 @@
 import pygame
+from Renderer import Renderer
 from TextHandler import TextHandler
 from Consts import Colors, Fonts
 from typing import Callable, List
@@ -9,7 +10,8 @@ class Button:
     This class responsible for buttons functionality
     """
 
-    def __init__(self, top_x: int, top_y: int, title: str, operation: Callable, arguments: List, dest: pygame.Surface):
+    def __init__(self, top_x: int, top_y: int, title: str, operation: Callable, arguments: List, dest: pygame.Surface,
+                 renderer: Renderer):
         """
         Default c'tor
         :param top_x: int, x coordinate for display
@@ -18,6 +20,7 @@ class Button:
         :param operation: Callable, the operation that should be performed when button is pressed
         :param arguments: List, the list of arguments to be passed to the operation.
         :param dest: pygame.Surface, the surface to blit on the button.
+        :param renderer: Renderer, collects the drawn parts of the screen.
         """
         self.__top_x = top_x
         self.__top_y = top_y
@@ -25,7 +28,8 @@ class Button:
         self.__operation = operation
         self.__arguments = arguments
         self.destination = dest
-        self.__text_handler = TextHandler(Fonts['Regular'], Colors['BLACK'], 20, dest)
+        self.renderer = renderer
+        self.__text_handler = TextHandler(Fonts['Regular'], Colors['BLACK'], 20, dest, renderer)
         self.__w, self.__h = self.__text_handler.get_text_rect(title)[2:]
         self.__w += 5
         self.__h += 5
@@ -35,10 +39,9 @@ class Button:
         Shows the button on the screen.
         :return: None
         """
-        pygame.draw.rect(self.destination, Colors['BLACK'],
-        [self.__top_x, self.__top_y, self.__w, self.__h], 1)
+        self.renderer.mark_dirty(pygame.draw.rect(self.destination, Colors['BLACK'],
+        [self.__top_x, self.__top_y, self.__w, self.__h], 1))
         self.__text_handler.display_message(self.__top_x + 2, self.__top_y + 2, self.__title)
-        pygame.display.update()
 
     def is_pressed(self) -> bool:
         """
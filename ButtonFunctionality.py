@@ -19,5 +19,4 @@ def undo_move(game: GameObjectInterface)->None:
 
 
 def save_log(game: GameObjectInterface)->None:
-    # todo complete the save log operation
-    print("Save action")
\ No newline at end of file
+    game.save_game()
\ No newline at end of file
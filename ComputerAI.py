@@ -1,27 +1,185 @@
+import os
 from random import randint
+from threading import Event
+from time import monotonic
 from Move import Move
-from Consts import Colors, BoardParameters
+from Consts import Colors, BoardParameters, SearchParameters
 from typing import List, Tuple
 from Board import Board
 from operator import itemgetter
+from TranspositionTable import TranspositionTable
+from MoveOrdering import MoveOrdering
+from OpeningBook import OpeningBook
+from Tablebase import Tablebase
+from SearchStats import SearchStats
+
+
+class SearchInterrupted(Exception):
+    """ Raised inside the search when it is stopped or its time is over. """
+    pass
 
 
 class ComputerAI:
     """ This class is responsible for the AI of the computer. """
 
+    # Bigger than any score that the evaluation function can return.
+    INFINITY = 10 ** 9
+
+    # The number of nodes between two checks of the clock and stop request.
+    CHECK_INTERVAL = 256
+
+    # Each iteration of the iterative deepening takes longer than all the
+    # iterations before it, so a new iteration is not started once this part
+    # of the time of the move is used: it would most likely not finish.
+    NEXT_ITERATION_TIME = 0.5
+
     def __init__(self, difficulty,
                  computer_color=Colors['BLACK'],
-                 user_color=Colors['WHITE']):
+                 user_color=Colors['WHITE'],
+                 hash_size_mb=SearchParameters['HASH_SIZE_MB'],
+                 workers=SearchParameters['WORKERS'],
+                 use_quiescence=SearchParameters['QUIESCENCE'],
+                 opening_book=SearchParameters['OPENING_BOOK'],
+                 tablebases=SearchParameters['TABLEBASES'],
+                 batch_leaves=SearchParameters['BATCH_LEAVES']):
         """
         Default c'tor.
-        :param difficulty: int, indicates the depth of the search tree in the
-        minmax algorithm.
+        :param difficulty: either int, the depth of the search tree in the
+        minmax algorithm, or a search profile of Difficulties in Consts.py,
+        that limits the tree depth, the time and the nodes of each move.
         :param computer_color: the color of the computer player.
         :param user_color: the color of the user player.
+        :param hash_size_mb: float, the memory budget of the transposition
+        table in MB.
+        :param workers: int, the number of processes that search the root
+        moves in parallel. With one worker the search runs in this process.
+        :param use_quiescence: bool, whether the positions at the end of the
+        tree are scored by the quiescence search, or by the evaluation function
+        alone.
+        :param opening_book: str, the path of the opening book file (see
+        OpeningBook). If None, or if there is no such file, or it is not a
+        valid book, the computer searches all of its moves.
+        :param tablebases: str, the directory of the endgame tables (see
+        Tablebase). If None, or if there is no such directory, or it can not
+        be read, the endgames are searched like any other position.
+        :param batch_leaves: bool, whether the leaves of each node at the end
+        of the tree are scored together, in one batch of the vectorised
+        evaluation (see BatchEvaluation), instead of one by one. It requires
+        NumPy, and the quiescence search must be off. The batches score the
+        same terms as the evaluation function, without the mobility of
+        BatchEvaluation, so all the leaves of the tree have the same scale.
+        :raises ValueError: if batch_leaves and use_quiescence are both set.
         """
-        self.__difficulty = difficulty
+        if batch_leaves and use_quiescence:
+            raise ValueError('The leaves can be scored in batches only when '
+                             'the quiescence search is off.')
+
+        # The limits of each move: the tree depth, the seconds and the nodes.
+        # The time and node limits are None when there is no limit.
+        if isinstance(difficulty, dict):
+            self.__difficulty = difficulty['DEPTH']
+            self.time_limit = difficulty['TIME_LIMIT']
+            self.node_limit = difficulty['NODE_LIMIT']
+        else:
+            self.__difficulty = difficulty
+            self.time_limit = None
+            self.node_limit = None
         self.user_color = user_color
         self.computer_color = computer_color
+        self.transposition_table = TranspositionTable(hash_size_mb)
+        self.move_ordering = MoveOrdering()
+        self.use_quiescence = use_quiescence
+
+        self.opening_book = None
+        if opening_book is not None and os.path.exists(opening_book):
+            try:
+                self.opening_book = OpeningBook(opening_book)
+            except (OSError, ValueError):
+                # A broken book file, like an empty or a truncated one, must
+                # not keep the engine from starting.
+                self.opening_book = None
+
+        self.tablebase = None
+        if tablebases is not None and os.path.isdir(tablebases):
+            try:
+                self.tablebase = Tablebase(tablebases)
+            except OSError:
+                # Like a broken opening book, a directory that can not be read
+                # must not keep the engine from starting.
+                self.tablebase = None
+
+        # The length of the move stack of the board at the root of the current
+        # search, so the ply of a node is the number of moves played since.
+        self.root_ply = 0
+
+        # The number of nodes searched by the current search, the deepest ply
+        # it reached, and the number of positions it scored by the endgame
+        # tables.
+        self.nodes = 0
+        self.seldepth = 0
+        self.tablebase_hits = 0
+
+        # The search stops when the stop event is set, at the deadline (in
+        # time.monotonic() seconds), or when it searched max_nodes nodes. They
+        # are checked only while the search is interruptible, which is once the
+        # first iteration of the iterative deepening is complete, so there is
+        # always a move.
+        self.stop_event = Event()
+        self.deadline = None
+        self.max_nodes = None
+        self.interruptible = False
+
+        # The statistics of the current search, or of the last one. A new
+        # object is made for every search.
+        self.stats = SearchStats()
+
+        # If set, on_iteration is called with the statistics after each
+        # complete iteration of the iterative deepening, and on_search_end is
+        # called with them when computers_play has chosen its move. They are
+        # called on the thread of the search. The UCI engine reports the
+        # progress of the search with them.
+        self.on_iteration = None
+        self.on_search_end = None
+
+        self.batch_evaluation = None
+        if batch_leaves:
+            # Imported here, since NumPy takes long to import and it is
+            # needed only by the batched evaluation.
+            from BatchEvaluation import BatchEvaluation
+            # The other leaves (a node without moves, the endgames and the
+            # leaves of the parallel workers at depth 0) are scored by the
+            # evaluation function, which has no mobility term.
+            self.batch_evaluation = BatchEvaluation(mobility=False)
+
+        self.parallel_search = None
+        if workers > 1:
+            # Imported here, since the process pool modules take longer to
+            # import than the rest of the engine.
+            from ParallelSearch import ParallelSearch
+            self.parallel_search = ParallelSearch(workers, hash_size_mb,
+                                                  use_quiescence, tablebases,
+                                                  batch_leaves)
+
+    def stop(self) -> None:
+        """
+        This function asks the current search to stop as soon as possible. It
+        may be called from another thread.
+        :return: None
+        """
+        self.stop_event.set()
+
+    def __check_stop(self) -> None:
+        """
+        This function interrupts the search if it was asked to stop, or if its
+        time or nodes are over.
+        :return: None
+        :raises SearchInterrupted: if the search should stop.
+        """
+        if self.interruptible and \
+                (self.stop_event.is_set() or
+                 (self.deadline is not None and monotonic() >= self.deadline) or
+                 (self.max_nodes is not None and self.nodes >= self.max_nodes)):
+            raise SearchInterrupted()
 
     def minmax_algorithm(self,
                          board: Board,
@@ -149,7 +307,10 @@ class ComputerAI:
                     for move in all_moves:
                         board.move_piece(move)
                         if tree_depth == 0:
-                            moves.append((move, board.evaluation_function()))
+                            moves.append((move, self.leaf_score(
+                                board, next_move_color, current_move_color,
+                                -ComputerAI.INFINITY, ComputerAI.INFINITY,
+                                not is_min)))
                         else:
                             best_moves = \
                                 self.minmax_algorithm(board, next_move_color,
@@ -166,14 +327,488 @@ class ComputerAI:
             return [move for move in moves if move[1] == min_score]
         return [move for move in moves if move[1] == max_score]
 
-    def computers_play(self, board: Board) -> Move:
+    def leaf_score(self,
+                   board: Board,
+                   current_move_color: Colors,
+                   next_move_color: Colors,
+                   alpha: int,
+                   beta: int,
+                   is_min: bool) -> int:
+        """
+        This function scores a position at the end of the search tree, with
+        the quiescence search or with the evaluation function alone, see
+        use_quiescence. The positions of the endgame tables get their exact
+        scores. The parameters are the same as of the alpha-beta algorithm.
+        :return: int, the score of the position.
+        """
+        if self.tablebase is not None:
+            score = self.tablebase.probe_score(board)
+            if score is not None:
+                self.tablebase_hits += 1
+                return score
+        if self.use_quiescence:
+            return self.quiescence(board, current_move_color, next_move_color,
+                                   alpha, beta, is_min)
+        return board.evaluation_function()
+
+    def batch_leaf_scores(self, board: Board,
+                          moves: List[Move]) -> List[int]:
+        """
+        This function scores the positions after each one of the moves in one
+        batch, when the leaves are scored in batches (see batch_leaves). The
+        batch has the sibling leaves of one node, so the moves that alpha-beta
+        would cut off are scored too, but no move is played.
+        :param board: Board, the position of the node.
+        :param moves: List[Move], the moves of the node.
+        :return: List[int], the score of each move, or None if the leaves
+        should be scored one by one: the batches are off, or the leaves may be
+        in the endgame tables.
+        """
+        if self.batch_evaluation is None:
+            return None
+        if self.tablebase is not None and \
+                sum(board.total_material.values()) <= \
+                self.tablebase.max_pieces + 1:
+            return None
+        return self.batch_evaluation.evaluate_moves(board, moves)
+
+    def quiescence(self,
+                   board: Board,
+                   current_move_color: Colors,
+                   next_move_color: Colors,
+                   alpha: int,
+                   beta: int,
+                   is_min: bool) -> int:
+        """
+        This function is the quiescence search. A position at the end of the
+        search tree may be in the middle of an exchange of pieces, so its
+        evaluation is misleading: a queen that has just eaten a pawn looks
+        like a pawn up, even if it is eaten back on the next move ("horizon
+        effect"). The quiescence search keeps playing captures, and only
+        captures, until the position is quiet.
+
+        The player to move does not have to capture: it may "stand pat" and
+        take the evaluation of the position. So the score of a node is the
+        best of the evaluation and the scores of the captures, and if the
+        evaluation alone is already good enough, the captures are not searched
+        at all. A capture of the king ends the game, so it is not searched
+        further.
+
+        The window and the returned score have the same meaning as in the
+        alpha-beta algorithm.
+        :param board: the logical representation of the board, Board object.
+        :param current_move_color: the color of the current player to move.
+        :param next_move_color: the color of the next player to move.
+        :param alpha: int, the lower bound of the search window.
+        :param beta: int, the upper bound of the search window.
+        :param is_min: flag that determines whether we minimize or maximize.
+        :return: int, the score of the position.
+        """
+        self.nodes += 1
+        if self.nodes % ComputerAI.CHECK_INTERVAL == 0:
+            self.__check_stop()
+        ply = len(board.move_stack) - self.root_ply
+        if ply > self.seldepth:
+            self.seldepth = ply
+
+        best_score = board.evaluation_function()
+        if is_min:
+            if best_score <= alpha:
+                return best_score
+            if best_score < beta:
+                beta = best_score
+        else:
+            if best_score >= beta:
+                return best_score
+            if best_score > alpha:
+                alpha = best_score
+
+        captures = board.get_all_captures(current_move_color)
+        self.move_ordering.order_moves(captures, ply)
+        for move in captures:
+            if board.move_piece(move):
+                score = board.evaluation_function()
+            else:
+                score = self.quiescence(board, next_move_color,
+                                        current_move_color, alpha, beta,
+                                        not is_min)
+            board.undo_move()
+
+            if is_min:
+                if score < best_score:
+                    best_score = score
+                if best_score < beta:
+                    beta = best_score
+            else:
+                if score > best_score:
+                    best_score = score
+                if best_score > alpha:
+                    alpha = best_score
+            if alpha >= beta:
+                break
+
+        return best_score
+
+    def alpha_beta(self,
+                   board: Board,
+                   current_move_color: Colors,
+                   next_move_color: Colors,
+                   tree_depth: int,
+                   alpha: int,
+                   beta: int,
+                   is_min: bool) -> int:
+        """
+        This function is the alpha-beta version of the minmax algorithm. It
+        computes the same score as the minmax algorithm does, but it stops
+        searching the moves of a node as soon as it is clear that the opponent
+        will never let the game reach that node.
+
+        The window (alpha, beta) holds the scores that are still interesting
+        for the caller: alpha is the score that the maximizing player is
+        already guaranteed, and beta is the score that the minimizing player is
+        already guaranteed. The returned score is exact when it lies strictly
+        inside the window. Otherwise it is only a bound ("fail-soft"): a score
+        <= alpha is an upper bound and a score >= beta is a lower bound.
+
+        :param board: the logical representation of the board, Board object.
+        :param current_move_color: the color of the current player to move.
+        :param next_move_color: the color of the next player to move.
+        :param tree_depth: the number of moves to compute forward, with the
+        same meaning as in the minmax algorithm.
+        :param alpha: int, the lower bound of the search window.
+        :param beta: int, the upper bound of the search window.
+        :param is_min: flag that determines whether we minimize or maximize.
+        :return: int, the score of the position.
+        """
+        self.nodes += 1
+        if self.nodes % ComputerAI.CHECK_INTERVAL == 0:
+            self.__check_stop()
+        ply = len(board.move_stack) - self.root_ply
+        if ply > self.seldepth:
+            self.seldepth = ply
+
+        # The endgame tables know the exact score, no search is needed.
+        if self.tablebase is not None:
+            score = self.tablebase.probe_score(board)
+            if score is not None:
+                self.tablebase_hits += 1
+                return score
+
+        key = board.zobrist_key
+        entry = self.transposition_table.probe(key)
+        best_packed_move = TranspositionTable.NO_MOVE
+        if entry is not None:
+            entry_depth, entry_score, entry_bound, best_packed_move = entry
+            # Only a search of the same depth is reused, so the result is the
+            # same as the result of the search without the table.
+            if entry_depth == tree_depth:
+                if entry_bound == TranspositionTable.EXACT or \
+                        (entry_bound == TranspositionTable.LOWER and
+                         entry_score >= beta) or \
+                        (entry_bound == TranspositionTable.UPPER and
+                         entry_score <= alpha):
+                    return entry_score
+
+        moves = board.get_all_moves(current_move_color)
+        if not moves:
+            return board.evaluation_function()
+
+        self.move_ordering.order_moves(moves, ply, best_packed_move)
+
+        leaf_scores = None
+        if tree_depth == 0:
+            leaf_scores = self.batch_leaf_scores(board, moves)
+
+        original_alpha, original_beta = alpha, beta
+        best_score = None
+        best_move = None
+        for move_number, move in enumerate(moves):
+            if leaf_scores is not None:
+                score = leaf_scores[move_number]
+            else:
+                board.move_piece(move)
+                if tree_depth == 0:
+                    score = self.leaf_score(board, next_move_color,
+                                            current_move_color, alpha, beta,
+                                            not is_min)
+                else:
+                    score = self.alpha_beta(board, next_move_color,
+                                            current_move_color, tree_depth - 1,
+                                            alpha, beta, not is_min)
+                board.undo_move()
+
+            if is_min:
+                if best_score is None or score < best_score:
+                    best_score, best_move = score, move
+                if best_score < beta:
+                    beta = best_score
+            else:
+                if best_score is None or score > best_score:
+                    best_score, best_move = score, move
+                if best_score > alpha:
+                    alpha = best_score
+            if alpha >= beta:
+                self.move_ordering.record_cutoff(move, ply, tree_depth,
+                                                 move_number)
+                break
+
+        if best_score <= original_alpha:
+            bound = TranspositionTable.UPPER
+        elif best_score >= original_beta:
+            bound = TranspositionTable.LOWER
+        else:
+            bound = TranspositionTable.EXACT
+        self.transposition_table.store(key, tree_depth, best_score, bound,
+                                       best_move)
+
+        return best_score
+
+    def alpha_beta_algorithm(self,
+                             board: Board,
+                             current_move_color: Colors,
+                             next_move_color: Colors,
+                             tree_depth: int,
+                             is_min: bool,
+                             moves: List[Move] = None) \
+            -> List[Tuple[Move, int]]:
+        """
+        This function searches the root of the tree with the alpha-beta
+        algorithm and returns the same list of best moves as the minmax
+        algorithm returns for the same tree depth.
+
+        Plain alpha-beta keeps only one best move, because a move that is as
+        good as the best one can be cut off. In order to keep all of the best
+        moves, each root move is searched with a window that is open by one on
+        the side of the best score found so far. Since the scores are integers,
+        a score that ties with the best score is still exact, and only the
+        moves that are strictly worse are cut off.
+
+        :param board: the logical representation of the board, Board object.
+        :param current_move_color: the color of the current player to move.
+        :param next_move_color: the color of the next player to move.
+        :param tree_depth: the number of moves to compute forward, with the
+        same meaning as in the minmax algorithm.
+        :param is_min: flag that determines whether we minimize or maximize.
+        :param moves: List[Move], the root moves in the order they should be
+        searched. If None, all possible moves are searched in board order.
+        :return: list of best moves to perform, with their scores.
+        """
+        if moves is None:
+            moves = board.get_all_moves(current_move_color)
+        if tree_depth == 0:
+            leaf_scores = self.batch_leaf_scores(board, moves)
+            if leaf_scores is not None:
+                return list(zip(moves, leaf_scores))
+
+        scored_moves = []  # type: List[Tuple[Move, int]]
+        best_score = None
+        for move in moves:
+            alpha, beta = -ComputerAI.INFINITY, ComputerAI.INFINITY
+            if best_score is not None:
+                if is_min:
+                    beta = best_score + 1
+                else:
+                    alpha = best_score - 1
+
+            board.move_piece(move)
+            if tree_depth == 0:
+                score = self.leaf_score(board, next_move_color,
+                                        current_move_color, alpha, beta,
+                                        not is_min)
+            else:
+                score = self.alpha_beta(board, next_move_color,
+                                        current_move_color, tree_depth - 1,
+                                        alpha, beta, not is_min)
+            board.undo_move()
+
+            scored_moves.append((move, score))
+            if best_score is None or \
+                    (is_min and score < best_score) or \
+                    (not is_min and score > best_score):
+                best_score = score
+
+        return scored_moves
+
+    def iterative_deepening(self,
+                            board: Board,
+                            current_move_color: Colors,
+                            next_move_color: Colors,
+                            tree_depth: int,
+                            is_min: bool) -> List[Tuple[Move, int]]:
+        """
+        This function runs the alpha-beta search for the tree depths 0, 1, ...,
+        tree_depth. Each iteration searches the root moves in the order of the
+        scores of the previous iteration, so the best moves are searched first
+        and the rest of the moves are cut off as early as possible.
+
+        If the search is stopped, or its deadline passes, or it searched
+        max_nodes nodes, the unfinished iteration is dropped and the moves of
+        the last complete iteration are returned. A new iteration is not
+        started when it is not likely to finish in time.
+
+        The statistics of the search are kept in a new SearchStats object in
+        stats, which is passed to on_iteration after each iteration.
+        :param board: the logical representation of the board, Board object.
+        :param current_move_color: the color of the current player to move.
+        :param next_move_color: the color of the next player to move.
+        :param tree_depth: the deepest tree depth to search.
+        :param is_min: flag that determines whether we minimize or maximize.
+        :return: list of best moves to perform, with their scores.
+        """
+        stats = SearchStats()
+        self.stats = stats
+        self.seldepth = 0
+        self.tablebase_hits = 0
+        start_nodes = self.nodes
+        table = self.transposition_table
+        start_probes, start_hits = table.probes, table.hits
+
+        moves = board.get_all_moves(current_move_color)
+        if not moves:
+            stats.finish(0)
+            return []
+
+        scored_moves = []  # type: List[Tuple[Move, int]]
+        start = monotonic()
+        moves_played = len(board.move_stack)
+        self.root_ply = moves_played
+        self.move_ordering.new_search()
+        self.move_ordering.order_moves(moves, 0)
+        self.interruptible = False
+        for depth in range(0, tree_depth + 1):
+            try:
+                if self.parallel_search is not None:
+                    iteration = self.parallel_search.search_root(
+                        self, board, current_move_color, next_move_color,
+                        depth, is_min, moves)
+                else:
+                    iteration = self.alpha_beta_algorithm(board,
+                                                          current_move_color,
+                                                          next_move_color,
+                                                          depth, is_min, moves)
+            except SearchInterrupted:
+                while len(board.move_stack) > moves_played:
+                    board.undo_move()
+                break
+            scored_moves = sorted(iteration, key=itemgetter(1),
+                                  reverse=not is_min)
+            moves = [move for move, score in scored_moves]
+            self.interruptible = True
+            # The leaves of the iteration are depth + 1 plies deep.
+            stats.tt_probes = table.probes - start_probes
+            stats.tt_hits = table.hits - start_hits
+            stats.tablebase_hits = self.tablebase_hits
+            stats.add_iteration(depth + 1, max(self.seldepth, depth + 1),
+                                self.nodes - start_nodes, scored_moves[0][1],
+                                self.principal_variation(
+                                    board, scored_moves[0][0], depth + 1))
+            if self.on_iteration is not None:
+                self.on_iteration(stats)
+            if self.deadline is not None and monotonic() - start >= \
+                    ComputerAI.NEXT_ITERATION_TIME * (self.deadline - start):
+                break
+            if self.max_nodes is not None and self.nodes >= self.max_nodes:
+                break
+
+        stats.tt_probes = table.probes - start_probes
+        stats.tt_hits = table.hits - start_hits
+        stats.tablebase_hits = self.tablebase_hits
+        stats.finish(self.nodes - start_nodes)
+
+        best_score = scored_moves[0][1]
+        return [move for move in scored_moves if move[1] == best_score]
+
+    def principal_variation(self, board: Board, best_move: Move,
+                            max_plies: int) -> List[Move]:
+        """
+        This function follows the best moves that the transposition table
+        holds, from the position after the best move of the root. The table
+        may have lost some of them, so the variation may be shorter than the
+        depth of the search. With the parallel search, the table of this
+        process is not used by the workers, and the variation is the best move
+        alone.
+        :param board: Board, the position of the root.
+        :param best_move: Move, the best move of the root.
+        :param max_plies: int, the longest variation to return.
+        :return: List[Move], the principal variation, the best move first.
+        """
+        table = self.transposition_table
+        # Following the variation does not count in the statistics of the
+        # table.
+        probes, hits = table.probes, table.hits
+        pv = [best_move]
+        king_eaten = board.move_piece(best_move)
+        while not king_eaten and len(pv) < max_plies:
+            entry = table.probe(board.zobrist_key)
+            if entry is None or entry[3] == TranspositionTable.NO_MOVE:
+                break
+            move = next((move for move in
+                         board.get_all_moves(board.side_to_move)
+                         if move.pack() == entry[3]), None)
+            if move is None:
+                break
+            pv.append(move)
+            king_eaten = board.move_piece(move)
+        for _ in pv:
+            board.undo_move()
+        table.probes, table.hits = probes, hits
+        return pv
+
+    def close(self) -> None:
+        """
+        This function releases the worker processes of the parallel search,
+        if there are any, and the opening book.
+        :return: None
+        """
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+        if self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+    def computers_play(self, board: Board, time_limit: float = None,
+                       node_limit: int = None, depth: int = None) -> Move:
         """
-        Compute the best move for the computer.
+        Compute the best move for the computer. In the opening, the move is
+        taken from the opening book, if there is one, without any search.
         :param board: the logical representation of the board, a Board object.
-        :return: The best move possible.
+        :param time_limit: float, the number of seconds the computer may think.
+        If None, the time limit of the difficulty is used.
+        :param node_limit: int, the number of nodes the computer may search. If
+        None, the node limit of the difficulty is used.
+        :param depth: int, the deepest tree depth to search. If None, the
+        depth of the difficulty is used.
+        :return: The best move possible, or None if there is no move to make.
         """
-        best_moves = self.minmax_algorithm(board, self.computer_color,
-                                           self.user_color, self.__difficulty,
-                                           True)
+        if time_limit is None:
+            time_limit = self.time_limit
+        if node_limit is None:
+            node_limit = self.node_limit
+        if depth is None:
+            depth = self.__difficulty
+        self.nodes = 0
+        self.deadline = None
+        if time_limit is not None:
+            self.deadline = monotonic() + time_limit
+        self.max_nodes = node_limit
+        if self.opening_book is not None and \
+                board.side_to_move == self.computer_color:
+            move = self.opening_book.get_move(board)
+            if move is not None:
+                self.stats = SearchStats()
+                self.stats.book_move = True
+                self.stats.pv = [move]
+                self.stats.finish(0)
+                if self.on_search_end is not None:
+                    self.on_search_end(self.stats)
+                return move
+        # The scores are positive when white leads, so white maximizes them.
+        best_moves = self.iterative_deepening(
+            board, self.computer_color, self.user_color, depth,
+            self.computer_color != Colors['WHITE'])
+        if self.on_search_end is not None:
+            self.on_search_end(self.stats)
+        if not best_moves:
+            return None
         move = best_moves[randint(0, len(best_moves) - 1)]
         return move[0]
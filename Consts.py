@@ -30,10 +30,46 @@ BoardParameters = {
     'TERMINAL_WIDTH': 400
 }
 
+# Each difficulty is a search profile: the deepest tree depth, the number of
+# seconds per move and the number of nodes per move (None for no limit). The
+# search stops at the first limit it reaches, and plays the best move of its
+# last complete iteration, so the time of a move never goes much beyond
+# TIME_LIMIT.
 Difficulties = {
-    'EASY': 0,
-    'MEDIUM': 3,
-    'HARD': 7
+    'EASY': {'DEPTH': 0, 'TIME_LIMIT': 0.1, 'NODE_LIMIT': 2000},
+    'MEDIUM': {'DEPTH': 3, 'TIME_LIMIT': 1.0, 'NODE_LIMIT': None},
+    'HARD': {'DEPTH': 7, 'TIME_LIMIT': 5.0, 'NODE_LIMIT': None}
+}
+
+SearchParameters = {
+    'HASH_SIZE_MB': 16,
+    'WORKERS': 1,
+    'QUIESCENCE': True,
+    'OPENING_BOOK': './opening_book.bin',
+    'TABLEBASES': './tablebases',
+    # Score the leaves of each node in one NumPy batch, see BatchEvaluation.
+    # It requires 'QUIESCENCE': False, since the quiescence search scores the
+    # leaves one by one: ComputerAI raises ValueError if both are set.
+    'BATCH_LEAVES': False
+}
+
+# The packed images of the pieces are cached in this file, so they are loaded
+# from one file at startup. None turns the cache off.
+AssetParameters = {
+    'ATLAS_CACHE': './chess_pieces.atlas'
+}
+
+# The games are recorded as PGN files in this directory, one file per game.
+LogParameters = {
+    'DIRECTORY': './game_logs'
+}
+
+# The overlay of the terminal that shows the search of the computer while it
+# thinks (see GameTerminal.update_search_stats). It is toggled with the S key,
+# and it is refreshed every REFRESH_SECONDS.
+OverlayParameters = {
+    'SEARCH_STATS': False,
+    'REFRESH_SECONDS': 0.25
 }
 
 reset_params = [-1, -1, "None", []]
@@ -0,0 +1,143 @@
+import pygame
+from Assets import Assets
+from Board import Board, BoardNode
+from Consts import Colors, MoveType, BoardParameters
+from Move import Move
+from Pieces import Pieces
+from Renderer import Renderer
+from typing import List
+
+
+class DisplayBoard:
+    """ This class is the 'view' of the board. It handles all of the visual
+    logic of the board. It translates the logical board (of type Board) into the
+    visual board. The functions only draw on the destination surface, and mark
+    what they drew on the renderer, which shows it at the end of the frame. """
+
+    def __init__(self, destination: pygame.Surface, board: Board,
+                 renderer: Renderer):
+        """
+        This function is default c'tor. The graphics of the pieces are loaded
+        once, and shared by all the boards (see Assets).
+        """
+        self.pieces_graphics = Assets.get_pieces()
+        self.destination = destination
+        self.board = board
+        self.renderer = renderer
+
+    def draw_cell(self, row: int, col: int) -> None:
+        """
+        This cell performs visual draws specific cell given by coordinates of
+        (row, col).
+        :param row: int, the row of specific cell.
+        :param col: int, the col of specific cell.
+        :return: None.
+        """
+        self.renderer.mark_dirty(
+            pygame.draw.rect(self.destination,
+                             self.board.get_cell_color_at(row, col),
+                             [col * BoardNode.CELL_HEIGHT,
+                              row * BoardNode.CELL_WIDTH,
+                              BoardNode.CELL_WIDTH,
+                              BoardNode.CELL_HEIGHT]))
+        piece = self.board.get_piece_at(row, col)
+        if piece != Pieces.NONE:
+            self.destination.blit(self.pieces_graphics[piece],
+                                  (col * BoardNode.CELL_HEIGHT,
+                                   row * BoardNode.CELL_WIDTH))
+
+    def show_board(self):
+        """
+        This function responsible to show the entire row on the screen.
+
+        Important note: Currently this function works well when user is white
+        and computer is black. It should be extended to all cases.
+
+        :return: None.
+        """
+        for row in range(0, BoardParameters['ROWS']):
+            for col in range(0, BoardParameters['COLS']):
+                pygame.draw.rect(self.destination,
+                                 self.board.get_cell_color_at(row, col),
+                                 [col * BoardParameters['CELL_WIDTH'],
+                                  row * BoardParameters['CELL_HEIGHT'],
+                                  BoardParameters['CELL_WIDTH'],
+                                  BoardParameters['CELL_HEIGHT']])
+                piece = self.board.get_piece_at(row, col)
+                if piece != Pieces.NONE:
+                    self.destination.blit(self.pieces_graphics[piece],
+                                          (col * BoardParameters['CELL_HEIGHT'],
+                                           row * BoardParameters['CELL_WIDTH']))
+        self.renderer.mark_dirty(
+            [0, 0,
+             BoardParameters['COLS'] * BoardParameters['CELL_WIDTH'],
+             BoardParameters['ROWS'] * BoardParameters['CELL_HEIGHT']])
+
+    def display_selected(self, row: int, col: int, move_type) -> None:
+        """
+        This function is responsible to display selected square.
+        :param row: int, the row of specific cell.
+        :param col: int, the col of specific cell.
+        :param move_type:
+        :return: None
+        """
+        color = Colors['BLUE']
+        if move_type == MoveType['POSSIBLE_MOVE']:
+            color = Colors['GREEN']
+        self.renderer.mark_dirty(
+            pygame.draw.rect(self.destination,
+                             color,
+                             [col * BoardNode.CELL_WIDTH + 5,
+                              row * BoardNode.CELL_HEIGHT + 5,
+                              BoardNode.CELL_WIDTH - 10,
+                              BoardNode.CELL_HEIGHT - 10], 5))
+
+    def display_all_possible_moves(self, moves: List[Move]) -> None:
+        """
+        This function responsible to visualise all possible moves to the user.
+        :param moves: List[Moves], list of all possible and legal moves.
+        :return: None
+        """
+        for move in moves:
+            self.display_selected(move.to_row,
+                                  move.to_col,
+                                  MoveType['POSSIBLE_MOVE'])
+
+    def unselect(self, row: int, col: int, moves: List[Move]) -> None:
+        """
+        This function responsible for the visual logic of unselecting cell.
+        :param row: int, is the row of cell to be unselected.
+        :param col: int, is the col of cell to be unselected.
+        :param moves: List[Moves], represents the possible moves.
+        :return: None
+        """
+        self.draw_cell(row, col)
+        for move in moves:
+            row = move.to_row
+            col = move.to_col
+            self.draw_cell(row, col)
+
+    def move_piece(self, move: Move, moves: List[Move]) -> None:
+        """
+        This function responsible for handling the visual logic of piece
+        movement.
+        :param move: Move, is the move that should be displayed.
+        :param moves: List[Moves] is the list of all moves that should be
+        unselected visually as result of move.
+        :return: None
+        """
+        from_row = move.from_row
+        from_col = move.from_col
+        to_row = move.to_row
+        to_col = move.to_col
+        self.unselect(from_row, from_col, moves)
+        self.draw_cell(from_row, from_col)
+        self.draw_cell(to_row, to_col)
+
+    def undo_move(self, last_move: Move):
+        """
+        This function responsible for visual logic of undo move.
+        :param last_move: Move, is the move that should be displayed.
+        :return None
+        """
+        self.move_piece(last_move, [])
@@ -0,0 +1,134 @@
+from queue import Queue, Empty
+from threading import Thread, Lock
+from ComputerAI import ComputerAI
+from Board import Board
+from Move import Move
+
+
+class EngineWorker:
+    """
+    This class runs the computer player in a background thread, so the game
+    keeps handling its events while the computer thinks.
+
+    The game sends a request with a copy of the board, and keeps running its
+    event loop. The worker searches the copy and puts the chosen move into the
+    response queue, where the game picks it up on one of the next frames.
+
+    Each request gets an id. A request can be cancelled, for example when the
+    game is restarted, and then its response is dropped even if the search has
+    already finished.
+    """
+
+    def __init__(self, computer_ai: ComputerAI):
+        """
+        Default c'tor. Starts the background thread.
+        :param computer_ai: ComputerAI, the computer player that computes the
+        moves.
+        """
+        self.computer_ai = computer_ai
+        self.__requests = Queue()
+        self.__responses = Queue()
+        self.__lock = Lock()
+        self.__last_request_id = 0
+        self.__cancelled_request_id = 0
+        self.__result = None
+        self.__has_result = False
+        self.__thread = Thread(target=self.__run, name='EngineWorker',
+                               daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        """
+        The loop of the background thread. It serves the requests one by one,
+        until it gets None.
+        :return: None
+        """
+        while True:
+            request = self.__requests.get()
+            if request is None:
+                return
+            request_id, board, time_limit = request
+            with self.__lock:
+                if request_id <= self.__cancelled_request_id:
+                    continue
+                self.computer_ai.stop_event.clear()
+            move = self.computer_ai.computers_play(board, time_limit)
+            self.__responses.put((request_id, move))
+
+    def request_move(self, board: Board, time_limit: float = None) -> int:
+        """
+        This function asks the worker to compute the next move of the computer.
+        The worker searches a copy of the board, so the board may be used by
+        the game while the computer thinks.
+        :param board: Board, the board to compute the move on.
+        :param time_limit: float, the deadline of the search in seconds. If
+        None, the time limit of the difficulty of the computer player is used.
+        :return: int, the id of the request.
+        """
+        self.__last_request_id += 1
+        self.__has_result = False
+        self.__result = None
+        self.__requests.put((self.__last_request_id, board.copy(), time_limit))
+        return self.__last_request_id
+
+    def is_thinking(self) -> bool:
+        """
+        :return: True, if and only if there is a request that is not answered
+        and not cancelled.
+        """
+        return self.__last_request_id > self.__cancelled_request_id and \
+            not self.has_result()
+
+    def has_result(self) -> bool:
+        """
+        This function checks, without blocking, whether the answer to the last
+        request has arrived. Answers to older or cancelled requests are dropped.
+        :return: True, if and only if the move of the last request is ready.
+        """
+        while not self.__has_result:
+            try:
+                request_id, move = self.__responses.get_nowait()
+            except Empty:
+                return False
+            if request_id == self.__last_request_id and \
+                    request_id > self.__cancelled_request_id:
+                self.__result = move
+                self.__has_result = True
+        return True
+
+    def get_result(self) -> Move:
+        """
+        This function returns the move of the last request and forgets it, so
+        every answer is used once.
+        :return: Move, the move of the computer, or None if there is no move
+        to make or the answer has not arrived.
+        """
+        if not self.has_result():
+            return None
+        move = self.__result
+        self.__result = None
+        self.__has_result = False
+        self.__cancelled_request_id = self.__last_request_id
+        return move
+
+    def cancel(self) -> None:
+        """
+        This function cancels all the requests that were sent. The search that
+        runs is stopped, and its answer is dropped.
+        :return: None
+        """
+        with self.__lock:
+            self.__cancelled_request_id = self.__last_request_id
+            self.computer_ai.stop()
+        self.__has_result = False
+        self.__result = None
+
+    def shutdown(self, timeout: float = 1.0) -> None:
+        """
+        This function cancels the requests and stops the background thread.
+        :param timeout: float, how many seconds to wait for the thread.
+        :return: None
+        """
+        self.cancel()
+        self.__requests.put(None)
+        self.__thread.join(timeout)
@@ -0,0 +1,192 @@
+from Pieces import Pieces
+from typing import Dict, List
+
+
+class Evaluation:
+    """
+    This class holds the tables of the evaluation function. The score of a
+    position is the sum of the scores of its pieces, where the score of a piece
+    depends on its type and on its cell (a "piece-square table"). For example,
+    a knight in the center of the board is worth more than a knight in a corner.
+
+    Each piece has two scores: one for the middle game and one for the end
+    game. For example, the king should hide in the middle game, but it should
+    come to the center in the end game. The two scores are mixed by the phase of
+    the game, which is computed from the pieces that are left on the board
+    ("tapered evaluation"):
+
+        score = (middle_game * phase + end_game * (MAX_PHASE - phase)) /
+                MAX_PHASE
+
+    The scores are in centipawns, positive for white and negative for black.
+    The tables are written from the white point of view, as the board is seen
+    on the screen: the first row is the row of the black pieces.
+    """
+
+    # Each knight and bishop adds 1 to the phase, each rook 2 and each queen 4,
+    # so the phase of the initial position is MAX_PHASE.
+    MAX_PHASE = 24
+
+    # A king is worth more than all other pieces together, since the game is
+    # won by eating it.
+    MIDDLE_GAME_VALUES = {'P': 82, 'N': 337, 'B': 365, 'R': 477, 'Q': 1025,
+                          'K': 20000}
+    END_GAME_VALUES = {'P': 94, 'N': 281, 'B': 297, 'R': 512, 'Q': 936,
+                       'K': 20000}
+    PHASE_VALUES = {'P': 0, 'N': 1, 'B': 1, 'R': 2, 'Q': 4, 'K': 0}
+
+    PAWN_TABLE = [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0
+    ]
+
+    PAWN_END_GAME_TABLE = [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        80, 80, 80, 80, 80, 80, 80, 80,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        30, 30, 30, 30, 30, 30, 30, 30,
+        15, 15, 15, 15, 15, 15, 15, 15,
+        5, 5, 5, 5, 5, 5, 5, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+        0, 0, 0, 0, 0, 0, 0, 0
+    ]
+
+    KNIGHT_TABLE = [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50
+    ]
+
+    BISHOP_TABLE = [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20
+    ]
+
+    ROOK_TABLE = [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0
+    ]
+
+    QUEEN_TABLE = [
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20
+    ]
+
+    KING_TABLE = [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20
+    ]
+
+    KING_END_GAME_TABLE = [
+        -50, -40, -30, -20, -20, -30, -40, -50,
+        -30, -20, -10, 0, 0, -10, -20, -30,
+        -30, -10, 20, 30, 30, 20, -10, -30,
+        -30, -10, 30, 40, 40, 30, -10, -30,
+        -30, -10, 30, 40, 40, 30, -10, -30,
+        -30, -10, 20, 30, 30, 20, -10, -30,
+        -30, -30, 0, 0, 0, 0, -30, -30,
+        -50, -30, -30, -30, -30, -30, -30, -50
+    ]
+
+    MIDDLE_GAME_TABLES = {'P': PAWN_TABLE, 'N': KNIGHT_TABLE,
+                          'B': BISHOP_TABLE, 'R': ROOK_TABLE,
+                          'Q': QUEEN_TABLE, 'K': KING_TABLE}
+    END_GAME_TABLES = {'P': PAWN_END_GAME_TABLE, 'N': KNIGHT_TABLE,
+                       'B': BISHOP_TABLE, 'R': ROOK_TABLE,
+                       'Q': QUEEN_TABLE, 'K': KING_END_GAME_TABLE}
+
+    PIECE_TYPES = {
+        Pieces.WHITE_PAWN: 'P', Pieces.BLACK_PAWN: 'P',
+        Pieces.WHITE_HORSE: 'N', Pieces.BLACK_HORSE: 'N',
+        Pieces.WHITE_BISHOP: 'B', Pieces.BLACK_BISHOP: 'B',
+        Pieces.WHITE_ROOK: 'R', Pieces.BLACK_ROOK: 'R',
+        Pieces.WHITE_QUEEN: 'Q', Pieces.BLACK_QUEEN: 'Q',
+        Pieces.WHITE_KING: 'K', Pieces.BLACK_KING: 'K'
+    }
+
+    # MIDDLE_GAME[piece][8 * row + col] is the middle game score of the piece
+    # on (row, col), including its value, and the same for END_GAME. PHASE is
+    # the phase of each piece. They are filled by _build_tables.
+    MIDDLE_GAME = {}  # type: Dict[str, List[int]]
+    END_GAME = {}  # type: Dict[str, List[int]]
+    PHASE = {}  # type: Dict[str, int]
+
+    @staticmethod
+    def taper(middle_game: int, end_game: int, phase: int) -> int:
+        """
+        This function mixes the middle game and end game scores by the phase.
+        :param middle_game: int, the middle game score.
+        :param end_game: int, the end game score.
+        :param phase: int, the phase of the position.
+        :return: int, the score of the position.
+        """
+        if phase > Evaluation.MAX_PHASE:
+            phase = Evaluation.MAX_PHASE
+        return (middle_game * phase + end_game *
+                (Evaluation.MAX_PHASE - phase)) // Evaluation.MAX_PHASE
+
+
+def _build_tables() -> None:
+    """
+    Fills the per-piece tables of the Evaluation class. The tables of black
+    pieces are the tables of white pieces, mirrored and negated.
+    """
+    for piece, piece_type in Evaluation.PIECE_TYPES.items():
+        is_white = Pieces.get_piece_color(piece) == \
+            Pieces.get_piece_color(Pieces.WHITE_PAWN)
+        middle_game, end_game = [], []
+        for square in range(0, 64):
+            row, col = divmod(square, 8)
+            table_square = square if is_white else 8 * (7 - row) + col
+            middle_game_score = Evaluation.MIDDLE_GAME_VALUES[piece_type] + \
+                Evaluation.MIDDLE_GAME_TABLES[piece_type][table_square]
+            end_game_score = Evaluation.END_GAME_VALUES[piece_type] + \
+                Evaluation.END_GAME_TABLES[piece_type][table_square]
+            middle_game.append(middle_game_score if is_white
+                               else -middle_game_score)
+            end_game.append(end_game_score if is_white else -end_game_score)
+        Evaluation.MIDDLE_GAME[piece] = middle_game
+        Evaluation.END_GAME[piece] = end_game
+        Evaluation.PHASE[piece] = Evaluation.PHASE_VALUES[piece_type]
+
+    Evaluation.MIDDLE_GAME[Pieces.NONE] = [0] * 64
+    Evaluation.END_GAME[Pieces.NONE] = [0] * 64
+    Evaluation.PHASE[Pieces.NONE] = 0
+
+
+_build_tables()
@@ -0,0 +1,81 @@
+import pygame
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+
+class FontRegistry:
+    """
+    This class shares the fonts and the rendered texts of the whole game.
+
+    Loading a font reads its TTF file, so each font (a path and a size) is
+    loaded once, by the first TextHandler that asks for it, and shared by all
+    the others. Rendering a text rasterises its glyphs, so the rendered
+    surfaces are kept in an LRU cache: the terminal redraws the same move
+    numbers, moves and titles on every reset, and they are rendered once.
+
+    The cached surfaces are shared, so they must only be blitted, never drawn
+    on.
+    """
+
+    # The number of rendered texts to keep. The least recently used text is
+    # dropped first.
+    MAX_TEXTS = 512
+
+    __fonts = {}  # type: Dict[Tuple[str, int], pygame.font.Font]
+    __texts = OrderedDict()  # type: OrderedDict
+
+    # Statistics of the text cache.
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def get_font(path: str, size: int) -> pygame.font.Font:
+        """
+        :param path: str, the path of the TTF file.
+        :param size: int, the size of the font.
+        :return: pygame.font.Font, the font, loaded on its first use.
+        """
+        key = (path, size)
+        font = FontRegistry.__fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            FontRegistry.__fonts[key] = font
+        return font
+
+    @staticmethod
+    def render_text(path: str, size: int, text: str,
+                    color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        This function renders an antialiased text, or returns the surface of
+        its last rendering.
+        :param path: str, the path of the TTF file of the font.
+        :param size: int, the size of the font.
+        :param text: str, the text.
+        :param color: tuple of (r, g, b), the color of the text.
+        :return: pygame.Surface, the rendered text.
+        """
+        key = (path, size, text, color)
+        texts = FontRegistry.__texts
+        surface = texts.get(key)
+        if surface is not None:
+            texts.move_to_end(key)
+            FontRegistry.hits += 1
+            return surface
+
+        FontRegistry.misses += 1
+        surface = FontRegistry.get_font(path, size).render(text, True, color)
+        texts[key] = surface
+        if len(texts) > FontRegistry.MAX_TEXTS:
+            texts.popitem(last=False)
+        return surface
+
+    @staticmethod
+    def clear() -> None:
+        """
+        This function drops all the fonts and the rendered texts. It must be
+        called if pygame.font is quit and initialized again, since the fonts
+        belong to the old initialization.
+        :return: None
+        """
+        FontRegistry.__fonts.clear()
+        FontRegistry.__texts.clear()
@@ -1,17 +1,26 @@
+import os
 import pygame
-from Board import Board, BoardNode, DisplayBoard
+from datetime import datetime
+from time import monotonic
+from Board import BoardNode
+from DisplayBoard import DisplayBoard
+from BitBoard import BitBoard
 from Pieces import Pieces
-from Consts import Colors, MoveType, reset_params, BoardParameters
+from Consts import Colors, MoveType, reset_params, BoardParameters, \
+    SearchParameters, LogParameters, OverlayParameters
 from ComputerAI import ComputerAI
+from EngineWorker import EngineWorker
 from Move import Move
 from GameTerminal import GameTerminal
+from GameRecorder import GameRecorder
+from Renderer import Renderer
 from typing import List, Tuple
 from GameObjectInterface import GameObjectInterface
 
 
 class Game(GameObjectInterface):
 
-    def __init__(self, difficult: int,
+    def __init__(self, difficult,
                  user_color=Colors['WHITE'],
                  computer_color=Colors['BLACK']):
         """
@@ -36,6 +45,10 @@ class Game(GameObjectInterface):
 
         pygame.display.set_caption("Chess")
 
+        # The views only mark what they draw, and the screen is updated once
+        # per frame.
+        self.renderer = Renderer()
+
         self.clock = pygame.time.Clock()
 
         self.quit_game_flag = False
@@ -47,16 +60,49 @@ class Game(GameObjectInterface):
 
         self.computer_ai = ComputerAI(difficult,
                                       computer_color=computer_color,
-                                      user_color=user_color)
+                                      user_color=user_color,
+                                      workers=SearchParameters['WORKERS'])
+
+        # The computer thinks in the background, so the game stays responsive.
+        self.engine = EngineWorker(self.computer_ai)
+
+        self.board = BitBoard.default_ctor(user_color=user_color)
+        self.display_board = DisplayBoard(self.main_screen, self.board,
+                                          self.renderer)
 
-        self.board = Board.default_ctor(user_color=user_color)
-        self.display_board = DisplayBoard(self.main_screen, self.board)
+        # The moves of the game are recorded into a PGN file as they are
+        # played.
+        self.recorder = self.new_recorder()
 
         self.terminal = GameTerminal(self.board_width,
                                      0, BoardParameters['TERMINAL_WIDTH'],
                                      self.screen_width,
                                      self.main_screen,
-                                     self)
+                                     self, self.renderer)
+
+        # The time of the next refresh of the search statistics overlay.
+        self.next_stats_refresh = 0.0
+
+    def new_recorder(self) -> GameRecorder:
+        """
+        This function starts the record of a new game, in a new file of the
+        log directory.
+        :return: GameRecorder, the recorder of the game.
+        """
+        os.makedirs(LogParameters['DIRECTORY'], exist_ok=True)
+        path = os.path.join(LogParameters['DIRECTORY'],
+                            datetime.now().strftime('game_%Y%m%d_%H%M%S_%f.pgn'))
+        players = {self.user_color: 'User', self.computer_color: 'Computer'}
+        return GameRecorder(path, {'White': players[Colors['WHITE']],
+                                   'Black': players[Colors['BLACK']]})
+
+    @staticmethod
+    def get_result(winner_color) -> str:
+        """
+        :param winner_color: the color of the player that won the game.
+        :return: str, the result of the game in PGN.
+        """
+        return '1-0' if winner_color == Colors['WHITE'] else '0-1'
 
     def handle_user_piece_selection(self):
         """
@@ -102,8 +148,10 @@ class Game(GameObjectInterface):
         :return: True, if and only if the move is done.
         """
         if new_move in all_possible_moves:
+            self.recorder.add_move(self.board, new_move)
             if self.board.move_piece(new_move):
                 self.pause_game_flag = True
+                self.recorder.finish(self.get_result(self.user_color))
                 self.terminal.display_win_message()
             self.display_board.move_piece(new_move, all_possible_moves)
             return True
@@ -158,6 +206,10 @@ class Game(GameObjectInterface):
                 if event.type == pygame.QUIT:
                     self.quit_game_flag = True
 
+                # The S key shows or hides the search statistics.
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                    self.terminal.toggle_search_stats()
+
                 # If mouse click was detected
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_pos = pygame.mouse.get_pos()
@@ -197,7 +249,8 @@ class Game(GameObjectInterface):
                                 [from_row, from_col, selected_piece,
                                  all_possible_moves] = reset_params
 
-                                self.terminal.add_move_to_print(new_move)
+                                self.terminal.add_move_to_print(
+                                    self.recorder.moves[-1])
                                 self.is_user_turn = not self.is_user_turn
 
                     # If user presses on the terminal and not on the board.
@@ -205,22 +258,57 @@ class Game(GameObjectInterface):
                             not self.is_mouse_click_on_board(mouse_pos):
                         self.terminal.click_on_terminal(self.pause_game_flag)
 
-            # Computers turn to play
-            # The computation should be moved to another process/thread
-            # so it will not block other operations
+            # Computers turn to play. The move is computed by the engine worker
+            # in the background, and it is played on the first frame after it
+            # is ready.
             if not self.is_user_turn and not self.pause_game_flag:
-                move = self.computer_ai.computers_play(self.board)
-                self.terminal.add_move_to_print(move)
-                if self.board.move_piece(move):
-                    self.pause_game_flag = True
-                    self.terminal.display_win_message(winner='Computer')
-                self.display_board.move_piece(move, [])
-                self.is_user_turn = not self.is_user_turn
-
+                if self.engine.has_result():
+                    self.handle_computers_move(self.engine.get_result())
+                    self.terminal.update_search_stats(self.computer_ai.stats)
+                elif not self.engine.is_thinking():
+                    self.engine.request_move(self.board)
+                elif self.terminal.show_search_stats and \
+                        monotonic() >= self.next_stats_refresh:
+                    # The search runs on the thread of the engine worker, so
+                    # its statistics are only read here.
+                    stats = self.computer_ai.stats
+                    self.terminal.update_search_stats(
+                        stats, self.computer_ai.nodes,
+                        monotonic() - stats.start_time)
+                    self.next_stats_refresh = monotonic() + \
+                        OverlayParameters['REFRESH_SECONDS']
+
+            # Show everything that was drawn during the frame.
+            self.renderer.update()
             self.clock.tick(30)
 
+        self.engine.shutdown()
+        self.computer_ai.close()
+        self.recorder.finish('*')
         pygame.quit()
 
+    def handle_computers_move(self, move: Move) -> None:
+        """
+        This function plays the move that the computer has chosen, on the
+        logical board and on the display.
+        :param move: Move, the move of the computer, or None if the computer
+        has no move to make.
+        :return: None
+        """
+        if move is None:
+            self.pause_game_flag = True
+            self.recorder.finish(self.get_result(self.user_color))
+            self.terminal.display_win_message()
+            return
+        self.terminal.add_move_to_print(self.recorder.add_move(self.board,
+                                                               move))
+        if self.board.move_piece(move):
+            self.pause_game_flag = True
+            self.recorder.finish(self.get_result(self.computer_color))
+            self.terminal.display_win_message(winner='Computer')
+        self.display_board.move_piece(move, [])
+        self.is_user_turn = not self.is_user_turn
+
     def quit_game(self) -> None:
         """
         This function responsible to quit the game.
@@ -234,10 +322,14 @@ class Game(GameObjectInterface):
         :return: None
         """
         print("Restart the game was pressed!")
+        self.engine.cancel()
         self.terminal.undo_all_moves()
         self.terminal.reset_terminal()
-        self.board = Board.default_ctor(user_color=self.user_color)
-        self.display_board = DisplayBoard(self.main_screen, self.board)
+        self.recorder.finish('*')
+        self.recorder = self.new_recorder()
+        self.board = BitBoard.default_ctor(user_color=self.user_color)
+        self.display_board = DisplayBoard(self.main_screen, self.board,
+                                          self.renderer)
         self.display_board.show_board()
         self.pause_game_flag = False
         self.is_user_turn = (self.user_color == Colors['WHITE'])
@@ -249,8 +341,20 @@ class Game(GameObjectInterface):
         blacks and the second is of the player.
         :return: None
         """
+        self.engine.cancel()
         last_move_black = self.board.undo_move()
         last_move_white = self.board.undo_move()
         self.display_board.undo_move(last_move_black)
         self.display_board.undo_move(last_move_white)
         self.terminal.undo_move()
+        self.recorder.undo_moves(2)
+
+    def save_game(self) -> None:
+        """
+        This function is responsible to save the log of the game. The moves are
+        written to the log as they are played, so it only makes sure that the
+        log is on the disk.
+        :return: None
+        """
+        self.recorder.save()
+        print("The game is saved to {}".format(self.recorder.path))
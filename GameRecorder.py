@@ -0,0 +1,147 @@
+import os
+from datetime import date
+from typing import Dict, List, Tuple
+from Board import Board
+from Move import Move
+from PGN import LINE_WIDTH, RESULTS, format_headers, move_to_san
+
+
+class GameRecorder:
+    """
+    This class records a game into a PGN file while it is played.
+
+    Each move is appended to the file as it is played, so saving the game
+    never writes the whole game again. The file is flushed after every move
+    and synced to the disk (fsync) when the game ends or is saved.
+
+    The result of a game is not known until it ends, so the Result header is
+    written as "*" with room for the longest result ("1/2-1/2"), and it is
+    written over in place when the game ends. An undone move is cut off the
+    end of the file, so the file always holds the moves of the board.
+    """
+
+    # The width of the longest result, the room of the Result header.
+    RESULT_WIDTH = max(len(result) for result in RESULTS)
+
+    def __init__(self, path: str, headers: Dict[str, str]):
+        """
+        Default c'tor. It creates the PGN file and writes the headers of the
+        game.
+        :param path: str, the path of the PGN file. An existing file is
+        overwritten.
+        :param headers: dictionary of the headers of the game. The Event,
+        Site, Date and Round headers are added if they are missing.
+        """
+        headers = dict(headers)
+        headers.setdefault('Event', 'Casual game')
+        headers.setdefault('Site', '?')
+        headers.setdefault('Date', date.today().strftime('%Y.%m.%d'))
+        headers.setdefault('Round', '-')
+        headers['Result'] = '*'
+
+        self.path = path
+        self.result = None  # The result, once the game ends.
+        self.moves = []  # type: List[str]
+
+        # The file offset and the length of the last line before each move,
+        # so an undone move can be cut off the file.
+        self.__undo_stack = []  # type: List[Tuple[int, int]]
+        self.__line_length = 0
+
+        text = ''
+        self.__result_offset = 0
+        for line in format_headers(headers).splitlines(True):
+            if line.startswith('[Result '):
+                self.__result_offset = len(text.encode('utf-8'))
+                line = line.rstrip('\n') + \
+                    ' ' * (GameRecorder.RESULT_WIDTH - 1) + '\n'
+            text += line
+        self.__file = open(path, 'wb+')
+        self.__write(text + '\n')
+
+    def __write(self, text: str) -> None:
+        """
+        :param text: str, the text to append to the file.
+        :return: None
+        """
+        self.__file.write(text.encode('utf-8'))
+
+    def __append_token(self, token: str) -> None:
+        """
+        This function appends a token of the movetext, and starts a new line
+        when the current one would be longer than LINE_WIDTH.
+        :param token: str, the token.
+        :return: None
+        """
+        if self.__line_length == 0:
+            self.__write(token)
+            self.__line_length = len(token)
+        elif self.__line_length + 1 + len(token) > LINE_WIDTH:
+            self.__write('\n' + token)
+            self.__line_length = len(token)
+        else:
+            self.__write(' ' + token)
+            self.__line_length += 1 + len(token)
+
+    def add_move(self, board: Board, move: Move) -> str:
+        """
+        This function records a move. It must be called before the move is
+        played on the board, since the SAN of a move depends on the position
+        before it.
+        :param board: Board, the position before the move.
+        :param move: Move, the move.
+        :return: str, the move in SAN.
+        """
+        san = move_to_san(board, move)
+        self.__undo_stack.append((self.__file.tell(), self.__line_length))
+        if len(self.moves) % 2 == 0:
+            self.__append_token('{}.'.format(len(self.moves) // 2 + 1))
+        self.__append_token(san)
+        self.moves.append(san)
+        self.__file.flush()
+        return san
+
+    def undo_moves(self, count: int) -> None:
+        """
+        This function cuts the last moves off the file.
+        :param count: int, the number of moves to undo.
+        :return: None
+        """
+        count = min(count, len(self.__undo_stack))
+        if count <= 0:
+            return
+        offset, self.__line_length = self.__undo_stack[-count]
+        del self.__undo_stack[-count:]
+        del self.moves[-count:]
+        self.__file.seek(offset)
+        self.__file.truncate()
+        self.__file.flush()
+
+    def save(self) -> None:
+        """
+        This function makes sure that the moves recorded so far are on the
+        disk.
+        :return: None
+        """
+        if not self.__file.closed:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+
+    def finish(self, result: str) -> None:
+        """
+        This function ends the game: it writes the result at the end of the
+        movetext and in the Result header, syncs the file and closes it.
+        :param result: str, the result of the game, one of PGN.RESULTS.
+        :return: None
+        """
+        if self.__file.closed:
+            return
+        self.result = result
+        self.__append_token(result)
+        self.__write('\n\n')
+        self.__file.seek(self.__result_offset)
+        self.__write('[Result "{}"]{}'.format(
+            result, ' ' * (GameRecorder.RESULT_WIDTH - len(result))))
+        self.__file.seek(0, os.SEEK_END)
+        self.save()
+        self.__file.close()
@@ -1,8 +1,11 @@
 import pygame
-from Consts import Colors, Fonts
+from typing import List
+from Consts import Colors, Fonts, OverlayParameters
 from Pieces import Pieces
+from SearchStats import SearchStats
 from TextHandler import TextHandler
 from Button import Button
+from Renderer import Renderer
 import ButtonFunctionality
 from GameObjectInterface import GameObjectInterface
 
@@ -13,7 +16,8 @@ class GameTerminal:
     undo some move and so on. """
 
     def __init__(self, top_x: int, top_y: int, width: int, height: int,
-                 dest: pygame.Surface, game: GameObjectInterface):
+                 dest: pygame.Surface, game: GameObjectInterface,
+                 renderer: Renderer):
         """
         Default c'tor
         :param top_x: int, the x coordinate of the terminal.
@@ -22,57 +26,49 @@ class GameTerminal:
         :param height: int, the height of the terminal screen.
         :param dest: pygame.Surface, the surface to blit the terminal on.
         :param game: Game, the game to perform operations on.
+        :param renderer: Renderer, collects the drawn parts of the screen.
         """
         self.top_x = top_x
         self.top_y = top_y
         self.width = width
         self.height = height
         self.destination = dest
+        self.renderer = renderer
         self.move_stack_left = []
         self.move_stack_right = []
 
         self.left_moves_x_coordinate = 20
         self.right_moves_x_coordinate = 200
 
+        # The overlay of the search statistics, below the moves: whether it is
+        # shown, its rectangle, and its lines of text.
+        self.show_search_stats = OverlayParameters['SEARCH_STATS']
+        self.search_stats_rect = pygame.Rect(self.top_x + 20,
+                                             self.top_y + 560,
+                                             self.width - 40, 185)
+        self.search_stats_lines = []  # type: List[str]
+
         self.moves_text = TextHandler(Fonts['Regular'],
-                                      Colors['BLACK'], 20, self.destination)
+                                      Colors['BLACK'], 20, self.destination,
+                                      self.renderer)
         self.big_title = TextHandler(Fonts['Bold'],
-                                     Colors['BLACK'], 30, self.destination)
-        self.cols = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-        self.rows = ['8', '7', '6', '5', '4', '3', '2', '1']
-
-        self.piece_letter = {
-            Pieces.WHITE_KING: 'K',
-            Pieces.BLACK_KING: 'K',
-
-            Pieces.WHITE_QUEEN: 'Q',
-            Pieces.BLACK_QUEEN: 'Q',
-
-            Pieces.WHITE_BISHOP: 'B',
-            Pieces.BLACK_BISHOP: 'B',
-
-            Pieces.WHITE_HORSE: 'N',
-            Pieces.BLACK_HORSE: 'N',
-
-            Pieces.WHITE_ROOK: 'R',
-            Pieces.BLACK_ROOK: 'R',
-
-            Pieces.WHITE_PAWN: 'P',
-            Pieces.BLACK_PAWN: ' P'
-        }
-
+                                     Colors['BLACK'], 30, self.destination,
+                                     self.renderer)
+        self.stats_text = TextHandler(Fonts['Regular'],
+                                      Colors['BLACK'], 16, self.destination,
+                                      self.renderer)
         self.quit_button = Button(830, 790, "Quit",
                                   ButtonFunctionality.quit_game,
-                                  [game], self.destination)
+                                  [game], self.destination, self.renderer)
         self.restart_button = Button(880, 790, "New Game",
                                      ButtonFunctionality.restart_game, [game],
-                                     self.destination)
+                                     self.destination, self.renderer)
         self.undo_move_button = Button(985, 790, "Undo Move",
                                        ButtonFunctionality.undo_move,
-                                       [game], self.destination)
+                                       [game], self.destination, self.renderer)
         self.save_log_button = Button(1095, 790, "Save Log",
                                       ButtonFunctionality.save_log,
-                                      [game], self.destination)
+                                      [game], self.destination, self.renderer)
 
         self.display_back_ground()
 
@@ -83,9 +79,10 @@ class GameTerminal:
         :return: None
         """
 
-        pygame.draw.rect(self.destination, Colors['GRAY'],
-                         [self.top_x, self.top_y,
-                          self.width, self.height])
+        self.renderer.mark_dirty(
+            pygame.draw.rect(self.destination, Colors['GRAY'],
+                             [self.top_x, self.top_y,
+                              self.width, self.height]))
 
         pygame.draw.rect(self.destination, Colors['BLACK'],
                          [self.top_x + 122, self.top_y + 19, 150, 40], 2)
@@ -98,7 +95,6 @@ class GameTerminal:
                                        self.top_y + 20, "Game Log")
 
         self.display_menu()
-        pygame.display.update()
 
     def print_moves(self) -> None:
         """
@@ -145,30 +141,20 @@ class GameTerminal:
                                                 self.top_y + 60 + 10 * (i + 1),
                                                 self.move_stack_right[i + 1])
 
-    def add_move_to_print(self, move):
+    def add_move_to_print(self, san: str) -> None:
         """ This function responsible for logging the objects on the screen.
-        :param: move, Move object that represents the move that should be logged
+        :param san: str, the move that should be logged, in SAN (see
+        GameRecorder).
         """
 
         if len(self.move_stack_left) == 30:
-            self.move_stack_right.append(self.convert_move_to_message(move))
+            self.move_stack_right.append(san)
         else:
-            self.move_stack_left.append(self.convert_move_to_message(move))
+            self.move_stack_left.append(san)
 
         # self.print_moves()
         self.reset_terminal()
 
-    def convert_move_to_message(self, move) -> None:
-        """ This function is helper function that translates the move to message
-        to be printed on the screen.
-        :param move: Move, the move to be printed on the screen.
-        :return: None
-        """
-        piece_letter = self.piece_letter[move['from_piece']]
-        eating = 'x' if move['to_piece'] != Pieces.NONE else ''
-        target_cell = self.cols[move['to_col']] + self.rows[move['to_row']]
-        return piece_letter + eating + target_cell
-
     def display_menu(self) -> None:
         """
         This function responsible to show the terminal buttons on the terminal
@@ -216,6 +202,7 @@ class GameTerminal:
         self.display_back_ground()
         self.display_menu()
         self.print_moves()
+        self.display_search_stats()
 
     def undo_all_moves(self) -> None:
         """
@@ -226,6 +213,76 @@ class GameTerminal:
         self.move_stack_left = []
         self.move_stack_right = []
 
+    def update_search_stats(self, stats: SearchStats, nodes: int = None,
+                            seconds: float = None) -> None:
+        """
+        This function sets the lines of the search statistics overlay, and
+        shows them if the overlay is shown.
+        :param stats: SearchStats, the statistics of the search of the
+        computer.
+        :param nodes: int, the nodes of a search that still runs, since the
+        statistics count them only at the end of each iteration. None for the
+        nodes of the statistics.
+        :param seconds: float, the seconds of a search that still runs, or
+        None for the seconds of the statistics.
+        :return: None
+        """
+        nodes = stats.nodes if nodes is None else nodes
+        seconds = stats.seconds if seconds is None else seconds
+        if stats.book_move:
+            state = 'opening book move'
+        elif stats.finished:
+            state = 'done'
+        else:
+            state = 'thinking...'
+        branching_factor = stats.get_branching_factor()
+        hit_rate = stats.get_tt_hit_rate()
+        self.search_stats_lines = [
+            'Search: {}'.format(state),
+            'Depth {}   Seldepth {}'.format(stats.depth, stats.seldepth),
+            'Nodes {:,}   NPS {:,.0f}'.format(
+                nodes, stats.get_nps(nodes, seconds)),
+            'Time {:.2f}s   EBF {}'.format(
+                seconds, '-' if branching_factor is None else
+                '{:.1f}'.format(branching_factor)),
+            'TT hits {}   TB hits {}'.format(
+                '-' if hit_rate is None else '{:.1%}'.format(hit_rate),
+                stats.tablebase_hits),
+            'Score {}'.format('-' if stats.score is None else
+                              '{:+.2f}'.format(stats.score / 100)),
+            'PV {}'.format(stats.get_pv_text(6)),
+            'Iterations {}'.format(' '.join(
+                '{:.2f}'.format(iteration.seconds)
+                for iteration in stats.iterations[-5:]))
+        ]
+        self.display_search_stats()
+
+    def toggle_search_stats(self) -> None:
+        """
+        This function shows the search statistics overlay, or hides it.
+        :return: None
+        """
+        self.show_search_stats = not self.show_search_stats
+        self.display_search_stats()
+
+    def display_search_stats(self) -> None:
+        """
+        This function draws the search statistics overlay, or clears its
+        place when it is hidden.
+        :return: None
+        """
+        self.renderer.mark_dirty(
+            pygame.draw.rect(self.destination, Colors['GRAY'],
+                             self.search_stats_rect))
+        if not self.show_search_stats:
+            return
+        pygame.draw.rect(self.destination, Colors['BLACK'],
+                         self.search_stats_rect, 1)
+        for index, line in enumerate(self.search_stats_lines):
+            self.stats_text.display_message(self.search_stats_rect.x + 8,
+                                            self.search_stats_rect.y + 5 +
+                                            22 * index, line)
+
     def display_win_message(self, winner = 'User'):
         msg = "Game is over! {} won the game.".format(winner)
         self.moves_text.display_message(103 * 8, 103 * 7 + 35, msg)
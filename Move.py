@@ -10,8 +10,16 @@ class Move:
     on board to where the piece should be moved. The third, is the piece that is
     been moved, and the fourth is the pieced that was eaten as result of the
     move.
+
+    The search creates and compares millions of moves, so the class is kept
+    small: its fields live in slots (no dictionary per object), they are read as
+    plain attributes, like move.to_row, and the comparison of two moves does
+    not allocate anything.
     """
 
+    __slots__ = ('from_row', 'from_col', 'to_row', 'to_col',
+                 'from_piece', 'to_piece')
+
     def __init__(self, from_row, from_col, to_row,
                  to_col, from_piece, to_piece):
         """
@@ -23,39 +31,48 @@ class Move:
         :param from_piece:  the piece tht should be moved.
         :param to_piece: the piece that was eaten as a result of the move.
         """
-        self.__from_row = from_row
-        self.__from_col = from_col
-        self.__to_row = to_row
-        self.__to_col = to_col
-        self.__from_piece = from_piece
-        self.__to_piece = to_piece
+        self.from_row = from_row
+        self.from_col = from_col
+        self.to_row = to_row
+        self.to_col = to_col
+        self.from_piece = from_piece
+        self.to_piece = to_piece
 
     def get_from_cell(self) -> List[int]:
         """
         :return: this function return list of form [row, col] that describes the
         initial board coordinates of the piece.
         """
-        return [self.__from_row, self.__from_col]
+        return [self.from_row, self.from_col]
 
     def get_to_cell(self) -> List[int]:
         """
         :return: this function return list of form [row, col] that describes the
         target board coordinates of the piece.
         """
-        return [self.__to_row, self.__to_col]
+        return [self.to_row, self.to_col]
 
     def get_from_piece(self):
         """
         :return: this function returns the piece that is moved in the move.
         """
-        return self.__from_piece
+        return self.from_piece
 
     def get_to_piece(self):
         """
         :return: this function returns the piece that was eaten as result of the
         move.
         """
-        return self.__to_piece
+        return self.to_piece
+
+    def pack(self) -> int:
+        """
+        :return: int, the move packed into 12 bits, 6 bits for the initial cell
+        and 6 bits for the target cell. The pieces are not packed, since they
+        are known from the position the move is played in.
+        """
+        return ((self.from_row << 3 | self.from_col) << 6) | \
+            (self.to_row << 3 | self.to_col)
 
     def __getitem__(self, key):
         """
@@ -64,30 +81,25 @@ class Move:
         'to_row', 'to_col', 'from_piece', 'to_piece'}
         :return: returns the required information.
         """
-        if key == 'from_row':
-            return self.__from_row
-        elif key == 'from_col':
-            return self.__from_col
-        elif key == 'to_row':
-            return self.__to_row
-        elif key == 'to_col':
-            return self.__to_col
-        elif key == 'from_piece':
-            return self.__from_piece
-        elif key == 'to_piece':
-            return self.__to_piece
+        if key in Move.__slots__:
+            return getattr(self, key)
         return None
 
     def __repr__(self):
         return str(self)
 
     def __str__(self):
-        return '{ From: ' + self.__from_piece + \
+        return '{ From: ' + self.from_piece + \
                ' at ' + str(self.get_from_cell()) + ' | ' + \
-               'To: ' + self.__to_piece + ' at ' + str(self.get_to_cell()) + '}'
+               'To: ' + self.to_piece + ' at ' + str(self.get_to_cell()) + '}'
 
     def __eq__(self, other):
-        return self.get_from_cell() == other.get_from_cell() and \
-               self.get_to_cell() == other.get_to_cell() and \
-               self.get_from_piece() == other.get_from_piece() and \
-               self.get_to_piece() == other.get_to_piece()
+        return self.from_row == other.from_row and \
+               self.from_col == other.from_col and \
+               self.to_row == other.to_row and \
+               self.to_col == other.to_col and \
+               self.from_piece == other.from_piece and \
+               self.to_piece == other.to_piece
+
+    def __hash__(self):
+        return self.pack()
@@ -0,0 +1,177 @@
+from Board import Board
+from Evaluation import Evaluation
+from Move import Move
+from Pieces import Pieces
+from TranspositionTable import TranspositionTable
+from typing import Dict, List
+
+
+class MoveOrdering:
+    """
+    This class sorts the moves of a node of the search, such that the moves
+    that are most likely to be the best are searched first. The alpha-beta
+    algorithm cuts off the rest of the moves of a node as soon as it finds a
+    move that is good enough, so the sooner it finds such a move, the fewer
+    nodes it searches.
+
+    The moves are searched in this order:
+
+        1. The best move of the earlier search of the position, from the
+           transposition table.
+        2. Captures, the most valuable victim first, and for the same victim
+           the least valuable attacker first ("MVV-LVA").
+        3. Killer moves: quiet moves that caused a cutoff in another node of
+           the same ply. A move that refutes one position often refutes its
+           siblings too.
+        4. The rest of the quiet moves, by their history score: how many
+           cutoffs (weighted by the depth) the same piece moving to the same
+           cell caused anywhere in the tree.
+
+    The class also counts how many of the cutoffs were caused by the first
+    move of the node, which is the measure of the quality of the ordering.
+    """
+
+    # The deepest ply that has killer moves.
+    MAX_PLY = 64
+
+    # The number of killer moves of each ply.
+    KILLERS = 2
+
+    # The sort scores of the groups of moves. The history scores are kept
+    # below HISTORY_LIMIT, so the groups never mix.
+    HASH_MOVE_SCORE = 1 << 30
+    CAPTURE_SCORE = 1 << 28
+    KILLER_SCORE = 1 << 26
+    HISTORY_LIMIT = 1 << 24
+
+    # The rank of each piece type for MVV-LVA.
+    PIECE_RANKS = {'P': 1, 'N': 2, 'B': 3, 'R': 4, 'Q': 5, 'K': 6}
+
+    # CAPTURE_SCORES[victim][attacker] is the sort score of the capture of the
+    # victim by the attacker. It is filled by _build_capture_scores.
+    CAPTURE_SCORES = {}  # type: Dict[str, Dict[str, int]]
+
+    def __init__(self):
+        """ Default c'tor. """
+        # The killer moves (packed, see Move.pack) of each ply, the newest
+        # first.
+        self.killers = [[TranspositionTable.NO_MOVE] * MoveOrdering.KILLERS
+                        for _ in range(0, MoveOrdering.MAX_PLY)]
+
+        # The history score of each piece and target cell, indexed by
+        # 64 * Board.PIECE_CODES[piece] + 8 * row + col.
+        self.history = [0] * (64 * len(Pieces.get_piece_codes()))
+
+        # Statistics of the cutoffs of the current search.
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self) -> None:
+        """
+        This function prepares the ordering for a new search. The killer moves
+        belong to the positions of the last search, so they are cleared, while
+        the history scores are only halved, since they are still useful.
+        :return: None
+        """
+        for killers in self.killers:
+            for index in range(0, MoveOrdering.KILLERS):
+                killers[index] = TranspositionTable.NO_MOVE
+        self.__age_history()
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def __age_history(self) -> None:
+        """
+        This function halves all history scores.
+        :return: None
+        """
+        self.history = [score >> 1 for score in self.history]
+
+    def order_moves(self, moves: List[Move], ply: int,
+                    hash_move: int = TranspositionTable.NO_MOVE) -> None:
+        """
+        This function sorts the moves of a node in place, the most promising
+        move first.
+        :param moves: List[Move], the moves of the node.
+        :param ply: int, the distance of the node from the root.
+        :param hash_move: int, the packed best move of the node from the
+        transposition table, or TranspositionTable.NO_MOVE.
+        :return: None
+        """
+        killers = self.killers[ply] if ply < MoveOrdering.MAX_PLY else ()
+        history = self.history
+        codes = Board.PIECE_CODES
+        capture_scores = MoveOrdering.CAPTURE_SCORES
+
+        def sort_score(move: Move) -> int:
+            packed = move.pack()
+            if packed == hash_move:
+                return MoveOrdering.HASH_MOVE_SCORE
+            if move.to_piece != Pieces.NONE:
+                return capture_scores[move.to_piece][move.from_piece]
+            if packed in killers:
+                return MoveOrdering.KILLER_SCORE - killers.index(packed)
+            return history[64 * codes[move.from_piece] + (packed & 63)]
+
+        moves.sort(key=sort_score, reverse=True)
+
+    def record_cutoff(self, move: Move, ply: int, tree_depth: int,
+                      move_number: int) -> None:
+        """
+        This function learns from a move that caused a cutoff. If the move is
+        quiet, it becomes a killer move of its ply and its history score
+        grows.
+        :param move: Move, the move that caused the cutoff.
+        :param ply: int, the distance of the node from the root.
+        :param tree_depth: int, the remaining tree depth of the node.
+        :param move_number: int, the index of the move in the ordered moves of
+        the node.
+        :return: None
+        """
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+        if move.to_piece != Pieces.NONE:
+            return
+
+        packed = move.pack()
+        if ply < MoveOrdering.MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != packed:
+                killers.pop()
+                killers.insert(0, packed)
+
+        index = 64 * Board.PIECE_CODES[move.from_piece] + (packed & 63)
+        self.history[index] += (tree_depth + 1) * (tree_depth + 1)
+        if self.history[index] >= MoveOrdering.HISTORY_LIMIT:
+            self.__age_history()
+
+    def get_statistics(self) -> dict:
+        """
+        :return: dictionary with the number of cutoffs of the current search,
+        the number of them that were caused by the first move of the node, and
+        their ratio. A good ordering causes more than 90% of the cutoffs with
+        the first move.
+        """
+        return {
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoffs / self.cutoffs
+            if self.cutoffs else 0.0
+        }
+
+
+def _build_capture_scores() -> None:
+    """
+    Fills MoveOrdering.CAPTURE_SCORES.
+    """
+    for victim, victim_type in Evaluation.PIECE_TYPES.items():
+        MoveOrdering.CAPTURE_SCORES[victim] = {}
+        for attacker, attacker_type in Evaluation.PIECE_TYPES.items():
+            MoveOrdering.CAPTURE_SCORES[victim][attacker] = \
+                MoveOrdering.CAPTURE_SCORE + \
+                8 * MoveOrdering.PIECE_RANKS[victim_type] - \
+                MoveOrdering.PIECE_RANKS[attacker_type]
+
+
+_build_capture_scores()
@@ -0,0 +1,206 @@
+import argparse
+import mmap
+import os
+import struct
+from random import randint
+from typing import Dict, List, Tuple
+from BitBoard import BitBoard
+from Board import Board
+from Move import Move
+from PGN import read_games, parse_san
+
+
+class OpeningBook:
+    """
+    This class is a book of opening moves: for positions of the opening, the
+    moves that strong players played in them, each with a weight (the number of
+    games it was played in).
+
+    The book is a binary file of fixed-width records, sorted by the Zobrist key
+    of the position (see Zobrist), and then by the move:
+
+        key (8 bytes) | packed move (2 bytes, see Move.pack) | weight (2 bytes)
+
+    The file is mapped into memory with mmap and is never parsed: a lookup is a
+    binary search over the records, that reads only the records it visits. So
+    opening a book of any size is instant.
+
+    Note that the keys depend on the random keys of Zobrist, so a book must be
+    built again if Zobrist.SEED changes.
+    """
+
+    MAGIC = b'CHESSBK1'
+    HEADER = struct.Struct('>8sQ')  # Magic and number of records.
+    RECORD = struct.Struct('>QHH')  # Key, packed move and weight.
+
+    def __init__(self, path: str):
+        """
+        Default c'tor. It opens the book file.
+        :param path: str, the path of the book file.
+        :raises ValueError: if the file is not an opening book.
+        """
+        self.path = path
+        self.__file = open(path, 'rb')
+        # The file must have the header and whole records, or it can not be
+        # mapped and read (an empty file can not be mapped at all).
+        size = os.fstat(self.__file.fileno()).st_size
+        if size < OpeningBook.HEADER.size or \
+                (size - OpeningBook.HEADER.size) % OpeningBook.RECORD.size:
+            self.__file.close()
+            raise ValueError('{} is not an opening book.'.format(path))
+        self.__data = mmap.mmap(self.__file.fileno(), 0,
+                                access=mmap.ACCESS_READ)
+        magic, self.records = OpeningBook.HEADER.unpack_from(self.__data, 0)
+        if magic != OpeningBook.MAGIC or \
+                size != OpeningBook.HEADER.size + \
+                self.records * OpeningBook.RECORD.size:
+            self.close()
+            raise ValueError('{} is not an opening book.'.format(path))
+
+    def close(self) -> None:
+        """
+        This function closes the book file.
+        :return: None
+        """
+        self.__data.close()
+        self.__file.close()
+
+    def __key_at(self, index: int) -> int:
+        """
+        :param index: int, the index of a record.
+        :return: int, the key of the record.
+        """
+        return OpeningBook.RECORD.unpack_from(
+            self.__data,
+            OpeningBook.HEADER.size + index * OpeningBook.RECORD.size)[0]
+
+    def lookup(self, key: int) -> List[Tuple[int, int]]:
+        """
+        This function finds the moves of a position in the book.
+        :param key: int, the Zobrist key of the position.
+        :return: list of the packed moves (see Move.pack) of the position, with
+        their weights. The list is empty if the position is not in the book.
+        """
+        low, high = 0, self.records
+        while low < high:
+            middle = (low + high) // 2
+            if self.__key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        moves = []
+        for index in range(low, self.records):
+            record_key, packed_move, weight = OpeningBook.RECORD.unpack_from(
+                self.__data,
+                OpeningBook.HEADER.size + index * OpeningBook.RECORD.size)
+            if record_key != key:
+                break
+            moves.append((packed_move, weight))
+        return moves
+
+    def get_move(self, board: Board) -> Move:
+        """
+        This function picks a book move for the side to move of the board.
+        The moves are picked at random, in proportion to their weights, so the
+        computer does not play the same opening in every game.
+        :param board: Board, the position.
+        :return: Move, the book move, or None if the position is not in the
+        book.
+        """
+        book_moves = self.lookup(board.zobrist_key)
+        if not book_moves:
+            return None
+        moves = {move.pack(): move
+                 for move in board.get_all_moves(board.side_to_move)}
+        book_moves = [(packed_move, weight) for packed_move, weight
+                      in book_moves if packed_move in moves]
+        if not book_moves:
+            return None
+
+        choice = randint(1, sum(weight for _, weight in book_moves))
+        for packed_move, weight in book_moves:
+            choice -= weight
+            if choice <= 0:
+                return moves[packed_move]
+        return None
+
+    @staticmethod
+    def build(pgn_paths: List[str], book_path: str, max_plies: int = 20,
+              min_games: int = 1) -> int:
+        """
+        This function builds a book from PGN files. Every move of the first
+        max_plies moves of every game is added to the book. A game is read
+        until its first move that is not a move of this game, like castling.
+        :param pgn_paths: List[str], the PGN files, or directories of PGN
+        files.
+        :param book_path: str, the path of the book file to write.
+        :param max_plies: int, the number of moves of each game to add.
+        :param min_games: int, the number of games a move must be played in to
+        get into the book.
+        :return: int, the number of records of the book.
+        """
+        counts = {}  # type: Dict[Tuple[int, int], int]
+        board = BitBoard.default_ctor()
+        start = board.get_snapshot()
+        for pgn_path in _pgn_files(pgn_paths):
+            with open(pgn_path, encoding='utf-8', errors='replace') as pgn_file:
+                for headers, moves in read_games(pgn_file):
+                    if 'FEN' in headers:
+                        continue
+                    board.load_snapshot(start)
+                    for san in moves[:max_plies]:
+                        try:
+                            move = parse_san(board, san)
+                        except ValueError:
+                            break
+                        record = (board.zobrist_key, move.pack())
+                        counts[record] = counts.get(record, 0) + 1
+                        if board.move_piece(move):
+                            break
+
+        records = sorted((key, packed_move, min(count, 0xFFFF))
+                         for (key, packed_move), count in counts.items()
+                         if count >= min_games)
+        with open(book_path, 'wb') as book_file:
+            book_file.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC,
+                                                    len(records)))
+            for record in records:
+                book_file.write(OpeningBook.RECORD.pack(*record))
+        return len(records)
+
+
+def _pgn_files(paths: List[str]) -> List[str]:
+    """
+    :param paths: List[str], PGN files or directories of PGN files.
+    :return: List[str], the PGN files, in a stable order.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name)
+                            for name in os.listdir(path)
+                            if name.lower().endswith('.pgn'))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build an opening book from PGN files.')
+    parser.add_argument('pgn', nargs='+',
+                        help='PGN files, or directories of PGN files')
+    parser.add_argument('--output', default='opening_book.bin')
+    parser.add_argument('--plies', type=int, default=20,
+                        help='the number of moves of each game to add')
+    parser.add_argument('--min-games', type=int, default=1,
+                        help='the number of games a move must be played in')
+    args = parser.parse_args()
+    records = OpeningBook.build(args.pgn, args.output, args.plies,
+                                args.min_games)
+    print('{} records written to {}'.format(records, args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+import re
+from typing import Dict, Iterator, List, TextIO, Tuple
+from Board import Board, START_FEN
+from Consts import Colors
+from Evaluation import Evaluation
+from Move import Move
+from Pieces import Pieces
+
+# PGN (Portable Game Notation) is the standard text format of chess games.
+# Each game has headers, like [White "Morphy"], and then its moves in SAN
+# (Standard Algebraic Notation), like "1. e4 e5 2. Nf3 Nc6 ...".
+
+FILES = 'abcdefgh'
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+# The Seven Tag Roster: the headers that every PGN game has, in this order.
+SEVEN_TAG_ROSTER = ('Event', 'Site', 'Date', 'Round', 'White', 'Black',
+                    'Result')
+
+# The movetext lines are wrapped at this width, as the standard asks.
+LINE_WIDTH = 79
+
+# A header line, which may end with a ";" comment. The value is a quoted
+# string, with \" and \\ escapes, so a ";" in it is not a comment.
+_HEADER_PATTERN = re.compile(r'^\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]\s*(?:;.*)?$')
+_MOVE_NUMBER_PATTERN = re.compile(r'^\d+\.+')
+_SAN_PATTERN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])$')
+
+# The piece of each color and SAN letter, like (white, 'N') -> white horse.
+_PIECES = {(Pieces.get_piece_color(piece), piece_type): piece
+           for piece, piece_type in Evaluation.PIECE_TYPES.items()}
+
+
+def _movetext_tokens(movetext: str) -> List[str]:
+    """
+    This function splits the movetext of a game into its tokens, without the
+    comments, variations, annotations and move numbers. A comment is either in
+    braces, or from a ";" to the end of its line, and a ";" or a brace inside
+    a comment of the other kind is part of the comment.
+    :param movetext: str, the movetext of the game, with its line breaks.
+    :return: List[str], the moves of the game and its result.
+    """
+    # Most games have no comments and no variations, and their movetext is
+    # split as it is.
+    if '{' in movetext or '(' in movetext or ';' in movetext:
+        text = []
+        depth = 0
+        in_comment = False
+        in_line_comment = False
+        for char in movetext:
+            if in_comment:
+                in_comment = char != '}'
+            elif in_line_comment:
+                in_line_comment = char != '\n'
+            elif char == '{':
+                in_comment = True
+            elif char == ';':
+                in_line_comment = True
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif depth == 0:
+                text.append(char)
+        movetext = ''.join(text)
+
+    tokens = []
+    for token in movetext.split():
+        token = _MOVE_NUMBER_PATTERN.sub('', token)
+        if token and not token.startswith('$'):
+            tokens.append(token)
+    return tokens
+
+
+def read_games(pgn_file: TextIO) \
+        -> Iterator[Tuple[Dict[str, str], List[str]]]:
+    """
+    This function reads the games of a PGN file one by one, so a file of any
+    size can be read with little memory.
+    :param pgn_file: the open PGN file.
+    :return: iterator over the games, each one is a tuple of its headers and
+    its moves in SAN (without the result).
+    """
+    headers = {}  # type: Dict[str, str]
+    movetext = []  # type: List[str]
+    for line in pgn_file:
+        line = line.strip()
+        if line.startswith('%'):
+            continue
+        header = _HEADER_PATTERN.match(line)
+        if header:
+            if movetext:
+                yield headers, _game_moves(movetext)
+                headers, movetext = {}, []
+            headers[header.group(1)] = header.group(2)
+        elif line:
+            movetext.append(line)
+    if headers or movetext:
+        yield headers, _game_moves(movetext)
+
+
+def _game_moves(movetext: List[str]) -> List[str]:
+    """
+    :param movetext: List[str], the lines of the movetext of a game.
+    :return: List[str], the moves of the game in SAN, without the result.
+    """
+    return [token for token in _movetext_tokens('\n'.join(movetext))
+            if token not in RESULTS]
+
+
+def _is_legal(board: Board, move: Move) -> bool:
+    """
+    This function checks that a move does not leave the king of the player
+    under attack. The board itself allows such moves (the game is won by
+    eating the king), but SAN names a move among the legal moves only.
+    :param board: Board, the position.
+    :param move: Move, the move to check.
+    :return: bool, whether the move is legal.
+    """
+    color = Pieces.get_piece_color(move.from_piece)
+    opponent = Colors['BLACK'] if color == Colors['WHITE'] else Colors['WHITE']
+    board.move_piece(move)
+    legal = all(capture.to_piece not in (Pieces.WHITE_KING, Pieces.BLACK_KING)
+                for capture in board.get_all_captures(opponent))
+    board.undo_move()
+    return legal
+
+
+def parse_san(board: Board, san: str) -> Move:
+    """
+    This function finds the move of the side to move of the board that the
+    SAN names, like 'e4', 'Nxf3' or 'Rad1'.
+    :param board: Board, the position.
+    :param san: str, the move in SAN.
+    :return: Move, the move.
+    :raises ValueError: if the SAN does not name a move of this game. Castling,
+    en passant and promotion are not moves of this game.
+    """
+    text = san.rstrip('+#!?')
+    match = _SAN_PATTERN.match(text)
+    if match is None:
+        raise ValueError('Unsupported move {!r}.'.format(san))
+    piece_type, from_file, from_rank, target = match.groups()
+    piece_type = piece_type or 'P'
+    to_col = FILES.index(target[0])
+    to_row = 8 - int(target[1])
+
+    candidates = []
+    for move in board.get_moves_to(to_row, to_col,
+                                   _PIECES[board.side_to_move, piece_type]):
+        if from_file is not None and move.from_col != FILES.index(from_file):
+            continue
+        if from_rank is not None and move.from_row != 8 - int(from_rank):
+            continue
+        candidates.append(move)
+    if len(candidates) > 1:
+        candidates = [move for move in candidates if _is_legal(board, move)]
+    if len(candidates) != 1:
+        raise ValueError('Move {!r} matches {} moves.'.format(
+            san, len(candidates)))
+    return candidates[0]
+
+
+def replay_games(pgn_file: TextIO, board: Board) \
+        -> Iterator[Tuple[Dict[str, str], List[str], List[Move]]]:
+    """
+    This function reads the games of a PGN file one by one, like read_games,
+    and plays each one of them on the board, from the position of its FEN
+    header or from the start position. A game is played until a king is
+    eaten, or until its first move that is not a move of this game, like
+    castling. Games with an invalid FEN header are skipped.
+
+    The same board is used for all the games, and it holds the last position
+    of a game while the game is yielded, with the moves of the game in its
+    move stack.
+    :param pgn_file: the open PGN file.
+    :param board: Board, the board to play the games on.
+    :return: iterator over the games, each one is a tuple of its headers, its
+    moves in SAN, and the moves that were played. A game was played to its
+    end if it has as many played moves as moves in SAN.
+    """
+    for headers, sans in read_games(pgn_file):
+        try:
+            board.load_fen(headers.get('FEN', START_FEN))
+        except ValueError:
+            continue
+        moves = []  # type: List[Move]
+        for san in sans:
+            try:
+                move = parse_san(board, san)
+            except ValueError:
+                break
+            moves.append(move)
+            if board.move_piece(move):
+                break
+        yield headers, sans, moves
+
+
+def _opponent(color):
+    """
+    :param color: a color of Colors.
+    :return: the other color.
+    """
+    return Colors['BLACK'] if color == Colors['WHITE'] else Colors['WHITE']
+
+
+def _attacks_king(board: Board, color) -> bool:
+    """
+    :param board: Board, the position.
+    :param color: the color of the attacking player.
+    :return: bool, whether the player of the color can eat the king of its
+    opponent.
+    """
+    return any(capture.to_piece in (Pieces.WHITE_KING, Pieces.BLACK_KING)
+               for capture in board.get_all_captures(color))
+
+
+def move_to_coordinates(move: Move) -> str:
+    """
+    :param move: Move, the move.
+    :return: str, the move in coordinate notation, like 'e2e4', the notation
+    of the UCI protocol.
+    """
+    return '{}{}{}{}'.format(FILES[move.from_col], 8 - move.from_row,
+                             FILES[move.to_col], 8 - move.to_row)
+
+
+def move_to_san(board: Board, move: Move) -> str:
+    """
+    This function names a move in SAN, like 'e4', 'Nxf3', 'Rad1' or 'Qh5+'.
+    The move must be a move of the side to move of the board, which is not
+    played yet.
+    :param board: Board, the position before the move.
+    :param move: Move, the move.
+    :return: str, the move in SAN.
+    """
+    piece_type = Evaluation.PIECE_TYPES[move.from_piece]
+    target = FILES[move.to_col] + str(8 - move.to_row)
+    capture = 'x' if move.to_piece != Pieces.NONE else ''
+    if piece_type == 'P':
+        san = (FILES[move.from_col] if capture else '') + capture + target
+    else:
+        # Other pieces of the same type that can move to the same cell.
+        others = [other for other in
+                  board.get_moves_to(move.to_row, move.to_col,
+                                     move.from_piece)
+                  if (other.from_row, other.from_col) !=
+                  (move.from_row, move.from_col)]
+        if len(others) > 1:
+            others = [other for other in others if _is_legal(board, other)]
+        origin = ''
+        if others:
+            if all(other.from_col != move.from_col for other in others):
+                origin = FILES[move.from_col]
+            elif all(other.from_row != move.from_row for other in others):
+                origin = str(8 - move.from_row)
+            else:
+                origin = FILES[move.from_col] + str(8 - move.from_row)
+        san = piece_type + origin + capture + target
+
+    color = Pieces.get_piece_color(move.from_piece)
+    if move.to_piece not in (Pieces.WHITE_KING, Pieces.BLACK_KING):
+        board.move_piece(move)
+        if _attacks_king(board, color):
+            san += '+'
+        board.undo_move()
+    return san
+
+
+def format_headers(headers: Dict[str, str]) -> str:
+    """
+    :param headers: dictionary of the headers of a game.
+    :return: str, the header lines of the game, the Seven Tag Roster first,
+    with '?' for the missing ones, and then the rest of the headers.
+    """
+    lines = ['[{} "{}"]'.format(name, headers.get(name, '?'))
+             for name in SEVEN_TAG_ROSTER]
+    lines += ['[{} "{}"]'.format(name, value)
+              for name, value in headers.items()
+              if name not in SEVEN_TAG_ROSTER]
+    return '\n'.join(lines) + '\n'
+
+
+def format_moves(moves: List[str], result: str) -> str:
+    """
+    :param moves: List[str], the moves of a game in SAN, from the start
+    position.
+    :param result: str, the result of the game, one of RESULTS.
+    :return: str, the movetext of the game, with move numbers, wrapped at
+    LINE_WIDTH.
+    """
+    tokens = []
+    for index, san in enumerate(moves):
+        if index % 2 == 0:
+            tokens.append('{}.'.format(index // 2 + 1))
+        tokens.append(san)
+    tokens.append(result)
+
+    lines = []
+    line = ''
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = line + ' ' + token if line else token
+    lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def write_game(pgn_file: TextIO, headers: Dict[str, str], moves: List[str],
+               result: str) -> None:
+    """
+    This function appends a game to a PGN file.
+    :param pgn_file: the open PGN file.
+    :param headers: dictionary of the headers of the game. The Result header
+    is set to the result.
+    :param moves: List[str], the moves of the game in SAN.
+    :param result: str, the result of the game, one of RESULTS.
+    :return: None
+    """
+    headers = dict(headers)
+    headers['Result'] = result
+    pgn_file.write(format_headers(headers) + '\n' +
+                   format_moves(moves, result) + '\n')
@@ -0,0 +1,239 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Tuple
+from Move import Move
+
+# The state of a worker process: its own computer player (with its own
+# transposition table) and its own board. They are created once per process by
+# _init_worker, and reused by all the tasks of that process.
+_worker_ai = None
+_worker_board = None
+
+
+def _init_worker(hash_size_mb: float, use_quiescence: bool,
+                 tablebases: str, batch_leaves: bool, stop_event) -> None:
+    """
+    The initializer of the worker processes.
+    :param hash_size_mb: float, the memory budget of the transposition table of
+    the worker in MB.
+    :param use_quiescence: bool, whether the worker uses the quiescence search.
+    :param tablebases: str, the directory of the endgame tables, or None.
+    :param batch_leaves: bool, whether the worker scores the leaves in
+    batches.
+    :param stop_event: multiprocessing.Event, the stop request that all the
+    workers of the pool share.
+    :return: None
+    """
+    global _worker_ai, _worker_board
+    from ComputerAI import ComputerAI
+    from BitBoard import BitBoard
+    _worker_ai = ComputerAI(0, hash_size_mb=hash_size_mb,
+                            use_quiescence=use_quiescence, opening_book=None,
+                            tablebases=tablebases, batch_leaves=batch_leaves)
+    _worker_ai.stop_event = stop_event
+    _worker_board = BitBoard.default_ctor()
+
+
+def _search_root_move(snapshot: bytes, packed_move: int, current_move_color,
+                      next_move_color, tree_depth: int, alpha: int, beta: int,
+                      is_min: bool, interruptible: bool, deadline: float,
+                      max_nodes: int) -> Tuple[int, int]:
+    """
+    The task of the worker processes. It plays one root move on the position
+    of the snapshot, and searches the position after it with the alpha-beta
+    algorithm.
+    :param snapshot: bytes, the snapshot of the root position.
+    :param packed_move: int, the root move, see Move.pack.
+    :param current_move_color: the color of the player to move at the root.
+    :param next_move_color: the color of the other player.
+    :param tree_depth: int, the tree depth of the root search.
+    :param alpha: int, the lower bound of the search window.
+    :param beta: int, the upper bound of the search window.
+    :param is_min: flag that determines whether the root minimizes.
+    :param interruptible: bool, whether the task may be stopped: by the stop
+    request of the pool, the deadline or the node limit.
+    :param deadline: float, the time.monotonic() deadline of the search, or
+    None.
+    :param max_nodes: int, the nodes that the task may search, or None.
+    :return: tuple of the score of the move (None if the task was stopped)
+    and the number of nodes searched.
+    """
+    from ComputerAI import SearchInterrupted
+    board = _worker_board
+    board.load_snapshot(snapshot)
+    move = None
+    for candidate in board.get_all_moves(current_move_color):
+        if candidate.pack() == packed_move:
+            move = candidate
+            break
+
+    _worker_ai.nodes = 0
+    _worker_ai.deadline = deadline
+    _worker_ai.max_nodes = max_nodes
+    _worker_ai.interruptible = interruptible
+    board.move_piece(move)
+    try:
+        if tree_depth == 0:
+            score = _worker_ai.leaf_score(board, next_move_color,
+                                          current_move_color, alpha, beta,
+                                          not is_min)
+        else:
+            score = _worker_ai.alpha_beta(board, next_move_color,
+                                          current_move_color, tree_depth - 1,
+                                          alpha, beta, not is_min)
+    except SearchInterrupted:
+        score = None
+    return score, _worker_ai.nodes
+
+
+class ParallelSearch:
+    """
+    This class searches the root moves of the tree in a pool of processes. The
+    threads of python cannot run python code in parallel (because of the GIL),
+    but processes can.
+
+    The root is split in the "young brothers wait" way: the first root move
+    (the best move of the previous iteration) is searched alone, with a full
+    window. Then all the other root moves are searched in parallel, with a
+    window that is open by one on the side of the score of the first move.
+    Like in ComputerAI.alpha_beta_algorithm, the moves that tie with the best
+    move get exact scores, so the list of best moves is the same as the list of
+    the sequential search.
+
+    The workers get the position as a snapshot of 65 bytes (see
+    Board.get_snapshot) and the move as a packed integer, instead of pickled
+    Board and Move objects.
+
+    The workers share a stop request (a multiprocessing.Event). It is set when
+    the search is stopped, or when a task runs out of time or nodes, so the
+    tasks that already run stop too, and the pool is idle when the next search
+    starts.
+    """
+
+    def __init__(self, workers: int, hash_size_mb: float,
+                 use_quiescence: bool = True, tablebases: str = None,
+                 batch_leaves: bool = False):
+        """
+        Default c'tor. The processes are started on the first search.
+        :param workers: int, the number of worker processes.
+        :param hash_size_mb: float, the memory budget of the transposition
+        table of each worker in MB.
+        :param use_quiescence: bool, whether the workers use the quiescence
+        search, see ComputerAI.
+        :param tablebases: str, the directory of the endgame tables of the
+        workers, or None.
+        :param batch_leaves: bool, whether the workers score the leaves in
+        batches, see ComputerAI.
+        """
+        self.workers = workers
+        self.hash_size_mb = hash_size_mb
+        self.use_quiescence = use_quiescence
+        self.tablebases = tablebases
+        self.batch_leaves = batch_leaves
+        self.__executor = None
+        self.__stop_event = None
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        """
+        :return: the pool of the worker processes, started on the first call.
+        """
+        if self.__executor is None:
+            self.__stop_event = multiprocessing.Event()
+            self.__executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.hash_size_mb, self.use_quiescence,
+                          self.tablebases, self.batch_leaves,
+                          self.__stop_event))
+        return self.__executor
+
+    def close(self) -> None:
+        """
+        This function stops the worker processes.
+        :return: None
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+    def __wait(self, computer_ai, futures: List) -> List[Tuple[int, int]]:
+        """
+        This function waits for the results of the tasks, while it watches the
+        stop request and the node limit of the computer player.
+        :param computer_ai: ComputerAI, the computer player that searches.
+        :param futures: the futures of the tasks.
+        :return: list of (score, nodes) of the tasks, in the order of futures.
+        :raises SearchInterrupted: if the search was stopped, or a task ran out
+        of time or nodes.
+        """
+        from ComputerAI import SearchInterrupted
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.05,
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                score, nodes = future.result()
+                computer_ai.nodes += nodes
+                if score is None:
+                    self.__stop_event.set()
+            if pending and computer_ai.interruptible and \
+                    (computer_ai.stop_event.is_set() or
+                     (computer_ai.max_nodes is not None and
+                      computer_ai.nodes >= computer_ai.max_nodes)):
+                self.__stop_event.set()
+            if self.__stop_event.is_set():
+                # The tasks that did not start are dropped, and the tasks that
+                # run stop at their next check of the stop request. They are
+                # waited for, so they do not hold up the next search.
+                for future in pending:
+                    future.cancel()
+                for future in wait(pending)[0]:
+                    if not future.cancelled():
+                        computer_ai.nodes += future.result()[1]
+                raise SearchInterrupted()
+        return [future.result() for future in futures]
+
+    def search_root(self, computer_ai, board, current_move_color,
+                    next_move_color, tree_depth: int, is_min: bool,
+                    moves: List[Move]) -> List[Tuple[Move, int]]:
+        """
+        This function searches the root moves in parallel. It has the same
+        result as ComputerAI.alpha_beta_algorithm.
+        :param computer_ai: ComputerAI, the computer player that searches.
+        :param board: Board, the root position.
+        :param current_move_color: the color of the player to move.
+        :param next_move_color: the color of the other player.
+        :param tree_depth: int, the tree depth to search.
+        :param is_min: flag that determines whether we minimize or maximize.
+        :param moves: List[Move], the root moves, the most promising first.
+        :return: list of the moves with their scores.
+        """
+        executor = self.__get_executor()
+        self.__stop_event.clear()
+        snapshot = board.get_snapshot()
+        interruptible = computer_ai.interruptible
+        infinity = computer_ai.INFINITY
+
+        def submit(move, alpha, beta):
+            # Each task may search the nodes that are left to the search.
+            max_nodes = None
+            if computer_ai.max_nodes is not None:
+                max_nodes = computer_ai.max_nodes - computer_ai.nodes
+            return executor.submit(_search_root_move, snapshot, move.pack(),
+                                   current_move_color, next_move_color,
+                                   tree_depth, alpha, beta, is_min,
+                                   interruptible, computer_ai.deadline,
+                                   max_nodes)
+
+        first_score = self.__wait(computer_ai,
+                                  [submit(moves[0], -infinity, infinity)])[0][0]
+        if is_min:
+            alpha, beta = -infinity, first_score + 1
+        else:
+            alpha, beta = first_score - 1, infinity
+        results = self.__wait(computer_ai, [submit(move, alpha, beta)
+                                            for move in moves[1:]])
+
+        scored_moves = [(moves[0], first_score)]
+        for move, (score, nodes) in zip(moves[1:], results):
+            scored_moves.append((move, score))
+        return scored_moves
@@ -0,0 +1,169 @@
+import argparse
+import json
+from time import perf_counter
+from typing import Dict
+from Board import Board
+from BitBoard import BitBoard
+from PGN import move_to_coordinates
+
+# The standard perft positions (https://www.chessprogramming.org/Perft_Results)
+# with the numbers of leaf nodes for depths 1, 2, 3, ...
+#
+# Note that the numbers are not the published ones: this game has no castling,
+# en passant or promotion, and a king may move into check (the game is won by
+# eating the king). The numbers were produced by the move generation of Board,
+# and they are here to catch changes in the move generation.
+POSITIONS = {
+    'start': {
+        'fen': 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w',
+        'nodes': [20, 400, 8902, 197742]
+    },
+    'kiwipete': {
+        'fen': 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w',
+        'nodes': [46, 1870, 87218]
+    },
+    'position3': {
+        'fen': '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w',
+        'nodes': [16, 276, 4820]
+    },
+    'position4': {
+        'fen': 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w',
+        'nodes': [38, 1549, 60977]
+    },
+    'position5': {
+        'fen': 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w',
+        'nodes': [40, 1394, 58044]
+    }
+}
+
+BACKENDS = {
+    'board': Board,
+    'bitboard': BitBoard
+}
+
+
+def perft(board: Board, depth: int) -> int:
+    """
+    This function counts the leaf nodes of the tree of all moves of the given
+    depth, starting with the side to move of the board.
+    :param board: Board, the position.
+    :param depth: int, the number of moves to play.
+    :return: int, the number of leaf nodes.
+    """
+    moves = board.get_all_moves(board.side_to_move)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.move_piece(move)
+        nodes += perft(board, depth - 1)
+        board.undo_move()
+    return nodes
+
+
+def divide(board: Board, depth: int) -> Dict[str, int]:
+    """
+    This function counts the leaf nodes under each one of the root moves.
+    :param board: Board, the position.
+    :param depth: int, the number of moves to play, including the root move.
+    :return: dictionary from the root moves (like 'e2e4') to their numbers of
+    leaf nodes.
+    """
+    result = {}
+    for move in board.get_all_moves(board.side_to_move):
+        board.move_piece(move)
+        nodes = perft(board, depth - 1) if depth > 1 else 1
+        board.undo_move()
+        result[move_to_coordinates(move)] = nodes
+    return result
+
+
+def run_suite(backend: str, max_depth: int, show_divide: bool = False):
+    """
+    This function runs perft on all the standard positions, and checks the
+    numbers of nodes against the expected ones.
+    :param backend: str, the name of the board class, see BACKENDS.
+    :param max_depth: int, the deepest depth to run.
+    :param show_divide: bool, whether to add the divide of the deepest depth.
+    :return: dictionary with the results, and whether all the numbers are
+    the expected ones.
+    """
+    results = []
+    passed = True
+    for name, position in POSITIONS.items():
+        board = BACKENDS[backend].default_ctor()
+        board.load_fen(position['fen'])
+        for depth in range(1, max_depth + 1):
+            start = perf_counter()
+            nodes = perft(board, depth)
+            elapsed = perf_counter() - start
+            expected = position['nodes'][depth - 1] \
+                if depth <= len(position['nodes']) else None
+            ok = expected is None or nodes == expected
+            passed = passed and ok
+            result = {
+                'position': name,
+                'depth': depth,
+                'nodes': nodes,
+                'expected': expected,
+                'ok': ok,
+                'seconds': elapsed,
+                'nps': nodes / elapsed if elapsed > 0 else 0.0
+            }
+            if show_divide and depth == max_depth:
+                result['divide'] = divide(board, depth)
+            results.append(result)
+            print('{:10s} depth {}  nodes {:10d}  {:>8s}  {:10.0f} nps'.format(
+                name, depth, nodes, 'ok' if ok else 'MISMATCH',
+                result['nps']))
+
+    total_nodes = sum(result['nodes'] for result in results)
+    total_seconds = sum(result['seconds'] for result in results)
+    return {
+        'backend': backend,
+        'max_depth': max_depth,
+        'passed': passed,
+        'total_nodes': total_nodes,
+        'total_seconds': total_seconds,
+        'nps': total_nodes / total_seconds if total_seconds > 0 else 0.0,
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Perft: count the leaf nodes of the move generation.')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--backend', choices=sorted(BACKENDS),
+                        default='bitboard')
+    parser.add_argument('--fen', help='run only this position')
+    parser.add_argument('--divide', action='store_true',
+                        help='show the nodes under each root move')
+    parser.add_argument('--json', help='write the results to this file')
+    args = parser.parse_args()
+
+    if args.fen:
+        board = BACKENDS[args.backend].default_ctor()
+        board.load_fen(args.fen)
+        start = perf_counter()
+        if args.divide:
+            for move, nodes in sorted(divide(board, args.depth).items()):
+                print('{}: {}'.format(move, nodes))
+        nodes = perft(board, args.depth)
+        elapsed = perf_counter() - start
+        print('nodes {}  {:.0f} nps'.format(nodes, nodes / elapsed))
+        return
+
+    report = run_suite(args.backend, args.depth, args.divide)
+    print('total {} nodes in {:.2f}s, {:.0f} nps, {}'.format(
+        report['total_nodes'], report['total_seconds'], report['nps'],
+        'passed' if report['passed'] else 'FAILED'))
+    if args.json:
+        with open(args.json, 'w') as json_file:
+            json.dump(report, json_file, indent=2)
+    if not report['passed']:
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,3 @@
-import pygame
 from Consts import Colors
 
 
@@ -36,12 +35,28 @@ class Pieces:
         ]
 
     @staticmethod
-    def load_pieces():
-        dic = {}
-        for piece in Pieces.get_list_of_pieces():
-            if piece != Pieces.NONE:
-                dic[piece] = pygame.image.load('./chess_pieces/' + piece)
-        return dic
+    def get_piece_codes():
+        """
+        This function returns the pieces ordered by their small integer codes,
+        such that the code of a piece is its index in the list. The codes are
+        used to store the board compactly, one byte per cell.
+        :return: list of the pieces, the empty cell first.
+        """
+        return [
+            Pieces.NONE,
+            Pieces.WHITE_PAWN,
+            Pieces.WHITE_HORSE,
+            Pieces.WHITE_BISHOP,
+            Pieces.WHITE_ROOK,
+            Pieces.WHITE_QUEEN,
+            Pieces.WHITE_KING,
+            Pieces.BLACK_PAWN,
+            Pieces.BLACK_HORSE,
+            Pieces.BLACK_BISHOP,
+            Pieces.BLACK_ROOK,
+            Pieces.BLACK_QUEEN,
+            Pieces.BLACK_KING
+        ]
 
     @staticmethod
     def get_piece_color(piece):
@@ -0,0 +1,69 @@
+import pygame
+from typing import List
+
+
+class Renderer:
+    """
+    This class collects the parts of the screen that were drawn during a frame
+    ("dirty rectangles"), and shows them all with one update of the display at
+    the end of the frame.
+
+    Updating the display copies the drawn pixels to the window, which is the
+    expensive part of drawing. The views (DisplayBoard, GameTerminal, Button
+    and TextHandler) only draw on the surface and mark what they drew, and the
+    game calls update() once per frame, so highlighting the moves of a piece
+    updates only their cells, once, instead of updating the whole window
+    after every cell.
+    """
+
+    # Above this number of rectangles, updating their bounding rectangle is
+    # cheaper than updating each of them.
+    MAX_RECTS = 32
+
+    def __init__(self):
+        """ Default c'tor. """
+        self.__dirty_rects = []  # type: List[pygame.Rect]
+
+        # Statistics: the number of display updates and of updated pixels.
+        self.updates = 0
+        self.updated_pixels = 0
+
+    def mark_dirty(self, rect) -> None:
+        """
+        This function marks a part of the screen as drawn. Pass the rectangle
+        that the drawing functions of pygame return, like pygame.draw.rect or
+        Surface.blit.
+        :param rect: pygame.Rect, or a list of [x, y, width, height].
+        :return: None
+        """
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        for dirty_rect in self.__dirty_rects:
+            if dirty_rect.contains(rect):
+                return
+        self.__dirty_rects = [dirty_rect for dirty_rect in self.__dirty_rects
+                              if not rect.contains(dirty_rect)]
+        self.__dirty_rects.append(rect)
+
+    def is_dirty(self) -> bool:
+        """
+        :return: bool, whether something was drawn since the last update.
+        """
+        return bool(self.__dirty_rects)
+
+    def update(self) -> None:
+        """
+        This function shows everything that was drawn since the last update,
+        with one update of the display.
+        :return: None
+        """
+        if not self.__dirty_rects:
+            return
+        rects = self.__dirty_rects
+        if len(rects) > Renderer.MAX_RECTS:
+            rects = [rects[0].unionall(rects[1:])]
+        pygame.display.update(rects)
+        self.updates += 1
+        self.updated_pixels += sum(rect.width * rect.height for rect in rects)
+        self.__dirty_rects = []
@@ -0,0 +1,184 @@
+from time import monotonic
+from typing import Dict, List
+from Move import Move
+from PGN import move_to_coordinates
+
+
+class IterationStats:
+    """
+    This class holds the statistics of one complete iteration of the
+    iterative deepening.
+    """
+
+    def __init__(self, depth: int, seldepth: int, nodes: int, seconds: float,
+                 score: int, pv: List[Move]):
+        """
+        Default c'tor.
+        :param depth: int, the number of plies of the iteration (the tree depth
+        plus one).
+        :param seldepth: int, the deepest ply that the search reached, with
+        the quiescence search.
+        :param nodes: int, the nodes of this iteration.
+        :param seconds: float, the seconds of this iteration.
+        :param score: int, the score of the best move, positive when white
+        leads.
+        :param pv: List[Move], the principal variation.
+        """
+        self.depth = depth
+        self.seldepth = seldepth
+        self.nodes = nodes
+        self.seconds = seconds
+        self.score = score
+        self.pv = pv
+
+    def to_dict(self) -> Dict:
+        """
+        :return: dictionary of the statistics, with the PV in coordinate
+        notation.
+        """
+        return {
+            'depth': self.depth,
+            'seldepth': self.seldepth,
+            'nodes': self.nodes,
+            'seconds': self.seconds,
+            'score': self.score,
+            'pv': [move_to_coordinates(move) for move in self.pv]
+        }
+
+
+class SearchStats:
+    """
+    This class holds the statistics of one search of the computer: the nodes
+    and the time, the depth that was reached, the principal variation (the
+    moves that both players are expected to play) and the hits of the caches,
+    and the same for each one of the iterations of the iterative deepening.
+
+    ComputerAI fills a new object for every search, and passes it to its
+    on_iteration callback after every complete iteration, and to its
+    on_search_end callback when the search ends. The callbacks run on the
+    thread of the search.
+    """
+
+    def __init__(self):
+        """ Default c'tor. The clock of the search starts here. """
+        self.start_time = monotonic()
+
+        # The totals of the search so far.
+        self.nodes = 0
+        self.seconds = 0.0
+
+        # The number of plies of the last complete iteration, the deepest ply
+        # that was reached, and the score and principal variation of the last
+        # complete iteration.
+        self.depth = 0
+        self.seldepth = 0
+        self.score = None  # type: int
+        self.pv = []  # type: List[Move]
+
+        self.iterations = []  # type: List[IterationStats]
+
+        # The probes and hits of the transposition table, and the positions
+        # that were scored by the endgame tables.
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tablebase_hits = 0
+
+        # Whether the move was taken from the opening book, without a search.
+        self.book_move = False
+
+        # Whether the search is over.
+        self.finished = False
+
+    def add_iteration(self, depth: int, seldepth: int, nodes: int,
+                      score: int, pv: List[Move]) -> IterationStats:
+        """
+        This function records a complete iteration.
+        :param depth: int, the number of plies of the iteration.
+        :param seldepth: int, the deepest ply that was reached so far.
+        :param nodes: int, the nodes of the search so far.
+        :param score: int, the score of the best move.
+        :param pv: List[Move], the principal variation.
+        :return: IterationStats, the statistics of the iteration.
+        """
+        seconds = monotonic() - self.start_time
+        iteration = IterationStats(depth, seldepth, nodes - self.nodes,
+                                   seconds - self.seconds, score, pv)
+        self.iterations.append(iteration)
+        self.depth = depth
+        self.seldepth = max(self.seldepth, seldepth)
+        self.nodes = nodes
+        self.seconds = seconds
+        self.score = score
+        self.pv = pv
+        return iteration
+
+    def finish(self, nodes: int) -> None:
+        """
+        This function records the end of the search.
+        :param nodes: int, the nodes of the whole search, with the nodes of an
+        iteration that did not complete.
+        :return: None
+        """
+        self.nodes = nodes
+        self.seconds = monotonic() - self.start_time
+        self.finished = True
+
+    def get_nps(self, nodes: int = None, seconds: float = None) -> float:
+        """
+        :param nodes: int, the nodes to count, the recorded nodes if None.
+        :param seconds: float, the seconds to count, the recorded seconds if
+        None.
+        :return: float, the nodes per second.
+        """
+        nodes = self.nodes if nodes is None else nodes
+        seconds = self.seconds if seconds is None else seconds
+        return nodes / seconds if seconds > 0 else 0.0
+
+    def get_branching_factor(self) -> float:
+        """
+        :return: float, the effective branching factor: how many times more
+        nodes the last iteration searched than the one before it, or None if
+        there are less than two iterations.
+        """
+        if len(self.iterations) < 2 or self.iterations[-2].nodes == 0:
+            return None
+        return self.iterations[-1].nodes / self.iterations[-2].nodes
+
+    def get_tt_hit_rate(self) -> float:
+        """
+        :return: float, the part of the probes of the transposition table that
+        found their position, or None if there were no probes.
+        """
+        return self.tt_hits / self.tt_probes if self.tt_probes else None
+
+    def get_pv_text(self, max_moves: int = None) -> str:
+        """
+        :param max_moves: int, the number of moves to show, all if None.
+        :return: str, the principal variation in coordinate notation, like
+        'e2e4 e7e5 g1f3'.
+        """
+        return ' '.join(move_to_coordinates(move)
+                        for move in self.pv[:max_moves])
+
+    def to_dict(self) -> Dict:
+        """
+        :return: dictionary of the statistics, for logs and reports.
+        """
+        return {
+            'nodes': self.nodes,
+            'seconds': self.seconds,
+            'nps': self.get_nps(),
+            'depth': self.depth,
+            'seldepth': self.seldepth,
+            'score': self.score,
+            'pv': [move_to_coordinates(move) for move in self.pv],
+            'branching_factor': self.get_branching_factor(),
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'tt_hit_rate': self.get_tt_hit_rate(),
+            'tablebase_hits': self.tablebase_hits,
+            'book_move': self.book_move,
+            'finished': self.finished,
+            'iterations': [iteration.to_dict()
+                           for iteration in self.iterations]
+        }
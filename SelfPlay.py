@@ -0,0 +1,358 @@
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from time import perf_counter
+from typing import Dict, List, Tuple
+from Consts import Colors, SearchParameters
+from PGN import move_to_san, write_game
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The self-play runner plays the computer against itself, without a window,
+# in a pool of processes, and keeps the games for tuning the engine:
+#
+#     python3 SelfPlay.py --games 1000 --white-depth 2 --black-depth 2 \
+#         --pgn selfplay.pgn --shards positions/
+#
+# Every finished game is appended to the PGN file. A sample of the positions
+# of the games is written, with the results of their games, to NumPy shards
+# (see PositionWriter), which can be memory-mapped for offline use.
+
+# The results of a game from the point of view of white, as they are stored
+# in the shards.
+RESULT_VALUES = {'1-0': 1, '0-1': -1, '1/2-1/2': 0}
+
+# The state of a worker process: a computer player for each color. They are
+# created once per process by _init_worker, and reused by all of its games.
+_worker_players = None
+_worker_settings = None
+
+
+def _profile(depth: int, time_limit: float) -> Dict:
+    """
+    :param depth: int, the deepest tree depth of the moves of a side.
+    :param time_limit: float, the seconds of each move of the side, or None.
+    :return: dictionary, the search profile of the side, like the profiles of
+    Difficulties in Consts.py.
+    """
+    return {'DEPTH': depth, 'TIME_LIMIT': time_limit, 'NODE_LIMIT': None}
+
+
+def _init_worker(white_profile: Dict, black_profile: Dict, settings: Dict) \
+        -> None:
+    """
+    The initializer of the worker processes.
+    :param white_profile: dictionary, the search profile of white.
+    :param black_profile: dictionary, the search profile of black.
+    :param settings: dictionary of the rest of the settings of the games, see
+    SelfPlay.
+    :return: None
+    """
+    global _worker_players, _worker_settings
+    from ComputerAI import ComputerAI
+    _worker_players = {
+        Colors['WHITE']: ComputerAI(white_profile,
+                                    computer_color=Colors['WHITE'],
+                                    user_color=Colors['BLACK'],
+                                    hash_size_mb=settings['hash_size_mb'],
+                                    workers=1,
+                                    opening_book=settings['opening_book']),
+        Colors['BLACK']: ComputerAI(black_profile,
+                                    computer_color=Colors['BLACK'],
+                                    user_color=Colors['WHITE'],
+                                    hash_size_mb=settings['hash_size_mb'],
+                                    workers=1,
+                                    opening_book=settings['opening_book'])
+    }
+    _worker_settings = settings
+
+
+def _play_game(seed: int) -> Tuple[List[str], str, List[bytes]]:
+    """
+    The task of the worker processes. It plays one game of the computer
+    against itself.
+
+    The first random_plies moves of the game are random, so the games do not
+    repeat each other. The game ends when a king is eaten, when the side to
+    move has no moves (it loses), when a position repeats three times (a
+    draw), or after max_plies moves (a draw).
+    :param seed: int, the seed of the random moves and of the random choice
+    between equally good moves.
+    :return: tuple of the moves of the game in SAN, its result, and the
+    snapshots (see Board.get_snapshot) of the sampled positions.
+    """
+    from BitBoard import BitBoard
+    settings = _worker_settings
+    random.seed(seed)
+    board = BitBoard.default_ctor()
+    for player in _worker_players.values():
+        player.transposition_table.clear()
+
+    moves = []  # type: List[str]
+    samples = []  # type: List[bytes]
+    repetitions = {board.zobrist_key: 1}
+    result = '1/2-1/2'
+    for ply in range(0, settings['max_plies']):
+        color = board.side_to_move
+        if ply < settings['random_plies']:
+            legal_moves = board.get_all_moves(color)
+            move = legal_moves[random.randrange(len(legal_moves))] \
+                if legal_moves else None
+        else:
+            move = _worker_players[color].computers_play(board)
+        if move is None:
+            result = '0-1' if color == Colors['WHITE'] else '1-0'
+            break
+
+        if ply >= settings['random_plies'] and \
+                random.random() < settings['sample_rate']:
+            samples.append(board.get_snapshot())
+        moves.append(move_to_san(board, move))
+        if board.move_piece(move):
+            result = '1-0' if color == Colors['WHITE'] else '0-1'
+            break
+
+        key = board.zobrist_key
+        repetitions[key] = repetitions.get(key, 0) + 1
+        if repetitions[key] >= 3:
+            break
+    return moves, result, samples
+
+
+class PositionWriter:
+    """
+    This class writes the sampled positions and the results of their games to
+    NumPy shards. Shard number n is two files:
+
+        positions_<n>.npy - uint8 array of shape (count, 65), the snapshot of
+                            each position (see Board.get_snapshot): the code
+                            of the piece on each cell, and the side to move.
+        results_<n>.npy   - int8 array of shape (count,), the result of the
+                            game of each position for white: 1, 0 or -1.
+
+    A shard is written once it has shard_size positions, and the last one when
+    the writer is closed. The shards can be opened with
+    numpy.load(path, mmap_mode='r').
+    """
+
+    def __init__(self, directory: str, shard_size: int):
+        """
+        Default c'tor.
+        :param directory: str, the directory of the shards. Existing shards
+        are kept, and the new ones are numbered after them.
+        :param shard_size: int, the number of positions of each shard.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.shards = len([name for name in os.listdir(directory)
+                           if name.startswith('positions_') and
+                           name.endswith('.npy')])
+        self.positions = 0
+        self.__snapshots = []  # type: List[bytes]
+        self.__results = []  # type: List[int]
+
+    def add(self, snapshots: List[bytes], result: str) -> None:
+        """
+        This function adds the sampled positions of a game.
+        :param snapshots: List[bytes], the snapshots of the positions.
+        :param result: str, the result of their game.
+        :return: None
+        """
+        for snapshot in snapshots:
+            self.__snapshots.append(snapshot)
+            self.__results.append(RESULT_VALUES[result])
+            if len(self.__snapshots) >= self.shard_size:
+                self.__write_shard()
+
+    def close(self) -> None:
+        """
+        This function writes the positions that are not written yet.
+        :return: None
+        """
+        if self.__snapshots:
+            self.__write_shard()
+
+    def __write_shard(self) -> None:
+        """
+        This function writes the collected positions as a new shard.
+        :return: None
+        """
+        positions = numpy.frombuffer(b''.join(self.__snapshots),
+                                     dtype=numpy.uint8).reshape(-1, 65)
+        results = numpy.array(self.__results, dtype=numpy.int8)
+        name = '{:05d}.npy'.format(self.shards)
+        numpy.save(os.path.join(self.directory, 'results_' + name), results)
+        # The positions file is written last, since its presence marks the
+        # shard as complete.
+        numpy.save(os.path.join(self.directory, 'positions_' + name),
+                   positions)
+        self.shards += 1
+        self.positions += len(self.__snapshots)
+        self.__snapshots = []
+        self.__results = []
+
+
+class SelfPlay:
+    """
+    This class runs games of the computer against itself in a pool of worker
+    processes, and collects the finished games as they come.
+    """
+
+    def __init__(self, white_profile: Dict, black_profile: Dict,
+                 workers: int = os.cpu_count() or 1, max_plies: int = 200,
+                 random_plies: int = 4, sample_rate: float = 0.1,
+                 hash_size_mb: float = SearchParameters['HASH_SIZE_MB'],
+                 opening_book: str = None):
+        """
+        Default c'tor.
+        :param white_profile: dictionary, the search profile of white, like
+        the profiles of Difficulties in Consts.py.
+        :param black_profile: dictionary, the search profile of black.
+        :param workers: int, the number of worker processes, each one plays
+        one game at a time.
+        :param max_plies: int, the number of moves after which a game is a
+        draw.
+        :param random_plies: int, the number of random moves at the start of
+        each game.
+        :param sample_rate: float, the part of the positions of the games
+        (after the random moves) that is sampled for the shards.
+        :param hash_size_mb: float, the memory budget of the transposition
+        table of each player in MB.
+        :param opening_book: str, the path of the opening book of the players,
+        or None.
+        """
+        self.white_profile = white_profile
+        self.black_profile = black_profile
+        self.workers = workers
+        self.settings = {
+            'max_plies': max_plies,
+            'random_plies': random_plies,
+            'sample_rate': sample_rate,
+            'hash_size_mb': hash_size_mb,
+            'opening_book': opening_book
+        }
+
+    def run(self, games: int, pgn_path: str, position_writer=None,
+            seed: int = 0) -> Dict:
+        """
+        This function plays the games, and appends each one to the PGN file as
+        soon as it is finished.
+        :param games: int, the number of games.
+        :param pgn_path: str, the path of the PGN file.
+        :param position_writer: PositionWriter, the writer of the sampled
+        positions, or None to drop them.
+        :param seed: int, the seed of the first game. Game n is played with
+        the seed seed + n, so a run can be repeated.
+        :return: dictionary with the number of games, the number of each
+        result, the seconds, and the games per hour per core.
+        """
+        results = dict.fromkeys(RESULT_VALUES, 0)
+        start = perf_counter()
+        with ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.white_profile, self.black_profile,
+                          self.settings)) as executor, \
+                open(pgn_path, 'a', encoding='utf-8') as pgn_file:
+            futures = {executor.submit(_play_game, seed + number): number
+                       for number in range(0, games)}
+            for future in as_completed(futures):
+                moves, result, samples = future.result()
+                results[result] += 1
+                write_game(pgn_file, self.__headers(futures[future]), moves,
+                           result)
+                pgn_file.flush()
+                if position_writer is not None:
+                    position_writer.add(samples, result)
+
+        seconds = perf_counter() - start
+        return {
+            'games': games,
+            'results': results,
+            'seconds': seconds,
+            'games_per_hour_per_core': games * 3600 / seconds / self.workers
+        }
+
+    def __headers(self, number: int) -> Dict[str, str]:
+        """
+        :param number: int, the number of the game in the run.
+        :return: dictionary of the PGN headers of the game.
+        """
+        return {
+            'Event': 'Self-play',
+            'Site': '?',
+            'Date': date.today().strftime('%Y.%m.%d'),
+            'Round': str(number + 1),
+            'White': _player_name(self.white_profile),
+            'Black': _player_name(self.black_profile)
+        }
+
+
+def _player_name(profile: Dict) -> str:
+    """
+    :param profile: dictionary, a search profile.
+    :return: str, the name of the player of the profile in the PGN headers.
+    """
+    name = 'ComputerAI depth {}'.format(profile['DEPTH'])
+    if profile['TIME_LIMIT'] is not None:
+        name += ' time {}s'.format(profile['TIME_LIMIT'])
+    return name
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Play the computer against itself.')
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--white-depth', type=int, default=1)
+    parser.add_argument('--black-depth', type=int, default=1)
+    parser.add_argument('--white-time', type=float, default=None,
+                        help='seconds per move of white')
+    parser.add_argument('--black-time', type=float, default=None,
+                        help='seconds per move of black')
+    parser.add_argument('--max-plies', type=int, default=200)
+    parser.add_argument('--random-plies', type=int, default=4,
+                        help='random moves at the start of each game')
+    parser.add_argument('--book', default=None,
+                        help='the opening book of the players')
+    parser.add_argument('--pgn', default='selfplay.pgn')
+    parser.add_argument('--shards', default=None,
+                        help='the directory of the position shards')
+    parser.add_argument('--shard-size', type=int, default=100000)
+    parser.add_argument('--sample-rate', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.shards is not None and numpy is None:
+        parser.error('--shards requires numpy')
+
+    self_play = SelfPlay(_profile(args.white_depth, args.white_time),
+                         _profile(args.black_depth, args.black_time),
+                         args.workers, args.max_plies, args.random_plies,
+                         args.sample_rate, opening_book=args.book)
+    position_writer = None
+    if args.shards is not None:
+        position_writer = PositionWriter(args.shards, args.shard_size)
+    try:
+        report = self_play.run(args.games, args.pgn, position_writer,
+                               args.seed)
+    finally:
+        if position_writer is not None:
+            position_writer.close()
+
+    print('{} games in {:.1f}s: {} white wins, {} black wins, {} draws'.format(
+        report['games'], report['seconds'], report['results']['1-0'],
+        report['results']['0-1'], report['results']['1/2-1/2']))
+    print('{:.0f} games/hour/core with {} workers'.format(
+        report['games_per_hour_per_core'], args.workers))
+    if position_writer is not None:
+        print('{} positions written to {}'.format(position_writer.positions,
+                                                   args.shards))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,670 @@
+import argparse
+import mmap
+import os
+import struct
+from itertools import product
+from typing import Dict, List, Tuple
+from Board import (Board, KNIGHT_TARGETS, KING_TARGETS, ROOK_RAYS,
+                   BISHOP_RAYS, QUEEN_RAYS)
+from Consts import Colors
+from Pieces import Pieces
+
+# A material set is written like 'KQvK': the white pieces, 'v', and the black
+# pieces, each side in the order of PIECE_ORDER. The pieces of a position of
+# the set are kept in the same order, so the white king is always the first
+# piece.
+PIECE_ORDER = 'KQRBNP'
+PIECE_VALUES = {'K': 0, 'Q': 9, 'R': 5, 'B': 3, 'N': 3, 'P': 1}
+PIECE_LETTERS = {
+    Pieces.WHITE_KING: 'K', Pieces.WHITE_QUEEN: 'Q', Pieces.WHITE_ROOK: 'R',
+    Pieces.WHITE_BISHOP: 'B', Pieces.WHITE_HORSE: 'N', Pieces.WHITE_PAWN: 'P',
+    Pieces.BLACK_KING: 'k', Pieces.BLACK_QUEEN: 'q', Pieces.BLACK_ROOK: 'r',
+    Pieces.BLACK_BISHOP: 'b', Pieces.BLACK_HORSE: 'n', Pieces.BLACK_PAWN: 'p'
+}
+
+# The targets of the pieces on each cell, as cell numbers (8 * row + col).
+_KNIGHT_SQUARES = [tuple(8 * row + col for row, col in targets)
+                   for targets in KNIGHT_TARGETS]
+_KING_SQUARES = [tuple(8 * row + col for row, col in targets)
+                 for targets in KING_TARGETS]
+_RAY_SQUARES = {
+    letter: [tuple(tuple(8 * row + col for row, col in ray) for ray in rays)
+             for rays in all_rays]
+    for letter, all_rays in (('R', ROOK_RAYS), ('B', BISHOP_RAYS),
+                             ('Q', QUEEN_RAYS))
+}
+
+
+def _square_map(function) -> Tuple[int, ...]:
+    """
+    :param function: function from (row, col) to (row, col).
+    :return: the map of the 64 cells by the function.
+    """
+    return tuple(8 * function(square >> 3, square & 7)[0] +
+                 function(square >> 3, square & 7)[1]
+                 for square in range(0, 64))
+
+
+# The symmetries of the board. Without pawns, all 8 rotations and reflections
+# keep the values of the positions, and with pawns only the reflection of the
+# files does.
+_SYMMETRIES = [
+    _square_map(lambda row, col: (row, col)),
+    _square_map(lambda row, col: (row, 7 - col)),
+    _square_map(lambda row, col: (7 - row, col)),
+    _square_map(lambda row, col: (7 - row, 7 - col)),
+    _square_map(lambda row, col: (col, row)),
+    _square_map(lambda row, col: (col, 7 - row)),
+    _square_map(lambda row, col: (7 - col, row)),
+    _square_map(lambda row, col: (7 - col, 7 - row))
+]
+
+
+def _in_region(square: int, has_pawns: bool) -> bool:
+    """
+    The white king of a position in a table is always in a region of the
+    board: the files a-d with pawns, and the triangle a1-d1-d4 without pawns.
+    :param square: int, the cell of the white king.
+    :param has_pawns: bool, whether the material set has pawns.
+    :return: bool, whether the cell is in the region.
+    """
+    file, rank = square & 7, 7 - (square >> 3)
+    if has_pawns:
+        return file <= 3
+    return file <= 3 and rank <= file
+
+
+# The cells of the region, and for each cell, the symmetries that take it
+# into the region, with and without pawns.
+_REGIONS = {}  # type: Dict[bool, List[int]]
+_REGION_INDEX = {}  # type: Dict[bool, List[int]]
+_CANDIDATES = {}  # type: Dict[bool, List[Tuple[int, ...]]]
+for _has_pawns in (False, True):
+    _symmetries = _SYMMETRIES[:2] if _has_pawns else _SYMMETRIES
+    _REGIONS[_has_pawns] = [square for square in range(0, 64)
+                            if _in_region(square, _has_pawns)]
+    _REGION_INDEX[_has_pawns] = [-1] * 64
+    for _index, _square in enumerate(_REGIONS[_has_pawns]):
+        _REGION_INDEX[_has_pawns][_square] = _index
+    _CANDIDATES[_has_pawns] = [
+        tuple(symmetry for symmetry in _symmetries
+              if _in_region(symmetry[square], _has_pawns))
+        for square in range(0, 64)]
+
+
+def normalize(material: str) -> Tuple[str, bool]:
+    """
+    This function finds the name of the table of a material set. A table holds
+    only the positions where white has the stronger pieces; the positions
+    where black has them are probed with the colors swapped.
+    :param material: str, the material set, like 'KvKQ'.
+    :return: tuple of the material set of the table, like 'KQvK', and whether
+    the colors are swapped.
+    """
+    white, black = material.split('v')
+    white = ''.join(sorted(white, key=PIECE_ORDER.index))
+    black = ''.join(sorted(black, key=PIECE_ORDER.index))
+
+    def strength(pieces):
+        return (sum(PIECE_VALUES[piece] for piece in pieces), len(pieces),
+                [-PIECE_ORDER.index(piece) for piece in pieces])
+
+    if strength(black) > strength(white):
+        return black + 'v' + white, True
+    return white + 'v' + black, False
+
+
+class Table:
+    """
+    This class is the table of one material set: the value of every position
+    of the set, for each side to move.
+
+    The value of a position is the number of moves (plies) until the king is
+    eaten, from the point of view of the side to move: positive if it eats the
+    opponent's king, negative if its own king is eaten, and zero if neither
+    king can be forced to be eaten (a draw). Note that in this game the king
+    may move into check, so a player without a safe move loses, there is no
+    stalemate.
+
+    The values are kept as one signed byte per position, indexed by the side to
+    move and the cells of the pieces. Symmetric positions have the same value,
+    so only the positions with the white king in a region of the board are
+    kept (see _in_region).
+    """
+
+    MAGIC = b'CHESSTB1'
+    HEADER = struct.Struct('>8s16s')  # Magic and material set.
+
+    def __init__(self, material: str, values):
+        """
+        Default c'tor.
+        :param material: str, the material set, like 'KQvK'.
+        :param values: the values of the positions: bytes, bytearray or mmap.
+        """
+        self.material = material
+        white, black = material.split('v')
+        self.letters = list(white) + list(black.lower())
+        self.colors = [0] * len(white) + [1] * len(black)
+        self.has_pawns = 'P' in material
+        self.size = 2 * len(_REGIONS[self.has_pawns]) * \
+            64 ** (len(self.letters) - 1)
+        self.values = values
+        # The position of the first value in values.
+        self.offset = 0
+
+    @staticmethod
+    def open(path: str):
+        """
+        This function maps a table file into memory.
+        :param path: str, the path of the file.
+        :return: Table, the table.
+        :raises ValueError: if the file is not a table.
+        """
+        with open(path, 'rb') as table_file:
+            # The file must have the header, or it can not be read (an empty
+            # file can not be mapped at all).
+            if os.fstat(table_file.fileno()).st_size < Table.HEADER.size:
+                raise ValueError('{} is not a tablebase file.'.format(path))
+            data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, material = Table.HEADER.unpack_from(data, 0)
+        table = None
+        if magic == Table.MAGIC:
+            try:
+                table = Table(material.rstrip(b'\0').decode('ascii'), data)
+            except ValueError:
+                # The material set is not like 'KQvK'.
+                table = None
+        if table is None or len(data) != Table.HEADER.size + table.size:
+            data.close()
+            raise ValueError('{} is not a tablebase file.'.format(path))
+        table.offset = Table.HEADER.size
+        return table
+
+    def save(self, path: str) -> None:
+        """
+        This function writes the table to a file.
+        :param path: str, the path of the file.
+        :return: None
+        """
+        with open(path, 'wb') as table_file:
+            table_file.write(Table.HEADER.pack(Table.MAGIC,
+                                               self.material.encode('ascii')))
+            table_file.write(bytes(self.values))
+
+    def canonical(self, squares: List[int]) -> List[int]:
+        """
+        :param squares: List[int], the cells of the pieces of a position.
+        :return: List[int], the cells of the pieces of the symmetric position
+        that is kept in the table.
+        """
+        candidates = _CANDIDATES[self.has_pawns][squares[0]]
+        if len(candidates) == 1:
+            symmetry = candidates[0]
+            return [symmetry[square] for square in squares]
+        return min([symmetry[square] for square in squares]
+                   for symmetry in candidates)
+
+    def index(self, side: int, squares: List[int]) -> int:
+        """
+        :param side: int, the side to move, 0 for white and 1 for black.
+        :param squares: List[int], the cells of the pieces, canonical.
+        :return: int, the index of the position in the table.
+        """
+        index = side * len(_REGIONS[self.has_pawns]) + \
+            _REGION_INDEX[self.has_pawns][squares[0]]
+        for square in squares[1:]:
+            index = index * 64 + square
+        return index
+
+    def value(self, side: int, squares: List[int]) -> int:
+        """
+        :param side: int, the side to move, 0 for white and 1 for black.
+        :param squares: List[int], the cells of the pieces.
+        :return: int, the value of the position, see Table.
+        """
+        value = self.values[self.offset +
+                            self.index(side, self.canonical(squares))]
+        return value - 256 if value > 127 else value
+
+
+class Tablebase:
+    """
+    This class probes the endgame tables of a directory, in the files that
+    are made by TablebaseGenerator. The files are mapped into memory, so they
+    are not loaded at startup.
+    """
+
+    # The score of a won position, minus the plies until the king is eaten.
+    # It is bigger than the evaluation of any position with both kings, and
+    # smaller than the evaluation of a position without a king, so the search
+    # still prefers eating the king to a won position of the tables.
+    WIN_SCORE = 10000
+
+    def __init__(self, directory: str):
+        """
+        Default c'tor.
+        :param directory: str, the directory of the table files. A file that
+        can not be read as a table is skipped, and its endgame is searched like
+        any other position.
+        """
+        self.tables = {}  # type: Dict[str, Table]
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.tb'):
+                try:
+                    table = Table.open(os.path.join(directory, name))
+                except (OSError, ValueError):
+                    continue
+                self.tables[table.material] = table
+        self.max_pieces = max([len(table.letters)
+                               for table in self.tables.values()] + [0])
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, board: Board) -> int:
+        """
+        This function finds the value of the position of the board.
+        :param board: Board, the position.
+        :return: int, the value of the position for the side to move (see
+        Table), or None if there is no table for its pieces.
+        """
+        if sum(board.total_material.values()) > self.max_pieces:
+            return None
+        self.probes += 1
+        pieces = []
+        for row in range(0, 8):
+            for col in range(0, 8):
+                piece = board.get_piece_at(row, col)
+                if piece != Pieces.NONE:
+                    pieces.append((PIECE_LETTERS[piece], 8 * row + col))
+        white = [(letter, square) for letter, square in pieces
+                 if letter.isupper()]
+        black = [(letter.upper(), square) for letter, square in pieces
+                 if letter.islower()]
+        white.sort(key=lambda piece: PIECE_ORDER.index(piece[0]))
+        black.sort(key=lambda piece: PIECE_ORDER.index(piece[0]))
+        material, swapped = normalize(
+            ''.join(letter for letter, _ in white) + 'v' +
+            ''.join(letter for letter, _ in black))
+        table = self.tables.get(material)
+        if table is None or not white or white[0][0] != 'K' or \
+                not black or black[0][0] != 'K':
+            return None
+
+        side = 0 if board.side_to_move == Colors['WHITE'] else 1
+        if swapped:
+            squares = [square ^ 56 for _, square in black + white]
+            side = 1 - side
+        else:
+            squares = [square for _, square in white + black]
+        self.hits += 1
+        return table.value(side, squares)
+
+    def probe_score(self, board: Board) -> int:
+        """
+        This function converts the value of the position of the board into a
+        score of the search: positive when white wins, and the sooner the king
+        is eaten, the bigger the score.
+        :param board: Board, the position.
+        :return: int, the score of the position, or None if there is no table
+        for its pieces.
+        """
+        value = self.probe(board)
+        if value is None:
+            return None
+        if value > 0:
+            score = Tablebase.WIN_SCORE - value
+        elif value < 0:
+            score = -Tablebase.WIN_SCORE - value
+        else:
+            score = 0
+        return score if board.side_to_move == Colors['WHITE'] else -score
+
+
+class TablebaseGenerator:
+    """
+    This class builds the tables by retrograde analysis. It starts from the
+    positions where the side to move eats the king, and walks backwards:
+
+        - A position is won in n + 1 plies if one of its moves leads to a
+          position that is lost in n plies for the opponent.
+        - A position is lost in n + 1 plies if all of its moves lead to
+          positions that are won for the opponent, the slowest in n plies.
+
+    The positions are resolved in the order of their distance, so each value
+    is the shortest win (or the longest loss). The moves that eat a piece lead
+    to a smaller material set, whose table is built first. The positions that
+    are never resolved are draws.
+    """
+
+    def __init__(self):
+        """ Default c'tor. """
+        self.tables = {}  # type: Dict[str, Table]
+
+    def get_table(self, material: str) -> Table:
+        """
+        This function builds the table of a material set, and the tables of
+        the smaller sets it depends on, once.
+        :param material: str, the material set, like 'KQvK'.
+        :return: Table, the table.
+        """
+        material, _ = normalize(material)
+        if material not in self.tables:
+            self.tables[material] = self.__build(material)
+        return self.tables[material]
+
+    def __capture_tables(self, table: Table) -> List:
+        """
+        :param table: Table, the table being built.
+        :return: list with, for each piece of the table, None for a king, and
+        for the other pieces, the table after the piece is eaten, whether its
+        colors are swapped, and the colors of the pieces that are left.
+        """
+        result = []
+        white, black = table.material.split('v')
+        for piece in range(0, len(table.letters)):
+            if table.letters[piece] in 'Kk':
+                result.append(None)
+                continue
+            if piece < len(white):
+                remaining = white[:piece] + white[piece + 1:] + 'v' + black
+            else:
+                index = piece - len(white)
+                remaining = white + 'v' + black[:index] + black[index + 1:]
+            material, swapped = normalize(remaining)
+            result.append((self.get_table(material), swapped,
+                           table.colors[:piece] + table.colors[piece + 1:]))
+        return result
+
+    @staticmethod
+    def __moves(letters: List[str], colors: List[int], squares: List[int],
+                occupied: Dict[int, int], piece: int):
+        """
+        This function generates the moves of a piece, like the board does.
+        :param letters: List[str], the letters of the pieces.
+        :param colors: List[int], the colors of the pieces.
+        :param squares: List[int], the cells of the pieces.
+        :param occupied: Dict[int, int], the piece on each occupied cell.
+        :param piece: int, the piece to move.
+        :return: iterator over the target cells, with the eaten piece or None.
+        """
+        square = squares[piece]
+        color = colors[piece]
+        letter = letters[piece].upper()
+        if letter == 'P':
+            step = -8 if color == 0 else 8
+            row = square >> 3
+            target = square + step
+            if 0 <= target < 64 and target not in occupied:
+                yield target, None
+                start_row = 6 if color == 0 else 1
+                if row == start_row and target + step not in occupied:
+                    yield target + step, None
+            for col_step in (-1, 1):
+                col = (square & 7) + col_step
+                if 0 <= col < 8 and 0 <= target < 64:
+                    capture = (target & ~7) + col
+                    eaten = occupied.get(capture)
+                    if eaten is not None and colors[eaten] != color:
+                        yield capture, eaten
+            return
+
+        if letter in 'KN':
+            targets = _KING_SQUARES[square] if letter == 'K' \
+                else _KNIGHT_SQUARES[square]
+            for target in targets:
+                eaten = occupied.get(target)
+                if eaten is None:
+                    yield target, None
+                elif colors[eaten] != color:
+                    yield target, eaten
+            return
+
+        for ray in _RAY_SQUARES[letter][square]:
+            for target in ray:
+                eaten = occupied.get(target)
+                if eaten is None:
+                    yield target, None
+                    continue
+                if colors[eaten] != color:
+                    yield target, eaten
+                break
+
+    @staticmethod
+    def __unmoves(letters: List[str], colors: List[int], squares: List[int],
+                  occupied: Dict[int, int], piece: int):
+        """
+        This function generates the cells a piece may have come from, by a
+        move that did not eat a piece.
+        :param letters: List[str], the letters of the pieces.
+        :param colors: List[int], the colors of the pieces.
+        :param squares: List[int], the cells of the pieces.
+        :param occupied: Dict[int, int], the piece on each occupied cell.
+        :param piece: int, the piece that moved.
+        :return: iterator over the cells.
+        """
+        square = squares[piece]
+        letter = letters[piece].upper()
+        if letter == 'P':
+            row = square >> 3
+            if colors[piece] == 0:
+                if row <= 5 and square + 8 not in occupied:
+                    yield square + 8
+                    if row == 4 and square + 16 not in occupied:
+                        yield square + 16
+            else:
+                if row >= 2 and square - 8 not in occupied:
+                    yield square - 8
+                    if row == 3 and square - 16 not in occupied:
+                        yield square - 16
+            return
+
+        if letter in 'KN':
+            targets = _KING_SQUARES[square] if letter == 'K' \
+                else _KNIGHT_SQUARES[square]
+            for target in targets:
+                if target not in occupied:
+                    yield target
+            return
+
+        for ray in _RAY_SQUARES[letter][square]:
+            for target in ray:
+                if target in occupied:
+                    break
+                yield target
+
+    @staticmethod
+    def __is_valid(letters: List[str], squares: List[int]) -> bool:
+        """
+        :param letters: List[str], the letters of the pieces.
+        :param squares: List[int], the cells of the pieces.
+        :return: bool, whether the pieces are on different cells, and no pawn
+        is on the first row of its side, where it can never be.
+        """
+        if len(set(squares)) != len(squares):
+            return False
+        for letter, square in zip(letters, squares):
+            if (letter == 'P' and square >= 56) or \
+                    (letter == 'p' and square < 8):
+                return False
+        return True
+
+    def __build(self, material: str) -> Table:
+        """
+        This function builds the table of a material set by retrograde
+        analysis, see TablebaseGenerator.
+        :param material: str, the normalized material set.
+        :return: Table, the table.
+        """
+        table = Table(material, None)
+        capture_tables = self.__capture_tables(table)
+        letters, colors = table.letters, table.colors
+        pieces = range(0, len(letters))
+        moves, unmoves = TablebaseGenerator.__moves, \
+            TablebaseGenerator.__unmoves
+
+        values = bytearray(table.size)
+        resolved = bytearray(table.size)
+        # The number of the positions after the moves that are not resolved.
+        remaining = bytearray(table.size)
+        # The positions that have a move that does not lose, so they never
+        # lose, and the longest loss after the moves that eat a piece.
+        cannot_lose = bytearray(table.size)
+        loss_floor = bytearray(table.size)
+        # The positions to resolve at each distance, with their results.
+        buckets = {}  # type: Dict[int, List[Tuple[int, bool]]]
+
+        def push(distance, index, is_win):
+            if distance > 127:
+                raise ValueError('Distance {} of {} does not fit a byte.'
+                                 .format(distance, material))
+            buckets.setdefault(distance, []).append((index, is_win))
+
+        # The first pass: the moves of every position.
+        for side in (0, 1):
+            for king in _REGIONS[table.has_pawns]:
+                for others in product(range(0, 64), repeat=len(letters) - 1):
+                    squares = [king] + list(others)
+                    if not TablebaseGenerator.__is_valid(letters, squares) or \
+                            table.canonical(squares) != squares:
+                        continue
+                    index = table.index(side, squares)
+                    occupied = {square: piece
+                                for piece, square in enumerate(squares)}
+                    children = set()
+                    best_win, draw, floor, king_eaten, has_moves = \
+                        None, False, 0, False, False
+                    for piece in pieces:
+                        if colors[piece] != side:
+                            continue
+                        for target, eaten in moves(letters, colors, squares,
+                                                   occupied, piece):
+                            has_moves = True
+                            child = list(squares)
+                            child[piece] = target
+                            if eaten is None:
+                                child = table.canonical(child)
+                                children.add(table.index(1 - side, child))
+                                continue
+                            if capture_tables[eaten] is None:
+                                king_eaten = True
+                                break
+                            capture_table, swapped, child_colors = \
+                                capture_tables[eaten]
+                            del child[eaten]
+                            child_side = 1 - side
+                            if swapped:
+                                child = [square ^ 56 for square, color
+                                         in zip(child, child_colors)
+                                         if color == 1] + \
+                                    [square ^ 56 for square, color
+                                     in zip(child, child_colors) if color == 0]
+                                child_side = side
+                            value = capture_table.value(child_side, child)
+                            if value < 0:
+                                if best_win is None or -value + 1 < best_win:
+                                    best_win = -value + 1
+                            elif value == 0:
+                                draw = True
+                            elif value + 1 > floor:
+                                floor = value + 1
+                        if king_eaten:
+                            break
+
+                    if king_eaten:
+                        push(1, index, True)
+                        cannot_lose[index] = 1
+                        continue
+                    if not has_moves:
+                        resolved[index] = 1
+                        continue
+                    remaining[index] = len(children)
+                    loss_floor[index] = floor
+                    if best_win is not None:
+                        push(best_win, index, True)
+                    if best_win is not None or draw:
+                        cannot_lose[index] = 1
+                    elif not children:
+                        push(floor, index, False)
+
+        # The second pass: resolve the positions by their distance, and walk
+        # back to the positions before them.
+        distance = 1
+        while buckets:
+            for index, is_win in buckets.pop(distance, []):
+                if resolved[index]:
+                    continue
+                resolved[index] = 1
+                values[index] = distance if is_win else 256 - distance
+
+                side, squares = self.__position(table, index)
+                mover = 1 - side
+                occupied = {square: piece
+                            for piece, square in enumerate(squares)}
+                parents = set()
+                for piece in pieces:
+                    if colors[piece] != mover:
+                        continue
+                    for origin in unmoves(letters, colors, squares, occupied,
+                                          piece):
+                        parent = list(squares)
+                        parent[piece] = origin
+                        if not TablebaseGenerator.__is_valid(letters, parent):
+                            continue
+                        parents.add(table.index(mover,
+                                                table.canonical(parent)))
+                for parent in parents:
+                    if resolved[parent]:
+                        continue
+                    if not is_win:
+                        push(distance + 1, parent, True)
+                        cannot_lose[parent] = 1
+                        continue
+                    if cannot_lose[parent]:
+                        continue
+                    remaining[parent] -= 1
+                    if loss_floor[parent] < distance + 1:
+                        loss_floor[parent] = distance + 1
+                    if remaining[parent] == 0:
+                        push(loss_floor[parent], parent, False)
+            distance += 1
+
+        table.values = bytes(values)
+        return table
+
+    @staticmethod
+    def __position(table: Table, index: int) -> Tuple[int, List[int]]:
+        """
+        :param table: Table, the table.
+        :param index: int, the index of a position.
+        :return: tuple of the side to move and the cells of the pieces of the
+        position.
+        """
+        squares = []
+        for _ in range(1, len(table.letters)):
+            index, square = divmod(index, 64)
+            squares.append(square)
+        side, king = divmod(index, len(_REGIONS[table.has_pawns]))
+        squares.append(_REGIONS[table.has_pawns][king])
+        squares.reverse()
+        return side, squares
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build endgame tables by retrograde analysis.')
+    parser.add_argument('materials', nargs='+',
+                        help='material sets, like KQvK KRvK KPvK KBNvK')
+    parser.add_argument('--output', default='tablebases')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    generator = TablebaseGenerator()
+    for material in args.materials:
+        generator.get_table(material)
+    for material, table in sorted(generator.tables.items()):
+        table.save(os.path.join(args.output, material + '.tb'))
+        print('{:8s} {:10d} positions'.format(material, table.size))
+
+
+if __name__ == '__main__':
+    main()
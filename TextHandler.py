@@ -1,21 +1,27 @@
 import pygame
+from FontRegistry import FontRegistry
+from Renderer import Renderer
 
 
 class TextHandler:
-    def __init__(self, font_path, font_color, font_size, dest):
-        self.__font = pygame.font.Font(font_path, font_size)
+    def __init__(self, font_path, font_color, font_size, dest,
+                 renderer: Renderer):
+        self.__font_path = font_path
+        self.__font = FontRegistry.get_font(font_path, font_size)
         self.__color = font_color
         self.__size = font_size
         self.destination = dest
+        self.renderer = renderer
         self.__text_surface = None
     
     def display_message(self, top_x, top_y, message_text):
         text_surface = self.render_text(message_text)
-        self.destination.blit(text_surface, (top_x, top_y))
-        pygame.display.update()
+        self.renderer.mark_dirty(
+            self.destination.blit(text_surface, (top_x, top_y)))
 
     def render_text(self, message_text):
-        return self.__font.render(message_text, True, self.__color)
+        return FontRegistry.render_text(self.__font_path, self.__size,
+                                        message_text, self.__color)
 
     def get_text_rect(self, message_text):
         return self.render_text(message_text).get_rect()
\ No newline at end of file
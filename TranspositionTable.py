@@ -0,0 +1,160 @@
+from array import array
+from Move import Move
+from typing import Dict, Tuple
+
+
+class TranspositionTable:
+    """
+    This class is a cache of search results, keyed by the Zobrist key of the
+    position. The same position is often reached by different orders of the
+    same moves, and the table lets the search reuse the result instead of
+    searching the position again.
+
+    The table has a fixed size that is given in MB, and it never grows. Its
+    entries are kept in flat arrays of numbers, so the memory of the table is
+    allocated once, when the table is created.
+
+    The entries are grouped into buckets of two slots:
+
+        1) Depth-preferred slot - it is replaced only by a search that is at
+           least as deep as the one it holds, so the results of the expensive
+           searches stay in the table.
+        2) Always-replace slot - it holds the most recent result that did not
+           get into the first slot, so the table follows the current search.
+    """
+
+    # The bound types of the scores.
+    EXACT = 0  # The score is the exact score of the position.
+    LOWER = 1  # The score is a lower bound, the real score may be higher.
+    UPPER = 2  # The score is an upper bound, the real score may be lower.
+
+    # Bytes per entry: key (8), score (4), best move (2), depth (1), bound (1).
+    ENTRY_SIZE = 16
+
+    # The depth of the empty slots.
+    EMPTY = -128
+
+    # The best move of the entries that have no best move (see Move.pack).
+    NO_MOVE = 0xFFFF
+
+    def __init__(self, size_mb: float = 16):
+        """
+        Default c'tor.
+        :param size_mb: float, the memory budget of the table in MB.
+        """
+        self.size_mb = size_mb
+        self.buckets = max(1, int(size_mb * 1024 * 1024) //
+                           (2 * TranspositionTable.ENTRY_SIZE))
+        self.slots = 2 * self.buckets
+
+        self.__keys = array('Q', [0]) * self.slots
+        self.__scores = array('i', [0]) * self.slots
+        self.__moves = array('H', [TranspositionTable.NO_MOVE]) * self.slots
+        self.__depths = array('b', [TranspositionTable.EMPTY]) * self.slots
+        self.__bounds = array('B', [0]) * self.slots
+
+        self.used_slots = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def clear(self) -> None:
+        """
+        This function removes all the entries and resets the statistics.
+        :return: None
+        """
+        self.__depths = array('b', [TranspositionTable.EMPTY]) * self.slots
+        self.used_slots = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def probe(self, key: int) -> Tuple[int, int, int, int]:
+        """
+        This function looks up the position in the table.
+        :param key: int, the Zobrist key of the position.
+        :return: tuple of (depth, score, bound, packed best move) of the
+        position, or None if the position is not in the table.
+        """
+        self.probes += 1
+        slot = (key % self.buckets) * 2
+        if self.__keys[slot] != key or \
+                self.__depths[slot] == TranspositionTable.EMPTY:
+            slot += 1
+            if self.__keys[slot] != key or \
+                    self.__depths[slot] == TranspositionTable.EMPTY:
+                return None
+        self.hits += 1
+        return (self.__depths[slot], self.__scores[slot],
+                self.__bounds[slot], self.__moves[slot])
+
+    def store(self, key: int, depth: int, score: int, bound: int,
+              best_move: Move = None) -> None:
+        """
+        This function stores the result of a search in the table.
+        :param key: int, the Zobrist key of the position.
+        :param depth: int, the depth of the search.
+        :param score: int, the score of the position.
+        :param bound: int, one of EXACT, LOWER and UPPER.
+        :param best_move: Move, the best move of the position, if any.
+        :return: None
+        """
+        self.stores += 1
+        slot = (key % self.buckets) * 2
+        keys, depths = self.__keys, self.__depths
+        if depths[slot] != TranspositionTable.EMPTY and \
+                keys[slot] != key and depth < depths[slot]:
+            # Keep the deeper result, use the always-replace slot.
+            slot += 1
+        elif depths[slot] != TranspositionTable.EMPTY and keys[slot] != key:
+            # The depth-preferred entry is replaced by a deeper one, move it
+            # into the always-replace slot instead of dropping it.
+            self.__write(slot + 1, keys[slot], depths[slot],
+                         self.__scores[slot], self.__bounds[slot],
+                         self.__moves[slot])
+            depths[slot] = TranspositionTable.EMPTY
+            self.used_slots -= 1
+
+        packed_move = TranspositionTable.NO_MOVE
+        if best_move is not None:
+            packed_move = best_move.pack()
+        elif keys[slot] == key and depths[slot] != TranspositionTable.EMPTY:
+            # Do not forget the best move of an earlier search.
+            packed_move = self.__moves[slot]
+        self.__write(slot, key, depth, score, bound, packed_move)
+
+    def __write(self, slot: int, key: int, depth: int, score: int,
+                bound: int, packed_move: int) -> None:
+        """
+        This function writes an entry into the slot, and updates the fill
+        statistics.
+        :return: None
+        """
+        if self.__depths[slot] == TranspositionTable.EMPTY:
+            self.used_slots += 1
+        elif self.__keys[slot] != key:
+            self.overwrites += 1
+        self.__keys[slot] = key
+        self.__depths[slot] = depth
+        self.__scores[slot] = score
+        self.__bounds[slot] = bound
+        self.__moves[slot] = packed_move
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        :return: dictionary with the statistics of the table: the number of
+        probes, hits and stores, the hit rate, the number of entries that were
+        overwritten by other positions and the part of the table in use.
+        """
+        return {
+            'size_mb': self.size_mb,
+            'slots': self.slots,
+            'probes': self.probes,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.probes if self.probes else 0.0,
+            'stores': self.stores,
+            'overwrites': self.overwrites,
+            'fill': self.used_slots / self.slots
+        }
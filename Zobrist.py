@@ -0,0 +1,50 @@
+from random import Random
+from Pieces import Pieces
+
+
+class Zobrist:
+    """
+    This class holds the random keys of the Zobrist hashing. The Zobrist key of
+    a position is the XOR of the keys of all (piece, cell) pairs on the board,
+    XOR the side key when black is to move. Since XOR is its own inverse, moving
+    a piece changes the key with a few XOR operations instead of hashing the
+    whole board again.
+
+    The keys are generated from a fixed seed, so the key of a position is the
+    same in every run of the game. Files that store positions by their key
+    depend on it.
+    """
+
+    SEED = 20190806
+
+    # PIECE_KEYS[piece][8 * row + col] is the key of piece on (row, col).
+    PIECE_KEYS = {}
+
+    SIDE_KEY = 0
+
+    @staticmethod
+    def piece_key(piece, row: int, col: int) -> int:
+        """
+        :param piece: the piece.
+        :param row: int, the row of the piece.
+        :param col: int, the col of the piece.
+        :return: int, the key of the piece on cell (row, col).
+        """
+        return Zobrist.PIECE_KEYS[piece][8 * row + col]
+
+
+def _generate_keys() -> None:
+    """
+    Fills the tables of the Zobrist class. The order of generation must not
+    change, otherwise the keys of all positions change.
+    """
+    random = Random(Zobrist.SEED)
+    for piece in Pieces.get_list_of_pieces():
+        if piece != Pieces.NONE:
+            Zobrist.PIECE_KEYS[piece] = [random.getrandbits(64)
+                                         for _ in range(0, 64)]
+    Zobrist.PIECE_KEYS[Pieces.NONE] = [0] * 64
+    Zobrist.SIDE_KEY = random.getrandbits(64)
+
+
+_generate_keys()
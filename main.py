@@ -1,9 +1,12 @@
 from Consts import Colors
-from Game import Game
 from Consts import Difficulties
 
 
 def main():
+    # The game and its views are imported here and not at the top, since they
+    # import pygame: the worker processes of the parallel search import this
+    # module again on platforms that spawn them, and they only need the engine.
+    from Game import Game
     game = Game(Difficulties['EASY'], Colors['WHITE'], Colors['BLACK'])
     game.run_game()
 
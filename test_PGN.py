@@ -0,0 +1,30 @@
+import io
+import unittest
+from PGN import read_games
+
+
+class ReadGamesTest(unittest.TestCase):
+    """ Regression cases of the comments of PGN.read_games. """
+
+    def test_commented_game(self):
+        pgn = ('[Event "a;b"]\n'
+               '[Site "?"] ; the site is not known\n'
+               '[Result "*"]\n'
+               '\n'
+               '1. e4 {good; solid} e5 ; a { in a line comment\n'
+               '2. Nf3 Nc6 (2... d6 ; a line comment in a variation\n'
+               '3. d4) *\n'
+               '\n'
+               '[Event "second"]\n'
+               '\n'
+               '1. d4 d5 *\n')
+        games = list(read_games(io.StringIO(pgn)))
+        self.assertEqual(games, [
+            ({'Event': 'a;b', 'Site': '?', 'Result': '*'},
+             ['e4', 'e5', 'Nf3', 'Nc6']),
+            ({'Event': 'second'}, ['d4', 'd5'])
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
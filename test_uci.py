@@ -0,0 +1,33 @@
+import io
+import unittest
+from uci import main
+
+
+class MainTest(unittest.TestCase):
+    """ Regression cases of the end of the commands of uci.main. """
+
+    def bestmoves(self, script: str):
+        output = io.StringIO()
+        main(io.StringIO(script), output)
+        return [line for line in output.getvalue().splitlines()
+                if line.startswith('bestmove')]
+
+    def test_go_at_end_of_commands(self):
+        bestmoves = self.bestmoves('position fen 4k3/8/8/8/8/8/8/4K3 w\n'
+                                   'go depth 3\n')
+        self.assertEqual(len(bestmoves), 1)
+
+    def test_go_infinite_at_end_of_commands(self):
+        bestmoves = self.bestmoves('position fen 4k3/8/8/8/8/8/8/4K3 w\n'
+                                   'go infinite\n')
+        self.assertEqual(len(bestmoves), 1)
+
+    def test_quit(self):
+        bestmoves = self.bestmoves('position fen 4k3/8/8/8/8/8/8/4K3 w\n'
+                                   'go depth 3\n'
+                                   'quit\n')
+        self.assertEqual(len(bestmoves), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,336 @@
+import sys
+from threading import Event, Thread
+from typing import Dict, List, TextIO
+from Board import START_FEN
+from BitBoard import BitBoard
+from ComputerAI import ComputerAI
+from Consts import Colors, SearchParameters
+from Move import Move
+from MoveOrdering import MoveOrdering
+from PGN import move_to_coordinates
+from SearchStats import SearchStats
+
+# UCI (Universal Chess Interface) is the text protocol between chess engines
+# and chess GUIs or match runners. The GUI writes commands to the standard
+# input of the engine, like "position startpos moves e2e4" and "go movetime
+# 1000", and the engine answers on its standard output, like "bestmove e7e5".
+#
+# Run it with:
+#
+#     python3 uci.py
+#
+# The engine does not import pygame, so it runs on hosts without a display.
+
+
+class UCIEngine:
+    """
+    This class serves the commands of the UCI protocol. The search runs in a
+    background thread, so the engine keeps reading commands while it thinks,
+    and "stop" ends the search at once.
+
+    Supported commands: uci, isready, setoption (Hash), ucinewgame, position
+    (startpos or fen, and moves), go (depth, movetime, wtime, btime, winc,
+    binc, movestogo, nodes, infinite), stop and quit.
+
+    The best move is the first move of the principal variation of the last
+    complete iteration, the one that was reported in the last "info" line.
+    After "go infinite", the best move is held until "stop", even if the
+    search ends before it, as the protocol asks.
+
+    Note that the moves of this game have no castling, en passant or promotion,
+    so a move of those kinds is rejected.
+    """
+
+    NAME = 'python-chess-game'
+    AUTHOR = 'Avraham Khanukaev'
+
+    # The deepest tree depth of a search without a depth limit. Such a search
+    # ends by its time or node limit, or by "stop".
+    MAX_DEPTH = MoveOrdering.MAX_PLY - 1
+
+    # When the GUI gives the remaining time of the game, the time of a move is
+    # the remaining time divided by the moves to go (MOVES_TO_GO if the GUI
+    # does not say), plus the increment. MOVE_OVERHEAD seconds are kept for
+    # the communication with the GUI.
+    MOVES_TO_GO = 30
+    MOVE_OVERHEAD = 0.05
+
+    def __init__(self, output: TextIO = sys.stdout):
+        """
+        Default c'tor.
+        :param output: the stream to write the answers to.
+        """
+        self.__output = output
+        self.hash_size_mb = SearchParameters['HASH_SIZE_MB']
+        self.board = BitBoard.default_ctor()
+        self.computer_ai = self.__new_computer_ai()
+        self.__thread = None  # type: Thread
+        # Set when the search may report its best move, see __go.
+        self.__bestmove_allowed = Event()
+
+    def __new_computer_ai(self) -> ComputerAI:
+        """
+        :return: ComputerAI, a computer player without limits of its own, so
+        every "go" command sets the limits of its search.
+        """
+        computer_ai = ComputerAI(UCIEngine.MAX_DEPTH,
+                                 hash_size_mb=self.hash_size_mb, workers=1)
+        computer_ai.on_iteration = self.__report_iteration
+        return computer_ai
+
+    def send(self, line: str) -> None:
+        """
+        This function writes a line to the GUI.
+        :param line: str, the line.
+        :return: None
+        """
+        self.__output.write(line + '\n')
+        self.__output.flush()
+
+    def handle(self, line: str) -> bool:
+        """
+        This function serves one command.
+        :param line: str, the command line.
+        :return: bool, False if the engine should quit, True otherwise.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        if command == 'uci':
+            self.send('id name {}'.format(UCIEngine.NAME))
+            self.send('id author {}'.format(UCIEngine.AUTHOR))
+            self.send('option name Hash type spin default {} min 1 max 4096'
+                      .format(SearchParameters['HASH_SIZE_MB']))
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption':
+            self.__set_option(arguments)
+        elif command == 'ucinewgame':
+            self.__stop()
+            self.computer_ai.close()
+            self.computer_ai = self.__new_computer_ai()
+            self.board = BitBoard.default_ctor()
+        elif command == 'position':
+            self.__stop()
+            self.__set_position(arguments)
+        elif command == 'go':
+            self.__stop()
+            self.__go(arguments)
+        elif command == 'stop':
+            self.__stop()
+        elif command == 'quit':
+            self.__stop()
+            self.computer_ai.close()
+            return False
+        return True
+
+    def __set_option(self, arguments: List[str]) -> None:
+        """
+        This function serves "setoption name <name> value <value>".
+        :param arguments: List[str], the tokens after the command.
+        :return: None
+        """
+        if 'name' not in arguments or 'value' not in arguments:
+            return
+        name = ' '.join(arguments[arguments.index('name') + 1:
+                                  arguments.index('value')])
+        value = ' '.join(arguments[arguments.index('value') + 1:])
+        if name.lower() == 'hash' and value.isdigit():
+            self.__stop()
+            self.computer_ai.close()
+            self.hash_size_mb = int(value)
+            self.computer_ai = self.__new_computer_ai()
+
+    def __set_position(self, arguments: List[str]) -> None:
+        """
+        This function serves "position startpos [moves ...]" and
+        "position fen <fen> [moves ...]".
+        :param arguments: List[str], the tokens after the command.
+        :return: None
+        """
+        moves = []  # type: List[str]
+        if 'moves' in arguments:
+            moves = arguments[arguments.index('moves') + 1:]
+            arguments = arguments[:arguments.index('moves')]
+        if arguments and arguments[0] == 'fen':
+            fen = ' '.join(arguments[1:])
+        else:
+            fen = START_FEN
+
+        board = BitBoard.default_ctor()
+        try:
+            board.load_fen(fen)
+        except ValueError as error:
+            self.send('info string {}'.format(error))
+            return
+        self.board = board
+        for coordinates in moves:
+            move = find_move(self.board, coordinates)
+            if move is None:
+                self.send('info string illegal move {}'.format(coordinates))
+                return
+            self.board.move_piece(move)
+
+    def __go(self, arguments: List[str]) -> None:
+        """
+        This function serves "go", and starts the search in the background.
+        :param arguments: List[str], the tokens after the command.
+        :return: None
+        """
+        limits = parse_go(arguments)
+        depth = UCIEngine.MAX_DEPTH
+        if 'depth' in limits:
+            # UCI counts the plies of the search, and the tree depth 0 is a
+            # search of one ply.
+            depth = max(0, limits['depth'] - 1)
+        time_limit = self.__time_limit(limits)
+        node_limit = limits.get('nodes')
+
+        self.computer_ai.computer_color = self.board.side_to_move
+        self.computer_ai.user_color = Colors['BLACK'] \
+            if self.board.side_to_move == Colors['WHITE'] else Colors['WHITE']
+        self.computer_ai.stop_event.clear()
+        # The best move of "go infinite" waits for "stop".
+        self.__bestmove_allowed.clear()
+        if 'infinite' not in arguments:
+            self.__bestmove_allowed.set()
+        self.__thread = Thread(target=self.__search,
+                               args=(self.board.copy(), time_limit,
+                                     node_limit, depth),
+                               name='UCISearch', daemon=True)
+        self.__thread.start()
+
+    def __time_limit(self, limits: Dict[str, int]) -> float:
+        """
+        :param limits: the limits of the "go" command, see parse_go.
+        :return: float, the number of seconds of the move, or None if there is
+        no time limit.
+        """
+        if 'movetime' in limits:
+            return limits['movetime'] / 1000
+        white = self.board.side_to_move == Colors['WHITE']
+        remaining = limits.get('wtime' if white else 'btime')
+        if remaining is None:
+            return None
+        remaining /= 1000
+        increment = limits.get('winc' if white else 'binc', 0) / 1000
+        moves_to_go = limits.get('movestogo', UCIEngine.MOVES_TO_GO)
+        time_limit = min(remaining / max(moves_to_go, 1) + increment,
+                         remaining / 2)
+        return max(time_limit - UCIEngine.MOVE_OVERHEAD, 0.01)
+
+    def __search(self, board: BitBoard, time_limit: float, node_limit: int,
+                 depth: int) -> None:
+        """
+        The background thread of the search. It reports the best move when
+        the search ends, or after "go infinite", when the search is stopped.
+        :param board: BitBoard, a copy of the position to search.
+        :param time_limit: float, the seconds of the move, or None.
+        :param node_limit: int, the nodes of the move, or None.
+        :param depth: int, the deepest tree depth.
+        :return: None
+        """
+        move = self.computer_ai.computers_play(board, time_limit, node_limit,
+                                               depth)
+        # computers_play picks one of the moves with the best score at
+        # random, but the GUI expects the move of the reported variation.
+        if self.computer_ai.stats.pv:
+            move = self.computer_ai.stats.pv[0]
+        self.__bestmove_allowed.wait()
+        self.send('bestmove {}'.format(
+            move_to_coordinates(move) if move is not None else '0000'))
+
+    def __report_iteration(self, stats: SearchStats) -> None:
+        """
+        This function reports a complete iteration of the search to the GUI.
+        :param stats: SearchStats, the statistics of the search.
+        :return: None
+        """
+        score = stats.score
+        # UCI scores are from the point of view of the side to move.
+        if self.computer_ai.computer_color != Colors['WHITE']:
+            score = -score
+        table = self.computer_ai.transposition_table
+        self.send('info depth {} seldepth {} score cp {} nodes {} nps {} '
+                  'time {} hashfull {} tbhits {} pv {}'.format(
+                      stats.depth, stats.seldepth, score, stats.nodes,
+                      int(stats.get_nps()), int(stats.seconds * 1000),
+                      1000 * table.used_slots // table.slots,
+                      stats.tablebase_hits, stats.get_pv_text()))
+
+    def __stop(self) -> None:
+        """
+        This function stops the search that runs, if there is one, and waits
+        until it reports its best move.
+        :return: None
+        """
+        if self.__thread is not None:
+            self.computer_ai.stop()
+            self.__bestmove_allowed.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def finish(self) -> None:
+        """
+        This function lets the search that runs, if there is one, end like the
+        search of a finite "go", and waits until it reports its best move. A
+        search of "go infinite" has no end of its own, so it is stopped.
+        :return: None
+        """
+        if self.__thread is not None:
+            if not self.__bestmove_allowed.is_set():
+                self.computer_ai.stop()
+                self.__bestmove_allowed.set()
+            self.__thread.join()
+            self.__thread = None
+
+
+def parse_go(arguments: List[str]) -> Dict[str, int]:
+    """
+    :param arguments: List[str], the tokens of a "go" command, after "go".
+    :return: dictionary from each limit of the command with a number, like
+    'depth' or 'wtime', to its number. "infinite" means no limits.
+    """
+    limits = {}
+    for name, value in zip(arguments, arguments[1:]):
+        if name in ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc',
+                    'movestogo', 'nodes') and value.lstrip('-').isdigit():
+            limits[name] = int(value)
+    return limits
+
+
+def find_move(board: BitBoard, coordinates: str) -> Move:
+    """
+    :param board: BitBoard, the position.
+    :param coordinates: str, a move of the side to move in coordinate
+    notation, like 'e2e4'.
+    :return: Move, the move, or None if the side to move has no such move.
+    """
+    for move in board.get_all_moves(board.side_to_move):
+        if move_to_coordinates(move) == coordinates:
+            return move
+    return None
+
+
+def main(commands: TextIO = sys.stdin, output: TextIO = sys.stdout):
+    """
+    This function serves the commands until "quit", or until the end of the
+    commands. At the end of the commands, the search that runs still reports
+    its best move, so a script may end right after its last "go".
+    :param commands: the stream to read the commands from.
+    :param output: the stream to write the answers to.
+    :return: None
+    """
+    engine = UCIEngine(output)
+    for line in commands:
+        if not engine.handle(line):
+            break
+    else:
+        engine.finish()
+        engine.handle('quit')
+
+
+if __name__ == '__main__':
+    main()